@@ -0,0 +1,169 @@
+import html
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+from get_data_deeper import (
+    extract_results_from_filter_table,
+    parse_competitions_listing,
+    parse_splits_tooltip,
+    parse_splits_tooltip_soup,
+)
+
+
+BACKENDS = ("html.parser", "lxml", "html5lib")
+
+_TOOLTIP_RE = re.compile(r'data-tippy-content="([^"]*styleNoBorderNoBottom[^"]*)"')
+
+
+def load_corpus(corpus_dir: Path) -> List[Tuple[str, bytes]]:
+    """
+    Charge les pages sauvegardées : fichiers .html / .htm, ou corps .body
+    du cache HTTP (dossier .http_cache de get_data.ResponseCache).
+    """
+    pages: List[Tuple[str, bytes]] = []
+    for path in sorted(corpus_dir.rglob("*")):
+        if path.suffix.lower() in (".html", ".htm", ".body") and path.is_file():
+            pages.append((path.name, path.read_bytes()))
+    return pages
+
+
+def available_backends() -> List[str]:
+    found: List[str] = []
+    for name in BACKENDS:
+        try:
+            BeautifulSoup("", name)
+        except FeatureNotFound:
+            continue
+        found.append(name)
+    return found
+
+
+def parse_page(content: bytes, backend: str) -> int:
+    """
+    Reproduit le travail du crawl sur une page : construction de l'arbre puis
+    extraction (blocs compétition pour une liste, tables de résultats sinon).
+    Renvoie le nombre d'éléments extraits, pour vérifier que les analyseurs s'accordent.
+    """
+    soup = BeautifulSoup(content, backend)
+    if b"border-b pb-2 mt-4" in content:
+        return len(parse_competitions_listing(soup))
+    return sum(len(e["performances"]) for e in extract_results_from_filter_table(soup))
+
+
+def bench_backend(pages: List[Tuple[str, bytes]], backend: str, repeat: int) -> Dict:
+    # Passe chronométrée (sans tracemalloc, qui ralentit fortement les allocations)
+    best = float("inf")
+    extracted = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extracted = sum(parse_page(content, backend) for _, content in pages)
+        best = min(best, time.perf_counter() - start)
+
+    # Passe mémoire : pic d'allocations Python pour la page la plus coûteuse
+    peak_bytes = 0
+    tracemalloc.start()
+    for _, content in pages:
+        tracemalloc.reset_peak()
+        parse_page(content, backend)
+        peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    total_bytes = sum(len(content) for _, content in pages)
+    return {
+        "backend": backend,
+        "pages": len(pages),
+        "seconds": best,
+        "pages_per_second": len(pages) / best if best > 0 else 0.0,
+        "mb_per_second": total_bytes / 1e6 / best if best > 0 else 0.0,
+        "peak_memory_mb": peak_bytes / 1e6,
+        "extracted": extracted,
+    }
+
+
+def load_tooltips(pages: List[Tuple[str, bytes]]) -> List[str]:
+    """
+    Contenus data-tippy-content des boutons de temps de passage, tels que
+    BeautifulSoup les renvoie (valeur d'attribut décodée une fois).
+    """
+    tooltips: List[str] = []
+    for _, content in pages:
+        text = content.decode("utf-8", errors="replace")
+        tooltips.extend(html.unescape(m) for m in _TOOLTIP_RE.findall(text))
+    return tooltips
+
+
+def bench_splits(tooltips: List[str], repeat: int) -> Dict:
+    """
+    Micro-benchmark des temps de passage : extracteur par expressions régulières
+    contre un arbre BeautifulSoup par fragment (chemin historique).
+    """
+    timings: Dict[str, float] = {}
+    outputs: Dict[str, List] = {}
+    for name, func in (("soup", parse_splits_tooltip_soup), ("regex", parse_splits_tooltip)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs[name] = [func(t) for t in tooltips]
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+    return {
+        "tooltips": len(tooltips),
+        "splits": sum(len(s) for s in outputs["regex"]),
+        "soup_seconds": timings["soup"],
+        "regex_seconds": timings["regex"],
+        "identical": outputs["soup"] == outputs["regex"],
+    }
+
+
+def main() -> None:
+    """
+    python bench_parsers.py <dossier_pages> [repeat=3]
+    Compare les analyseurs HTML disponibles sur un corpus de pages sauvegardées
+    (pages de compétitions, de filtres et d'épreuves).
+    """
+    if len(sys.argv) < 2:
+        raise SystemExit("Usage : python bench_parsers.py <dossier_pages> [repeat=3]")
+
+    corpus_dir = Path(sys.argv[1])
+    repeat = 3
+    for arg in sys.argv[2:]:
+        if arg.startswith("repeat="):
+            repeat = max(1, int(arg.split("=", 1)[1]))
+
+    pages = load_corpus(corpus_dir)
+    if not pages:
+        raise SystemExit(f"Aucune page .html/.htm/.body trouvée dans '{corpus_dir}'")
+
+    total_mb = sum(len(c) for _, c in pages) / 1e6
+    print(f"=== Corpus : {len(pages)} page(s), {total_mb:.1f} Mo ===")
+
+    results = [bench_backend(pages, backend, repeat) for backend in available_backends()]
+    for r in results:
+        print(
+            f"- {r['backend']:<12} {r['pages_per_second']:8.1f} pages/s "
+            f"{r['mb_per_second']:7.2f} Mo/s  pic mémoire {r['peak_memory_mb']:7.1f} Mo  "
+            f"({r['extracted']} éléments extraits)"
+        )
+
+    if len({r["extracted"] for r in results}) > 1:
+        print("Attention : les analyseurs n'extraient pas le même nombre d'éléments.")
+
+    tooltips = load_tooltips(pages)
+    if tooltips:
+        r = bench_splits(tooltips, repeat)
+        speedup = r["soup_seconds"] / r["regex_seconds"] if r["regex_seconds"] > 0 else 0.0
+        print(f"=== Temps de passage : {r['tooltips']} infobulle(s), {r['splits']} passage(s) ===")
+        print(f"- soup   {r['soup_seconds'] * 1000:9.1f} ms")
+        print(f"- regex  {r['regex_seconds'] * 1000:9.1f} ms  (x{speedup:.1f})")
+        if not r["identical"]:
+            print("Attention : les deux extracteurs ne renvoient pas les mêmes passages.")
+
+
+if __name__ == "__main__":
+    main()
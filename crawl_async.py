@@ -0,0 +1,503 @@
+import asyncio
+import copy
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:  # dépendance optionnelle : seul le mode "async" en a besoin
+    aiohttp = None
+
+import get_data_deeper as deeper
+from crawl_metrics import get_metrics, timed_stage
+from crawl_state import get_base_url
+from get_data import AdaptiveRateController, conditional_headers, get_http_cache, get_rate_limiter, get_request_registry, make_soup, normalize_url, parse_competition_page, result_layout_key
+
+
+class AsyncCrawler:
+    """
+    Moteur de crawl asyncio, alternative à la boucle requests.Session de get_data_deeper.py.
+
+    Toutes les requêtes partent d'une même boucle d'événements, avec au plus
+    `max_in_flight` réponses en attente. On garde la sémantique du moteur
+    synchrone : relances avec attente longue sur 403 (5s, 15s, 45s...),
+    compteurs consecutive_403_count / recent_success_count, et nouvelle
+    session (nouveaux headers) après `max_competitions_before_pause`
+    compétitions, `max_requests_before_new_session` requêtes ou une série de
+    403 après des succès récents. La pause qui accompagne une nouvelle
+    session bloque les requêtes suivantes, pas celles déjà en vol.
+    """
+
+    def __init__(self, max_in_flight: int = 32, max_retries: int = 5, base_delay: float = 1.0, max_competitions_before_pause: int = 50, max_requests_before_new_session: int = 50, rest_delay: float = 30.0, debug: bool = False):
+        if aiohttp is None:
+            raise RuntimeError("Le moteur async nécessite aiohttp (pip install aiohttp)")
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_competitions_before_pause = max_competitions_before_pause
+        self.max_requests_before_new_session = max_requests_before_new_session
+        self.rest_delay = rest_delay
+        self.debug = debug
+
+        self.requests_since_session = 0
+        self.competitions_since_pause = 0
+        self.competitions_since_new_session = 0
+        self.consecutive_403_count = 0
+        self.recent_success_count = 0
+
+        self._session = None
+        self._old_sessions: List = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._resume_at = 0.0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "AsyncCrawler":
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._session = self._new_session()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        for session in self._old_sessions + [self._session]:
+            if session is not None:
+                await session.close()
+
+    def _new_session(self):
+        return aiohttp.ClientSession(
+            headers=deeper.browser_headers(),
+            timeout=aiohttp.ClientTimeout(total=20),
+        )
+
+    # Équivalent de session.close() + time.sleep(pause) + create_new_session() du moteur synchrone
+    def _rotate_session(self, pause: float) -> None:
+        if self.debug:
+            print(f"      [async] Nouvelle session HTTP (pause de {pause}s)...")
+        self._old_sessions.append(self._session)
+        self._session = self._new_session()
+        self.requests_since_session = 0
+        self.competitions_since_pause = 0
+        self.competitions_since_new_session = 0
+        self.consecutive_403_count = 0
+        self.recent_success_count = 0
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.record_session_rotation()
+            metrics.record_sleep(pause, "repos_session")
+        if pause > 0:
+            loop = asyncio.get_running_loop()
+            self._resume_at = max(self._resume_at, loop.time() + pause)
+
+    # GET asynchrone (cache disque, puis registre des requêtes de l'exécution) ; renvoie le corps brut
+    async def fetch(self, url: str) -> bytes:
+        cache = get_http_cache()
+        if cache is not None:
+            cached = cache.get(url)
+            if cached is not None:
+                metrics = get_metrics()
+                if metrics is not None:
+                    metrics.record_cache_hit()
+                return cached.content
+
+        registry = get_request_registry()
+        if registry is None:
+            return (await self._fetch_with_retries(url, cache)).content
+        known = registry.lookup(url)
+        if known is not None:
+            return known.content
+        # Même URL déjà en vol dans cette boucle : on attend la même réponse
+        key = normalize_url(url)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            registry.note_saved()
+            return (await asyncio.shield(pending)).content
+        pending = asyncio.ensure_future(self._fetch_with_retries(url, cache))
+        self._in_flight[key] = pending
+        try:
+            resp = await asyncio.shield(pending)
+        finally:
+            self._in_flight.pop(key, None)
+        registry.store(url, resp)
+        return resp.content
+
+    # GET asynchrone avec relances (mêmes délais que http_get_with_retries)
+    async def _fetch_with_retries(self, url: str, cache) -> requests.Response:
+        loop = asyncio.get_running_loop()
+        limiter = get_rate_limiter()
+        # Copie expirée en cache avec un validateur : requête conditionnelle (304 → copie resservie)
+        stale = cache.get_stale(url) if cache is not None else None
+        headers = conditional_headers(stale) if stale is not None else None
+        metrics = get_metrics()
+        last_exc: Optional[Exception] = None
+        attempt = 0
+        max_delay = 300.0
+
+        while True:
+            attempt += 1
+            if metrics is not None and attempt > 1:
+                metrics.record_retry(url)
+            status: Optional[int] = None
+            async with self._semaphore:
+                pause = self._resume_at - loop.time()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                if limiter is not None:
+                    wait = limiter.reserve(url)
+                    if metrics is not None:
+                        metrics.record_sleep(wait, "limiteur")
+                    await asyncio.sleep(wait)
+                started = loop.time()
+                try:
+                    async with self._session.get(url, headers=headers) as resp:
+                        body = await resp.read()
+                        status = resp.status
+                        if isinstance(limiter, AdaptiveRateController):
+                            limiter.observe(status, loop.time() - started)
+                        if metrics is not None:
+                            metrics.record_request(url, status, loop.time() - started, len(body))
+                        if status == 304 and stale is not None:
+                            self.requests_since_session += 1
+                            cache.revalidate(url, _to_requests_response(url, resp, body))
+                            return stale
+                        if status < 400:
+                            self.requests_since_session += 1
+                            converted = _to_requests_response(url, resp, body)
+                            if cache is not None:
+                                cache.put(url, converted)
+                            return converted
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    last_exc = exc
+                    if isinstance(limiter, AdaptiveRateController):
+                        limiter.observe(None, loop.time() - started)
+                    if metrics is not None:
+                        metrics.record_request(url, None, loop.time() - started)
+                    if self.debug:
+                        print(f"[async fetch] Exception sur {url} : {exc} (tentative {attempt}/{self.max_retries})")
+
+            if status is not None:
+                last_exc = requests.HTTPError(f"Status {status} for URL {url}")
+                if self.debug:
+                    print(f"[async fetch] {url} → statut {status}, tentative {attempt}/{self.max_retries}")
+                if status not in (403, 429) and not (500 <= status < 600):
+                    raise last_exc
+
+            if attempt >= self.max_retries:
+                raise last_exc
+
+            if status == 403:
+                delay = min(5.0 * (3 ** (attempt - 1)), max_delay)
+            else:
+                delay = min(self.base_delay * (2 ** (attempt - 1)), max_delay)
+            if metrics is not None:
+                metrics.record_sleep(delay, "relance")
+            await asyncio.sleep(delay)
+
+    # Pages de liste d'un type, niveau de pagination par niveau (même ordre que get_competitions_for_url) ;
+    # toutes les pages annoncées par la pagination partent ensemble (deeper.expand_listing_pages).
+    # Avec known (manifeste), pages lues une à une et arrêt à la première page entièrement connue.
+    async def get_competitions_for_url(self, url: str, known: Optional["deeper.CompetitionManifest"] = None) -> List[Dict]:
+        competitions: List[Dict] = []
+        seen = {deeper.listing_page_key(url)}
+        level = [url]
+        while level:
+            if known is not None:
+                level, rest = level[:1], level[1:]
+            pages = await asyncio.gather(*(self.fetch(u) for u in level))
+            next_level: List[str] = []
+            for page in pages:
+                with timed_stage("parse"):
+                    soup = make_soup(page, parse_only=deeper.LISTING_BLOCKS)
+                    page_competitions = deeper.parse_competitions_listing(soup, debug=self.debug)
+                    links = deeper.listing_page_links(page, url)
+                competitions.extend(page_competitions)
+                if deeper.listing_page_is_known(page_competitions, known):
+                    return competitions
+                if known is not None:
+                    next_level.extend(rest)
+                for link in links:
+                    key = deeper.listing_page_key(link)
+                    if key not in seen:
+                        seen.add(key)
+                        next_level.append(link)
+            if known is not None:
+                level = next_level
+                continue
+            found = set(next_level)
+            level = []
+            for link in deeper.expand_listing_pages(next_level):
+                key = deeper.listing_page_key(link)
+                if link in found or key not in seen:
+                    seen.add(key)
+                    level.append(link)
+        return competitions
+
+    # Analyse d'une page d'épreuve : dans le pool de processus s'il est installé (la boucle reste libre
+    # pour les téléchargements), sinon directement ; une page déjà analysée (même corps) est resservie
+    async def _parse_event(self, url: str, page: bytes) -> List[Dict]:
+        known = deeper.cached_event_parse(url, page)
+        if known is not None:
+            return known
+        pool = deeper.get_parse_pool()
+        if pool is None:
+            epreuves, seconds = deeper.parse_event_page_timed(page, self.debug)
+        else:
+            epreuves, seconds = await asyncio.get_running_loop().run_in_executor(pool, deeper.parse_event_page_timed, page, self.debug)
+        deeper.record_event_parse(epreuves, seconds)
+        deeper.store_event_parse(url, page, epreuves)
+        return epreuves
+
+    # Télécharge en parallèle les pages d'épreuves de plusieurs groupes d'options [(libellé du groupe, options)],
+    # chaque page distincte (URL normalisée) une seule fois (voir deeper.EventFetchPlan), et renvoie les épreuves
+    # de chaque groupe dans l'ordre des options
+    async def _scrape_event_groups(self, groups: List[Tuple[str, List[Tuple[str, str]]]]) -> List[List[Dict]]:
+        planned = deeper.plan_event_urls([options for _, options in groups])
+        deeper.record_event_plan(sum(len(options) for _, options in groups), len(planned))
+        pages = await asyncio.gather(*(self.fetch(u) for _, u in planned), return_exceptions=True)
+        # Une page qui ne s'analyse pas est traitée comme une page en échec : son épreuve reste vide, pas la compétition
+        parsed_pages = await asyncio.gather(
+            *(self._parse_event(u, page) for (_, u), page in zip(planned, pages) if not isinstance(page, Exception)),
+            return_exceptions=True,
+        )
+        parsed_iter = iter(parsed_pages)
+        outcomes: Dict[str, object] = {}
+        for (_, event_url), page in zip(planned, pages):
+            outcomes[deeper.normalize_url(event_url)] = page if isinstance(page, Exception) else next(parsed_iter)
+
+        served = set()
+        results: List[List[Dict]] = []
+        for gender_label, options in groups:
+            epreuves: List[Dict] = []
+            for label_opt, event_url in options:
+                key = deeper.normalize_url(event_url)
+                outcome = outcomes[key]
+                if isinstance(outcome, Exception):
+                    if self.debug:
+                        print(f"        ✗ [async] Erreur sur l'épreuve '{label_opt}' ({gender_label}) : {outcome}")
+                elif outcome:
+                    epreuves.extend(copy.deepcopy(outcome) if key in served else outcome)
+                    served.add(key)
+                    continue
+                epreuves.append({"nom": label_opt, "categorie": gender_label, "tour": "", "performances": []})
+            results.append(epreuves)
+        return results
+
+    # Pendant async de get_competition_results_grouped_by_event (get_results_for_competitions_url)
+    async def get_competition_results_grouped_by_event(self, comp_url: str) -> Dict:
+        grouped: Dict = {}
+        body = await self.fetch(comp_url)
+        with timed_stage("parse"):
+            soup = make_soup(body, parse_only=deeper.COMPETITION_FORM)
+
+        selects_dames, selects_messieurs = deeper.find_gender_selects(soup)
+        groups = [
+            (gender_label, deeper.event_options(selects, skip_series_view=False))
+            for gender_label, selects in (("Dames", selects_dames), ("Messieurs", selects_messieurs))
+            if selects
+        ]
+        for (gender_label, _), epreuves in zip(groups, await self._scrape_event_groups(groups)):
+            grouped[gender_label] = epreuves
+        if grouped:
+            return grouped
+
+        form = soup.find("form", attrs={"name": "choix"})
+        if not form:
+            simple_results = parse_competition_page(body, debug=self.debug, layout_key=result_layout_key(comp_url))
+            if simple_results:
+                grouped["default"] = simple_results
+            else:
+                grouped["_info"] = "Formulaire non trouvé et aucun résultat sur la page principale"
+            return grouped
+
+        filter_links: List[Tuple[str, str]] = []
+        for link in form.find_all("a", href=True):
+            href = link.get("href", "")
+            text = link.get_text(strip=True)
+            if "idsex=" in href and text in ["Dames", "Messieurs"]:
+                filter_links.append((text, deeper.urljoin(get_base_url(), href)))
+
+        if filter_links:
+            pages = await asyncio.gather(*(self.fetch(u) for _, u in filter_links), return_exceptions=True)
+            for (filter_label, _), page in zip(filter_links, pages):
+                if isinstance(page, Exception):
+                    grouped[filter_label] = []
+                    continue
+                try:
+                    with timed_stage("parse"):
+                        filter_soup = make_soup(page, parse_only=deeper.FILTER_PAGE)
+                    grouped[filter_label] = deeper.filter_page_results(filter_soup, debug=self.debug)
+                except Exception as e:
+                    if self.debug:
+                        print(f"        ✗ [async] Erreur sur le filtre '{filter_label}' : {e}")
+                    grouped[filter_label] = []
+            return grouped
+
+        options = deeper.event_options(form.find_all("select"))
+        planned = deeper.plan_event_urls([options])
+        deeper.record_event_plan(len(options), len(planned))
+        pages = await asyncio.gather(*(self.fetch(u) for _, u in planned), return_exceptions=True)
+        by_url = {deeper.normalize_url(u): page for (_, u), page in zip(planned, pages)}
+        for event_name, event_url in options:
+            page = by_url[deeper.normalize_url(event_url)]
+            try:
+                grouped[event_name] = [] if isinstance(page, Exception) else parse_competition_page(page, layout_key=result_layout_key(event_url))
+            except Exception as e:
+                if self.debug:
+                    print(f"        ✗ [async] Erreur sur l'épreuve '{event_name}' ({event_url}) : {e}")
+                grouped[event_name] = []
+        if not options:
+            grouped["_info"] = f"Formulaire trouvé avec {len(form.find_all('select'))} select(s) mais aucune épreuve valide détectée"
+        return grouped
+
+    # Met à jour les compteurs de session après une compétition, comme la boucle synchrone
+    def _competition_done(self, status: str) -> None:
+        self.competitions_since_pause += 1
+        self.competitions_since_new_session += 1
+        if status == "ok":
+            self.consecutive_403_count = 0
+            self.recent_success_count = min(self.recent_success_count + 1, 10)
+        elif status == "403":
+            self.consecutive_403_count += 1
+            self.recent_success_count = max(self.recent_success_count - 1, 0)
+        else:
+            self.consecutive_403_count = 0
+
+        if (
+            self.consecutive_403_count >= 5
+            and self.recent_success_count > 0
+            and self.competitions_since_new_session > 5
+        ):
+            self._rotate_session(self.rest_delay * 2)
+        elif self.consecutive_403_count >= 5 and self.recent_success_count == 0:
+            self.consecutive_403_count = 0
+        elif (
+            self.max_competitions_before_pause > 0
+            and self.competitions_since_pause >= self.max_competitions_before_pause
+        ) or (
+            self.max_requests_before_new_session > 0
+            and self.requests_since_session >= self.max_requests_before_new_session
+        ):
+            self._rotate_session(self.rest_delay)
+
+    async def fetch_competition(self, comp: Dict, journal: Optional["deeper.CrawlJournal"] = None, on_competition: Optional[Callable[[Dict], None]] = None, keep_results: bool = True, manifest: Optional["deeper.CompetitionManifest"] = None) -> None:
+        try:
+            grouped = await self.get_competition_results_grouped_by_event(comp["url"])
+            comp["results"] = grouped
+            comp["results_count"] = deeper.count_grouped_results(grouped)
+            if journal is not None:
+                journal.record(comp)
+            if manifest is not None:
+                manifest.record(comp)
+            status = "ok"
+            if self.debug:
+                print(f"  [async] {comp.get('name', 'N/A')} → {comp['results_count']} résultat(s)")
+        except Exception as e:
+            comp["results"] = []
+            comp["results_count"] = 0
+            comp["error"] = str(e)
+            status = "403" if "403" in str(e) else "error"
+            if self.debug:
+                print(f"  [async] ✗ {comp.get('name', 'N/A')} : {e}")
+        deeper.deliver_competition(comp, on_competition, keep_results)
+        self._competition_done(status)
+
+    async def get_results_for_competitions_url(self, url: str, competition_filter: Optional[Callable[[Dict], bool]] = None, journal: Optional["deeper.CrawlJournal"] = None, on_competition: Optional[Callable[[Dict], None]] = None, keep_results: bool = True, manifest: Optional["deeper.CompetitionManifest"] = None) -> Dict:
+        competitions, unchanged = deeper.split_unchanged_competitions(
+            deeper.plan_competitions(await self.get_competitions_for_url(url, known=manifest), competition_filter, debug=self.debug),
+            manifest,
+        )
+        pending: List[Dict] = []
+        for c in competitions:
+            if not c.get("url"):
+                continue
+            if journal is not None and journal.restore(c):
+                deeper.deliver_competition(c, on_competition, keep_results)
+                continue
+            pending.append(c)
+        await asyncio.gather(*(self.fetch_competition(c, journal, on_competition, keep_results, manifest) for c in pending))
+        return {"url": url, "competitions": competitions, "unchanged_competitions": unchanged}
+
+    # Pendant async de get_epreuves_for_competition_via_filters (mode --update)
+    async def get_epreuves_for_competition_via_filters(self, comp_url: str) -> List[Dict]:
+        body = await self.fetch(comp_url)
+        soup = make_soup(body, parse_only=deeper.EVENT_SELECTS)
+        epreuves_all: List[Dict] = []
+        selects_dames, selects_messieurs = deeper.find_gender_selects(soup)
+        groups = [
+            (gender_label, deeper.event_options(selects))
+            for gender_label, selects in (("Dames", selects_dames), ("Messieurs", selects_messieurs))
+            if selects
+        ]
+        for epreuves in await self._scrape_event_groups(groups):
+            epreuves_all.extend(epreuves)
+        if epreuves_all:
+            return epreuves_all
+        # La page compétition est déjà téléchargée : analysée telle quelle, sans nouvelle requête
+        results = parse_competition_page(body, debug=self.debug, layout_key=result_layout_key(comp_url))
+        deeper.record_event_plan(1, 0)
+        return deeper.results_list_to_epreuves(results, default_categorie=None)
+
+    async def get_new_competitions_latest_update(self, manifest: Optional["deeper.CompetitionManifest"] = None) -> Dict:
+        main_url = f"{get_base_url()}{deeper.COMPETITIONS_PATH}"
+        last_update_text = None
+        last_update_date = None
+        new_competitions: List[Dict] = []
+        try:
+            soup = make_soup(await self.fetch(main_url))
+            last_update_text, last_update_date, new_competitions = deeper.parse_latest_update(soup)
+        except Exception as e:
+            if self.debug:
+                print(f"Erreur lors de la récupération de la page principale compétitions : {e}")
+        new_competitions, unchanged = deeper.split_unchanged_competitions(new_competitions, manifest)
+
+        async def _one(comp: Dict) -> None:
+            try:
+                epreuves = await self.get_epreuves_for_competition_via_filters(comp["url"])
+                comp["epreuves"] = epreuves
+                comp["results_count"] = sum(len(e.get("performances", [])) for e in epreuves)
+            except Exception as e:
+                comp["epreuves"] = []
+                comp["results_count"] = 0
+                comp["error"] = str(e)
+            if manifest is not None:
+                manifest.record(comp)
+
+        await asyncio.gather(*(_one(c) for c in new_competitions if c.get("url")))
+
+        return {
+            "generation_date": datetime.now().isoformat(),
+            "last_update_text": last_update_text,
+            "last_update_date": last_update_date.isoformat() if last_update_date else None,
+            "source_url": main_url,
+            "new_competitions_count": len(new_competitions),
+            "competitions": new_competitions,
+            "unchanged_competitions": unchanged,
+        }
+
+
+# Le cache disque et le registre des requêtes (get_data) stockent des requests.Response : on en reconstruit une depuis la réponse aiohttp
+def _to_requests_response(url: str, resp, body: bytes) -> requests.Response:
+    converted = requests.Response()
+    converted.status_code = resp.status
+    converted._content = body
+    converted.url = url
+    converted.encoding = resp.charset
+    converted.headers.update(resp.headers)
+    return converted
+
+
+async def _run(method: str, *args, **crawler_kwargs):
+    async with AsyncCrawler(**crawler_kwargs) as crawler:
+        return await getattr(crawler, method)(*args)
+
+
+# Points d'entrée synchrones utilisés par main() (python get_data_deeper.py intl 7 async)
+def get_competitions_for_url_async(url: str, known: Optional["deeper.CompetitionManifest"] = None, **crawler_kwargs) -> List[Dict]:
+    return asyncio.run(_run("get_competitions_for_url", url, known, **crawler_kwargs))
+
+
+def get_results_for_competitions_url_async(url: str, competition_filter: Optional[Callable[[Dict], bool]] = None, journal: Optional["deeper.CrawlJournal"] = None, on_competition: Optional[Callable[[Dict], None]] = None, keep_results: bool = True, manifest: Optional["deeper.CompetitionManifest"] = None, **crawler_kwargs) -> Dict:
+    return asyncio.run(_run("get_results_for_competitions_url", url, competition_filter, journal, on_competition, keep_results, manifest, **crawler_kwargs))
+
+
+def get_new_competitions_latest_update_async(manifest: Optional["deeper.CompetitionManifest"] = None, **crawler_kwargs) -> Dict:
+    return asyncio.run(_run("get_new_competitions_latest_update", manifest, **crawler_kwargs))
@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+
+# Bornes (secondes) de l'histogramme des latences de requêtes
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Étapes chronométrées : attente (pauses, limiteur, relances), téléchargement, analyse HTML, écriture des sorties
+STAGES = ("sleep", "fetch", "parse", "write")
+
+
+# Type de page d'une URL extranat : liste de compétitions, page compétition, page d'épreuve
+def page_kind(url: str) -> str:
+    if "competitions.php" in url:
+        return "listing"
+    if "idepr=" in url or "go=epr" in url:
+        return "event"
+    if "resultats.php" in url:
+        return "competition"
+    return "other"
+
+
+class CrawlMetrics:
+    """
+    Mesures d'un crawl, partagées entre threads : requêtes et histogramme des latences par
+    type de page, octets téléchargés, relances, réponses 403, pages servies par le cache,
+    renouvellements de session, temps cumulé par étape (STAGES) et performances extraites.
+
+    Les temps par étape sont cumulés sur tous les threads (et processus d'analyse) : en mode
+    concurrent, leur somme peut dépasser la durée réelle du crawl.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.requests: Dict[str, Dict[str, int]] = {}
+        self.latency_buckets: Dict[str, List[int]] = {}
+        self.latency_sum: Dict[str, float] = {}
+        self.bytes: Dict[str, int] = {}
+        self.retries: Dict[str, int] = {}
+        self.errors_403 = 0
+        self.cache_hits = 0
+        self.session_rotations = 0
+        self.stage_seconds: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.sleep_reasons: Dict[str, float] = {}
+        self.performances = 0
+        self.pages_parsed = 0
+
+    # Une réponse (status None : erreur réseau / délai dépassé) et sa latence
+    def record_request(self, url: str, status: Optional[int], latency: float, nbytes: int = 0) -> None:
+        kind = page_kind(url)
+        with self._lock:
+            by_status = self.requests.setdefault(kind, {})
+            key = str(status) if status is not None else "erreur"
+            by_status[key] = by_status.get(key, 0) + 1
+            buckets = self.latency_buckets.setdefault(kind, [0] * len(LATENCY_BUCKETS))
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if latency <= bound:
+                    buckets[i] += 1
+            self.latency_sum[kind] = self.latency_sum.get(kind, 0.0) + latency
+            self.bytes[kind] = self.bytes.get(kind, 0) + nbytes
+            self.stage_seconds["fetch"] += latency
+            if status == 403:
+                self.errors_403 += 1
+
+    def record_retry(self, url: str) -> None:
+        kind = page_kind(url)
+        with self._lock:
+            self.retries[kind] = self.retries.get(kind, 0) + 1
+
+    def record_sleep(self, seconds: float, reason: str) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.stage_seconds["sleep"] += seconds
+            self.sleep_reasons[reason] = self.sleep_reasons.get(reason, 0.0) + seconds
+
+    def record_cache_hit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    def record_session_rotation(self) -> None:
+        with self._lock:
+            self.session_rotations += 1
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    # Analyse d'une page de résultats : durée et performances extraites
+    def record_parse(self, seconds: float, performances: int) -> None:
+        with self._lock:
+            self.stage_seconds["parse"] += seconds
+            self.performances += performances
+            self.pages_parsed += 1
+
+    def report(self) -> Dict:
+        with self._lock:
+            elapsed = time.perf_counter() - self._started
+            kinds = sorted(set(self.requests) | set(self.retries))
+            by_kind: Dict[str, Dict] = {}
+            for kind in kinds:
+                count = sum(self.requests.get(kind, {}).values())
+                by_kind[kind] = {
+                    "requests": count,
+                    "status": dict(self.requests.get(kind, {})),
+                    "bytes": self.bytes.get(kind, 0),
+                    "retries": self.retries.get(kind, 0),
+                    "latency_avg_ms": round(self.latency_sum.get(kind, 0.0) / count * 1000, 1) if count else None,
+                    "latency_histogram": {
+                        f"le_{bound:g}": n for bound, n in zip(LATENCY_BUCKETS, self.latency_buckets.get(kind, []))
+                    },
+                }
+            return {
+                "started_at": self.started_at,
+                "elapsed_seconds": round(elapsed, 3),
+                "requests": sum(v["requests"] for v in by_kind.values()),
+                "bytes_downloaded": sum(self.bytes.values()),
+                "retries": sum(self.retries.values()),
+                "errors_403": self.errors_403,
+                "cache_hits": self.cache_hits,
+                "session_rotations": self.session_rotations,
+                "by_page_kind": by_kind,
+                "stage_seconds": {k: round(v, 3) for k, v in self.stage_seconds.items()},
+                "sleep_seconds_by_reason": {k: round(v, 3) for k, v in self.sleep_reasons.items()},
+                "pages_parsed": self.pages_parsed,
+                "performances_parsed": self.performances,
+                "performances_per_second": round(self.performances / elapsed, 1) if elapsed > 0 else 0.0,
+                "performances_per_parse_second": (
+                    round(self.performances / self.stage_seconds["parse"], 1) if self.stage_seconds["parse"] > 0 else None
+                ),
+            }
+
+    def write_report(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    # Mesures au format texte de Prometheus
+    def prometheus_text(self) -> str:
+        report = self.report()
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[str]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        with self._lock:
+            requests_samples = [
+                f'ffn_requests_total{{kind="{kind}",status="{status}"}} {n}'
+                for kind, by_status in sorted(self.requests.items())
+                for status, n in sorted(by_status.items())
+            ]
+            histogram_samples: List[str] = []
+            for kind, buckets in sorted(self.latency_buckets.items()):
+                count = sum(self.requests.get(kind, {}).values())
+                for bound, n in zip(LATENCY_BUCKETS, buckets):
+                    histogram_samples.append(f'ffn_request_duration_seconds_bucket{{kind="{kind}",le="{bound:g}"}} {n}')
+                histogram_samples.append(f'ffn_request_duration_seconds_bucket{{kind="{kind}",le="+Inf"}} {count}')
+                histogram_samples.append(f'ffn_request_duration_seconds_sum{{kind="{kind}"}} {self.latency_sum.get(kind, 0.0):.6f}')
+                histogram_samples.append(f'ffn_request_duration_seconds_count{{kind="{kind}"}} {count}')
+            bytes_samples = [f'ffn_bytes_downloaded_total{{kind="{kind}"}} {n}' for kind, n in sorted(self.bytes.items())]
+            retries_samples = [f'ffn_retries_total{{kind="{kind}"}} {n}' for kind, n in sorted(self.retries.items())]
+            stage_samples = [f'ffn_stage_seconds_total{{stage="{stage}"}} {s:.6f}' for stage, s in sorted(self.stage_seconds.items())]
+
+        metric("ffn_requests_total", "counter", "Requetes HTTP par type de page et statut", requests_samples)
+        metric("ffn_request_duration_seconds", "histogram", "Latence des requetes HTTP", histogram_samples)
+        metric("ffn_bytes_downloaded_total", "counter", "Octets telecharges", bytes_samples)
+        metric("ffn_retries_total", "counter", "Relances de requetes", retries_samples)
+        metric("ffn_http_403_total", "counter", "Reponses 403", [f"ffn_http_403_total {report['errors_403']}"])
+        metric("ffn_cache_hits_total", "counter", "Pages servies par le cache disque", [f"ffn_cache_hits_total {report['cache_hits']}"])
+        metric("ffn_session_rotations_total", "counter", "Renouvellements de session HTTP", [f"ffn_session_rotations_total {report['session_rotations']}"])
+        metric("ffn_stage_seconds_total", "counter", "Temps cumule par etape", stage_samples)
+        metric("ffn_performances_parsed_total", "counter", "Performances extraites", [f"ffn_performances_parsed_total {report['performances_parsed']}"])
+        metric("ffn_performances_per_second", "gauge", "Performances extraites par seconde depuis le debut du crawl", [f"ffn_performances_per_second {report['performances_per_second']}"])
+        return "\n".join(lines) + "\n"
+
+    # Sert les mesures en direct : /metrics (texte Prometheus) et /metrics.json (rapport JSON)
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        metrics = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                if self.path.startswith("/metrics.json"):
+                    body = json.dumps(metrics.report(), ensure_ascii=False).encode("utf-8")
+                    content_type = "application/json; charset=utf-8"
+                elif self.path.startswith("/metrics"):
+                    body = metrics.prometheus_text().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+# Mesures utilisées par get_data / get_data_deeper / crawl_async (aucune mesure tant que set_metrics n'est pas appelé)
+_metrics: Optional[CrawlMetrics] = None
+
+
+def set_metrics(metrics: Optional[CrawlMetrics]) -> None:
+    global _metrics
+    _metrics = metrics
+
+
+def get_metrics() -> Optional[CrawlMetrics]:
+    return _metrics
+
+
+# Chronomètre une étape (ex. with timed_stage("write"): ...) si les mesures sont actives
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    if _metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _metrics.record_stage(stage, time.perf_counter() - started)
+
+
+# time.sleep comptabilisé dans les mesures (reason : pause entre compétitions, repos de session, relance...)
+def sleep(seconds: float, reason: str) -> None:
+    if seconds <= 0:
+        return
+    if _metrics is not None:
+        _metrics.record_sleep(seconds, reason)
+    time.sleep(seconds)
@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+# Réglages et état d'un crawl partagés par get_data_deeper et crawl_async. Ils vivent dans ce module
+# importable plutôt que dans get_data_deeper : lancé en script, get_data_deeper s'appelle __main__ et
+# l'import de crawl_async en charge une seconde copie, qui retrouve ici les réglages faits par main().
+
+# Site crawlé par défaut
+DEFAULT_BASE_URL = "https://ffn.extranat.fr/webffn/"
+
+_base_url = DEFAULT_BASE_URL
+
+
+# Redirige le crawl vers un autre site (ex. serveur local fake_extranat_server.py) : les URL construites
+# ensuite (listes, types, compétitions, épreuves) le suivent
+def set_base_url(base_url: str) -> None:
+    global _base_url
+    if not base_url.endswith("/"):
+        base_url += "/"
+    _base_url = base_url
+
+
+def get_base_url() -> str:
+    return _base_url
+
+
+# Pool de processus d'analyse des pages d'épreuves (installé par get_data_deeper.set_parse_workers)
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def set_parse_pool(pool: Optional[ProcessPoolExecutor]) -> None:
+    global _parse_pool
+    _parse_pool = pool
+
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    return _parse_pool
+
+
+# Nombre de pages de liste (pagination) demandées en parallèle par get_competitions_for_url
+_listing_workers = 1
+
+
+def set_listing_workers(workers: int) -> None:
+    global _listing_workers
+    _listing_workers = max(1, workers)
+
+
+def get_listing_workers() -> int:
+    return _listing_workers
+
+
+# Bilan du planificateur des pages d'épreuves sur l'exécution : options parcourues, pages réellement demandées
+_event_plan_lock = threading.Lock()
+_event_plan_stats = {"planned": 0, "fetched": 0}
+
+
+def record_event_plan(planned: int, fetched: int) -> None:
+    with _event_plan_lock:
+        _event_plan_stats["planned"] += planned
+        _event_plan_stats["fetched"] += fetched
+
+
+# (options d'épreuves parcourues, pages demandées) depuis le début de l'exécution
+def get_event_plan_stats() -> Tuple[int, int]:
+    with _event_plan_lock:
+        return _event_plan_stats["planned"], _event_plan_stats["fetched"]
@@ -0,0 +1,294 @@
+import json
+import os
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from time_parsing import MISSING_CS, parse_distance_m, parse_time_cs, parse_times_cs
+
+try:
+    import numpy as np
+except ImportError:  # dépendance optionnelle : sans numpy, export en fichiers du module array
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dépendance optionnelle : format parquet
+    pa = None
+    pq = None
+
+
+# Colonnes de la table des performances (une ligne par performance) et de la table des passages
+# (une ligne par passage, reliée à sa performance par perf_index = numéro de ligne dans la première table).
+# Les colonnes texte sont encodées en dictionnaire : codes int32 + liste des valeurs distinctes.
+PERFORMANCE_STRING_COLUMNS = ("competition_id", "date", "epreuve", "gender", "swimmer", "club")
+PERFORMANCE_INT_COLUMNS = ("temps_cs",)
+SPLIT_INT_COLUMNS = ("perf_index", "distance_m", "cumul_cs", "lap_cs")
+
+# Valeur des colonnes entières quand le texte source n'est pas un temps / une distance (DSQ, ABD, vide...)
+MISSING = MISSING_CS
+
+FORMATS = ("npz", "parquet", "array")
+
+
+# Performances d'un fichier competitions_per_type/<type>/<compétition>-<Dames|Messieurs>.json
+def iter_document_performances(doc: Dict) -> Iterator[Dict]:
+    for epreuve in doc.get("epreuves") or []:
+        if not isinstance(epreuve, dict):
+            continue
+        for perf in epreuve.get("performances") or []:
+            if isinstance(perf, dict):
+                yield {
+                    "competition_id": doc.get("competition_id"),
+                    "date": doc.get("date"),
+                    "epreuve": epreuve.get("nom"),
+                    "categorie": epreuve.get("categorie") or doc.get("filter"),
+                    **perf,
+                }
+
+
+# Performances de toutes les sources : dossiers de fichiers JSON par compétition, fichiers .json,
+# ou fichiers JSON Lines de results_stream (une ligne par compétition ou par performance)
+def iter_source_performances(sources: Iterable[str]) -> Iterator[Dict]:
+    from results_stream import iter_jsonl, iter_performance_records
+
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            # results_by_type.json reprend tout le crawl sous une autre forme : ignoré
+            files = sorted(
+                p for p in path.rglob("*")
+                if p.suffix in (".json", ".jsonl") and p.name != "results_by_type.json"
+            )
+        else:
+            files = [path]
+        for file in files:
+            if file.suffix == ".jsonl":
+                for record in iter_jsonl(str(file)):
+                    if "results" in record:
+                        yield from iter_performance_records(record, record.get("idtyp"), record.get("type_name"))
+                    else:
+                        yield record
+                continue
+            try:
+                with open(file, "r", encoding="utf-8") as f:
+                    doc = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Fichier ignoré : {file} ({e})")
+                continue
+            if isinstance(doc, dict) and "epreuves" in doc:
+                yield from iter_document_performances(doc)
+
+
+# Nageur (ou nageurs d'un relais, séparés par " / ") et sexe d'une performance
+def _swimmer_and_gender(record: Dict) -> Tuple[str, str]:
+    nageur = record.get("nageur")
+    nageurs = nageur if isinstance(nageur, list) else [nageur]
+    names = [n.get("name") for n in nageurs if isinstance(n, dict) and n.get("name")]
+    if not names and record.get("swimmer"):
+        names = [record["swimmer"]]
+    gender = record.get("categorie") or ""
+    if gender not in ("Dames", "Messieurs"):
+        sexes = {n.get("sexe") for n in nageurs if isinstance(n, dict)}
+        if sexes == {"F"}:
+            gender = "Dames"
+        elif sexes == {"M"}:
+            gender = "Messieurs"
+    return " / ".join(names), gender
+
+
+class _StringColumn:
+    """Colonne texte encodée en dictionnaire (codes int32 dans l'ordre d'apparition des valeurs)."""
+
+    def __init__(self):
+        self.codes = array("i")
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def append(self, value: Optional[str]) -> None:
+        value = "" if value is None else str(value)
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+
+# Temps texte -> colonne int32 de centièmes (MISSING si le texte n'est pas un temps) ;
+# en un seul lot vectorisé avec numpy, ligne par ligne sinon
+def _time_column(texts: List[Optional[str]]) -> array:
+    if np is not None:
+        cs, _ = parse_times_cs(texts)
+        return array("i", cs.tobytes())
+    column = array("i")
+    for text in texts:
+        cs = parse_time_cs(text)
+        column.append(MISSING if cs is None else cs)
+    return column
+
+
+# Aplatit les performances en deux tables colonnes (performances, passages)
+def build_tables(records: Iterable[Dict]) -> Tuple[Dict, Dict]:
+    strings = {name: _StringColumn() for name in PERFORMANCE_STRING_COLUMNS}
+    temps: List[Optional[str]] = []
+    cumuls: List[Optional[str]] = []
+    laps: List[Optional[str]] = []
+    splits = {name: array("i") for name in ("perf_index", "distance_m")}
+
+    for perf_index, record in enumerate(records):
+        swimmer, gender = _swimmer_and_gender(record)
+        strings["competition_id"].append(record.get("competition_id"))
+        strings["date"].append(record.get("date"))
+        strings["epreuve"].append(record.get("epreuve") or record.get("event"))
+        strings["gender"].append(gender)
+        strings["swimmer"].append(swimmer)
+        strings["club"].append(record.get("club"))
+        temps.append(record.get("temps") or record.get("time"))
+
+        for split in record.get("splits") or []:
+            if not isinstance(split, dict):
+                continue
+            distance = parse_distance_m(split.get("distance"))
+            splits["perf_index"].append(perf_index)
+            splits["distance_m"].append(MISSING if distance is None else distance)
+            cumuls.append(split.get("cumul"))
+            laps.append(split.get("split") or split.get("time"))
+
+    splits["cumul_cs"] = _time_column(cumuls)
+    splits["lap_cs"] = _time_column(laps)
+    performances: Dict = {"temps_cs": _time_column(temps)}
+    for name, column in strings.items():
+        performances[name] = column.codes
+        performances[f"{name}_values"] = column.values
+    return performances, splits
+
+
+def write_npz(path: str, performances: Dict, splits: Dict) -> str:
+    arrays = {}
+    for name, column in performances.items():
+        if name.endswith("_values"):
+            arrays[f"perf.{name}"] = np.array(column, dtype=str)
+        else:
+            arrays[f"perf.{name}"] = np.frombuffer(column, dtype=np.int32) if len(column) else np.zeros(0, np.int32)
+    for name, column in splits.items():
+        arrays[f"split.{name}"] = np.frombuffer(column, dtype=np.int32) if len(column) else np.zeros(0, np.int32)
+    np.savez_compressed(path, **arrays)
+    return path if path.endswith(".npz") else path + ".npz"
+
+
+def write_parquet(path: str, performances: Dict, splits: Dict) -> str:
+    os.makedirs(path, exist_ok=True)
+    perf_columns = {"temps_cs": pa.array(performances["temps_cs"], type=pa.int32())}
+    for name in PERFORMANCE_STRING_COLUMNS:
+        perf_columns[name] = pa.DictionaryArray.from_arrays(
+            pa.array(performances[name], type=pa.int32()), pa.array(performances[f"{name}_values"], type=pa.string())
+        )
+    pq.write_table(pa.table(perf_columns), os.path.join(path, "performances.parquet"))
+    pq.write_table(
+        pa.table({name: pa.array(col, type=pa.int32()) for name, col in splits.items()}),
+        os.path.join(path, "splits.parquet"),
+    )
+    return path
+
+
+def write_arrays(path: str, performances: Dict, splits: Dict) -> str:
+    os.makedirs(path, exist_ok=True)
+    manifest: Dict = {"perf": {}, "split": {}}
+    for prefix, table in (("perf", performances), ("split", splits)):
+        for name, column in table.items():
+            if name.endswith("_values"):
+                manifest[prefix][name] = column
+                continue
+            with open(os.path.join(path, f"{prefix}.{name}.i32"), "wb") as f:
+                column.tofile(f)
+            manifest[prefix][name] = len(column)
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    return path
+
+
+def export(records: Iterable[Dict], path: str, fmt: Optional[str] = None) -> str:
+    if fmt is None:
+        fmt = "npz" if np is not None else "array"
+    if fmt == "npz" and np is None:
+        raise RuntimeError("Le format npz nécessite numpy (pip install numpy)")
+    if fmt == "parquet" and pa is None:
+        raise RuntimeError("Le format parquet nécessite pyarrow (pip install pyarrow)")
+    performances, splits = build_tables(records)
+    writer = {"npz": write_npz, "parquet": write_parquet, "array": write_arrays}[fmt]
+    return writer(path, performances, splits)
+
+
+# Recharge un export : {"perf": {colonne: tableau}, "split": {colonne: tableau}}.
+# Colonnes entières en int32 (numpy si disponible, sinon array("i")) ; colonnes texte en codes int32,
+# avec la liste des valeurs sous "<colonne>_values".
+def load_columnar(path: str) -> Dict[str, Dict]:
+    tables: Dict[str, Dict] = {"perf": {}, "split": {}}
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            for key in data.files:
+                prefix, name = key.split(".", 1)
+                tables[prefix][name] = data[key].tolist() if name.endswith("_values") else data[key]
+        return tables
+
+    if os.path.exists(os.path.join(path, "manifest.json")):
+        with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        for prefix, columns in manifest.items():
+            for name, info in columns.items():
+                if name.endswith("_values"):
+                    tables[prefix][name] = info
+                    continue
+                column = array("i")
+                with open(os.path.join(path, f"{prefix}.{name}.i32"), "rb") as f:
+                    column.fromfile(f, info)
+                tables[prefix][name] = np.frombuffer(column, dtype=np.int32) if np is not None else column
+        return tables
+
+    for prefix, filename in (("perf", "performances.parquet"), ("split", "splits.parquet")):
+        table = pq.read_table(os.path.join(path, filename))
+        for name in table.column_names:
+            column = table.column(name).combine_chunks()
+            if pa.types.is_dictionary(column.type):
+                tables[prefix][name] = column.indices.to_numpy().astype("int32")
+                tables[prefix][f"{name}_values"] = column.dictionary.to_pylist()
+            else:
+                tables[prefix][name] = column.to_numpy()
+    return tables
+
+
+def main() -> None:
+    """
+    python export_columnar.py <sortie> <source> [<source> ...] [format=npz|parquet|array]
+    Sources : dossier competitions_per_type (ou un sous-dossier), fichiers .json de
+    compétition, fichiers .jsonl produits par l'option stream= de get_data_deeper.py.
+    """
+    args = [a for a in sys.argv[1:] if not a.startswith("format=")]
+    if len(args) < 2:
+        raise SystemExit("Usage : python export_columnar.py <sortie> <source> [<source> ...] [format=npz|parquet|array]")
+
+    fmt: Optional[str] = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("format="):
+            fmt = arg.split("=", 1)[1]
+            if fmt not in FORMATS:
+                raise SystemExit(f"Format inconnu : {fmt} (formats : {', '.join(FORMATS)})")
+
+    start = time.perf_counter()
+    written = export(iter_source_performances(args[1:]), args[0], fmt)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tables = load_columnar(written)
+    load_elapsed = time.perf_counter() - start
+    print(f"=== Export colonnes : {written} ===")
+    print(f"- Performances : {len(tables['perf']['temps_cs'])}")
+    print(f"- Passages     : {len(tables['split']['lap_cs'])}")
+    print(f"- Export       : {elapsed:.2f} s, relecture : {load_elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
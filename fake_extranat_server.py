@@ -0,0 +1,289 @@
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+
+# Origine du site réel, remplacée par celle du serveur local dans les pages servies
+EXTRANAT_ORIGIN = b"https://ffn.extranat.fr"
+
+# Cookie de session posé par le serveur (comme le PHPSESSID du site réel)
+SESSION_COOKIE = "PHPSESSID"
+
+
+# Clé d'une page : chemin + paramètres triés, sans schéma ni hôte (une page enregistrée sur
+# ffn.extranat.fr est servie pour la même URL sur le serveur local)
+def fixture_key(url: str) -> str:
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{parts.path or '/'}?{query}"
+
+
+class FixtureStore:
+    """
+    Pages enregistrées, lues dans un dossier au format de get_data.ResponseCache
+    (<clé>.body + <clé>.json) : le dossier .http_cache d'un crawl lancé avec l'option
+    cache sert directement de jeu de pages (listes, compétitions, filtres Dames /
+    Messieurs, épreuves). Les corps sont chargés en mémoire au démarrage.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.pages: Dict[str, Tuple[bytes, Dict[str, str]]] = {}
+        if not os.path.isdir(directory):
+            raise RuntimeError(f"Dossier de pages introuvable : {directory}")
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".json") or entry.name.endswith(".parsed.json"):
+                    continue
+                body_path = entry.path[: -len(".json")] + ".body"
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        meta = json.load(f)
+                    with open(body_path, "rb") as f:
+                        body = f.read()
+                except (OSError, ValueError):
+                    continue
+                if not isinstance(meta, dict) or not meta.get("url"):
+                    continue
+                headers = {k.lower(): v for k, v in (meta.get("headers") or {}).items()}
+                self.pages[fixture_key(meta["url"])] = (body, headers)
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def get(self, path: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        return self.pages.get(fixture_key(path))
+
+
+class FakeExtranatServer:
+    """
+    Serveur HTTP local qui remplace ffn.extranat.fr pour mesurer un crawl sans solliciter le site :
+    - latency / jitter : délai (secondes) avant chaque réponse, tiré uniformément dans latency ± jitter ;
+    - bandwidth : débit d'envoi des corps (octets par seconde, 0 = illimité) ;
+    - p403 / p429 / p5xx : probabilité de répondre 403, 429 (avec Retry-After) ou 503 au lieu de la page ;
+    - session_limit : nombre de requêtes par session (cookie PHPSESSID) avant des 403 systématiques,
+      pour éprouver le renouvellement de session du crawler (0 = pas de limite) ;
+    - seed : graine du tirage des délais et des erreurs (chiffres reproductibles d'un essai à l'autre).
+    Les pages absentes du jeu de pages répondent 404. /__stats renvoie les compteurs en JSON.
+    """
+
+    def __init__(
+        self,
+        fixtures: FixtureStore,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        bandwidth: float = 0.0,
+        p403: float = 0.0,
+        p429: float = 0.0,
+        p5xx: float = 0.0,
+        retry_after: int = 1,
+        session_limit: int = 0,
+        seed: Optional[int] = None,
+    ):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.p403 = p403
+        self.p429 = p429
+        self.p5xx = p5xx
+        self.retry_after = retry_after
+        self.session_limit = session_limit
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, int] = {}
+        self.requests = 0
+        self.status: Dict[str, int] = {}
+        self.bytes_sent = 0
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    # Tirage (délai, statut injecté ou None) d'une requête, sous verrou pour rester reproductible
+    def _draw(self) -> Tuple[float, Optional[int]]:
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter)) if self.latency or self.jitter else 0.0
+            roll = self._random.random()
+        if roll < self.p403:
+            return delay, 403
+        if roll < self.p403 + self.p429:
+            return delay, 429
+        if roll < self.p403 + self.p429 + self.p5xx:
+            return delay, 503
+        return delay, None
+
+    # Session de la requête (nouvelle si pas de cookie) et nombre de requêtes qu'elle a faites
+    def _session(self, cookie_header: Optional[str]) -> Tuple[str, bool, int]:
+        session_id = None
+        for part in (cookie_header or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == SESSION_COOKIE and value:
+                session_id = value
+        with self._lock:
+            is_new = session_id is None or session_id not in self._sessions
+            if session_id is None:
+                session_id = uuid.uuid4().hex
+            count = self._sessions.get(session_id, 0) + 1
+            self._sessions[session_id] = count
+        return session_id, is_new, count
+
+    def _count(self, status: int, nbytes: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.status[str(status)] = self.status.get(str(status), 0) + 1
+            self.bytes_sent += nbytes
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "status": dict(self.status),
+                "bytes_sent": self.bytes_sent,
+                "sessions": len(self._sessions),
+            }
+
+    def _handler(self):
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            # En-têtes et corps partent en écritures séparées : sans TCP_NODELAY, l'algorithme de Nagle
+            # ajouterait ~40 ms par réponse en keep-alive et fausserait les mesures de latence
+            def setup(self) -> None:
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def _send(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if fake.bandwidth > 0 and body:
+                    # Envoi par morceaux de 16 Ko espacés pour tenir le débit demandé
+                    chunk = 16 * 1024
+                    for start in range(0, len(body), chunk):
+                        piece = body[start:start + chunk]
+                        self.wfile.write(piece)
+                        time.sleep(len(piece) / fake.bandwidth)
+                else:
+                    self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if self.path.startswith("/__stats"):
+                    body = json.dumps(fake.stats()).encode("utf-8")
+                    self._send(200, body, {"Content-Type": "application/json"})
+                    return
+
+                delay, injected = fake._draw()
+                if delay:
+                    time.sleep(delay)
+                session_id, is_new, count = fake._session(self.headers.get("Cookie"))
+                headers = {"Content-Type": "text/html; charset=utf-8"}
+                if is_new:
+                    headers["Set-Cookie"] = f"{SESSION_COOKIE}={session_id}; path=/"
+                if injected is None and fake.session_limit and count > fake.session_limit:
+                    injected = 403
+
+                if injected is not None:
+                    if injected == 429:
+                        headers["Retry-After"] = str(fake.retry_after)
+                    body = f"<html><body>Erreur {injected}</body></html>".encode("utf-8")
+                    fake._count(injected, len(body))
+                    self._send(injected, body, headers)
+                    return
+
+                page = fake.fixtures.get(self.path)
+                if page is None:
+                    body = b"<html><body>Page absente du jeu de pages</body></html>"
+                    fake._count(404, len(body))
+                    self._send(404, body, headers)
+                    return
+
+                body, page_headers = page
+                if "content-type" in page_headers:
+                    headers["Content-Type"] = page_headers["content-type"]
+                etag = page_headers.get("etag")
+                if etag:
+                    headers["ETag"] = etag
+                    if self.headers.get("If-None-Match") == etag:
+                        fake._count(304, 0)
+                        self.send_response(304)
+                        for name, value in headers.items():
+                            self.send_header(name, value)
+                        self.end_headers()
+                        return
+                origin = f"http://{self.headers.get('Host') or '127.0.0.1'}".encode("ascii")
+                body = body.replace(EXTRANAT_ORIGIN, origin)
+                fake._count(200, len(body))
+                self._send(200, body, headers)
+
+        return _Handler
+
+    # Démarre le serveur dans un thread (daemon) ; renvoie l'URL à passer à get_data_deeper (base=...)
+    def start(self, port: int = 8765, host: str = "127.0.0.1") -> str:
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://{host}:{self.server.server_address[1]}/webffn/"
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def main() -> None:
+    """
+    python fake_extranat_server.py <dossier de pages> [port=8765] [latency=0.05] [jitter=0.02]
+        [bandwidth=500000] [p403=0.01] [p429=0.01] [p5xx=0.01] [retry_after=1] [session_limit=50] [seed=1]
+    Le dossier de pages est un cache HTTP enregistré par get_data_deeper.py (option cache, .http_cache).
+    Crawl contre le serveur : python get_data_deeper.py intl 7 base=http://127.0.0.1:8765/webffn/
+    """
+    sources = [a for a in sys.argv[1:] if "=" not in a]
+    if not sources:
+        raise SystemExit(
+            "Usage : python fake_extranat_server.py <dossier de pages> [port=8765] [latency=0.05] [jitter=0.02] "
+            "[bandwidth=500000] [p403=0.01] [p429=0.01] [p5xx=0.01] [session_limit=50] [seed=1]"
+        )
+    options = dict(a.split("=", 1) for a in sys.argv[1:] if "=" in a)
+
+    fixtures = FixtureStore(sources[0])
+    fake = FakeExtranatServer(
+        fixtures,
+        latency=float(options.get("latency", "0")),
+        jitter=float(options.get("jitter", "0")),
+        bandwidth=float(options.get("bandwidth", "0")),
+        p403=float(options.get("p403", "0")),
+        p429=float(options.get("p429", "0")),
+        p5xx=float(options.get("p5xx", "0")),
+        retry_after=int(options.get("retry_after", "1")),
+        session_limit=int(options.get("session_limit", "0")),
+        seed=int(options["seed"]) if "seed" in options else None,
+    )
+    base_url = fake.start(port=int(options.get("port", "8765")), host=options.get("host", "127.0.0.1"))
+    print(f"Serveur Extranat local : {base_url} ({len(fixtures)} page(s) de {fixtures.directory})")
+    print(f"Crawl : python get_data_deeper.py intl 7 base={base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Bilan : {json.dumps(fake.stats(), ensure_ascii=False)}")
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,592 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer, Tag
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import hashlib
+import json
+import os
+import threading
 import time
 import re
 
+import crawl_metrics
 
-# Effectue une requête GET HTTP avec relances automatiques 
-def http_get_with_retries(url: str, headers: Optional[dict] = None, max_retries: int = 3, base_delay: float = 1.0, debug: bool = False, session: Optional[requests.Session] = None, retry_forever: bool = False):
+
+# Analyseur HTML utilisé par make_soup : lxml (rapide, déjà dans requirements.txt) s'il est installé, sinon html.parser
+def _default_html_parser() -> str:
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+_html_parser: str = _default_html_parser()
+
+
+# Choisit l'analyseur ("lxml", "html.parser", "html5lib"...) ; retombe sur html.parser s'il n'est pas disponible.
+# Renvoie le nom de l'analyseur effectivement retenu.
+def set_html_parser(name: str) -> str:
+    global _html_parser
+    try:
+        BeautifulSoup("", name)
+        _html_parser = name
+    except FeatureNotFound:
+        print(f"Analyseur HTML '{name}' indisponible, utilisation de html.parser")
+        _html_parser = "html.parser"
+    return _html_parser
+
+
+def get_html_parser() -> str:
+    return _html_parser
+
+
+# Analyse partielle : seuls les sous-arbres décrits par le SoupStrainer passé à make_soup sont construits
+# (tables de résultats, blocs compétition, selects...). Désactivable pour déboguer une page atypique.
+_partial_parsing: bool = True
+
+
+def set_partial_parsing(enabled: bool) -> None:
+    global _partial_parsing
+    _partial_parsing = enabled
+
+
+def get_partial_parsing() -> bool:
+    return _partial_parsing
+
+
+# Sous-arbre utile des pages de résultats (get_competition_data, pages d'épreuves)
+RESULT_TABLES = SoupStrainer("table")
+
+# Div englobant la table de résultats des pages récentes (stratégie result_div), gardé avec tout son contenu
+RESULT_DIV_CLASS = 'relative overflow-x-auto shadow-md sm:rounded-lg print-not-shadow'
+RESULT_WRAPPER = SoupStrainer("div", class_=RESULT_DIV_CLASS)
+
+
+# Vrai si make_soup limite réellement l'arbre avec parse_only (analyse partielle activée, analyseur compatible)
+def partial_parsing_applies(parser: Optional[str] = None) -> bool:
+    return _partial_parsing and (parser or _html_parser) != "html5lib"
+
+
+# Construit un BeautifulSoup avec l'analyseur configuré ; parse_only limite l'arbre aux éléments utiles
+# (ignoré si l'analyse partielle est désactivée ou avec html5lib, qui ne supporte pas SoupStrainer)
+def make_soup(markup, parser: Optional[str] = None, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    parser = parser or _html_parser
+    if parse_only is not None and partial_parsing_applies(parser):
+        return BeautifulSoup(markup, parser, parse_only=parse_only)
+    return BeautifulSoup(markup, parser)
+
+
+# Normalise une URL pour servir de clé (schéma/hôte en minuscules, paramètres de requête triés, sans fragment)
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class ResponseCache:
+    """
+    Cache disque persistant des réponses HTTP, indexé par URL normalisée.
+
+    Chaque entrée est stockée dans deux fichiers : <clé>.body (contenu brut) et
+    <clé>.json (URL, statut, encodage, en-têtes utiles, date de stockage).
+    Une entrée expirée n'est pas supprimée : si elle porte un validateur (ETag,
+    Last-Modified), la requête suivante est conditionnelle et une réponse 304
+    la prolonge sans retransférer le corps (voir revalidate). Le résultat de
+    l'analyse d'une page peut être gardé à côté (<clé>.parsed.json, voir
+    get_parsed / put_parsed) et resservi tant que le corps ne change pas.
+    - ttl : durée de validité (secondes) des pages de compétitions / résultats ;
+    - listing_ttl : durée de validité des pages de listes (competitions.php),
+      qui reçoivent de nouvelles compétitions régulièrement ;
+    - max_bytes : taille maximale des corps sur disque ; au-delà, les entrées
+      les moins récemment utilisées sont supprimées (LRU, via la date de
+      modification du fichier .body, mise à jour à chaque lecture).
+    """
+
+    def __init__(self, directory: str = ".http_cache", ttl: float = 7 * 24 * 3600.0, listing_ttl: float = 3600.0, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.listing_ttl = listing_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.parse_hits = 0
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+        self._load_entries()
+
+    # Reconstruit l'ordre LRU à partir des fichiers présents (du plus ancien accès au plus récent)
+    def _load_entries(self) -> None:
+        found: List[Tuple[float, str, int]] = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".body"):
+                    continue
+                st = entry.stat()
+                found.append((st.st_mtime, entry.name[: -len(".body")], st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self.total_bytes += size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key_for(self, url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        return self.listing_ttl if "competitions.php" in url else self.ttl
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return base + ".body", base + ".json"
+
+    def _parsed_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".parsed.json")
+
+    @staticmethod
+    def _response(url: str, meta: Dict, body: bytes) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = meta.get("status_code", 200)
+        resp._content = body
+        resp.url = meta.get("url", url)
+        resp.encoding = meta.get("encoding")
+        resp.headers.update(meta.get("headers", {}))
+        resp.from_cache = True
+        return resp
+
+    # Renvoie la réponse en cache (objet requests.Response marqué from_cache=True) ou None si absente / expirée
+    def get(self, url: str) -> Optional[requests.Response]:
+        key = self.key_for(url)
+        body_path, meta_path = self._paths(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if time.time() - meta.get("stored_at", 0.0) > self.ttl_for(url):
+                    self.misses += 1
+                    return None
+                with open(body_path, "rb") as f:
+                    body = f.read()
+                os.utime(body_path, None)
+            except (OSError, ValueError):
+                self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self._response(url, meta, body)
+
+    # Entrée expirée portant un validateur (ETag / Last-Modified), pour une requête conditionnelle ; None sinon
+    def get_stale(self, url: str) -> Optional[requests.Response]:
+        key = self.key_for(url)
+        body_path, meta_path = self._paths(key)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                headers = {k.lower() for k in meta.get("headers", {})}
+                if "etag" not in headers and "last-modified" not in headers:
+                    return None
+                with open(body_path, "rb") as f:
+                    body = f.read()
+            except (OSError, ValueError):
+                return None
+        return self._response(url, meta, body)
+
+    # Réponse 304 pour une entrée expirée : elle redevient valide pour une durée complète (le corps n'est pas réécrit)
+    def revalidate(self, url: str, resp: Optional[requests.Response] = None) -> None:
+        key = self.key_for(url)
+        body_path, meta_path = self._paths(key)
+        with self._lock:
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if resp is not None:
+                    for name, value in resp.headers.items():
+                        if name.lower() in ("etag", "last-modified"):
+                            meta.setdefault("headers", {})[name] = value
+                meta["stored_at"] = time.time()
+                tmp_meta = meta_path + ".tmp"
+                with open(tmp_meta, "w", encoding="utf-8") as f:
+                    json.dump(meta, f, ensure_ascii=False)
+                os.replace(tmp_meta, meta_path)
+                os.utime(body_path, None)
+            except (OSError, ValueError):
+                return
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.revalidated += 1
+
+    # Résultat d'analyse gardé pour ce corps de page (name : type d'analyse), ou None si absent ou si le corps a changé
+    def get_parsed(self, url: str, body: bytes, name: str):
+        key = self.key_for(url)
+        try:
+            with open(self._parsed_path(key), "r", encoding="utf-8") as f:
+                parsed = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if parsed.get("name") != name or parsed.get("digest") != hashlib.sha256(body).hexdigest():
+            return None
+        with self._lock:
+            self.parse_hits += 1
+        return parsed.get("value")
+
+    def put_parsed(self, url: str, body: bytes, name: str, value) -> None:
+        key = self.key_for(url)
+        if key not in self._entries:
+            return
+        path = self._parsed_path(key)
+        payload = {"name": name, "digest": hashlib.sha256(body).hexdigest(), "value": value}
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            return
+
+    # Enregistre une réponse 200 puis évince les entrées les plus anciennes si la taille maximale est dépassée
+    def put(self, url: str, resp: requests.Response) -> None:
+        if resp.status_code != 200:
+            return
+        key = self.key_for(url)
+        body_path, meta_path = self._paths(key)
+        body = resp.content
+        meta = {
+            "url": url,
+            "status_code": resp.status_code,
+            "encoding": resp.encoding,
+            "headers": {
+                k: v for k, v in resp.headers.items()
+                if k.lower() in ("content-type", "etag", "last-modified")
+            },
+            "stored_at": time.time(),
+        }
+        with self._lock:
+            try:
+                tmp_body = body_path + ".tmp"
+                with open(tmp_body, "wb") as f:
+                    f.write(body)
+                os.replace(tmp_body, body_path)
+                tmp_meta = meta_path + ".tmp"
+                with open(tmp_meta, "w", encoding="utf-8") as f:
+                    json.dump(meta, f, ensure_ascii=False)
+                os.replace(tmp_meta, meta_path)
+            except OSError:
+                return
+            self.total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(body)
+            self.total_bytes += len(body)
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def _discard(self, key: str) -> None:
+        self.total_bytes -= self._entries.pop(key, 0)
+        for path in (*self._paths(key), self._parsed_path(key)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Cache utilisé par défaut par http_get_with_retries (désactivé tant que set_http_cache n'est pas appelé)
+_http_cache: Optional[ResponseCache] = None
+
+
+def set_http_cache(cache: Optional[ResponseCache]) -> None:
+    global _http_cache
+    _http_cache = cache
+
+
+def get_http_cache() -> Optional[ResponseCache]:
+    return _http_cache
+
+
+class RateLimiter:
+    """
+    Limiteur de débit « seau à jetons », partagé entre threads et tenu par hôte :
+    au plus `rate` requêtes par seconde en moyenne vers un même hôte, avec des
+    rafales d'au plus `burst` requêtes.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1.0, float(burst))
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    # Réserve un jeton pour l'hôte de l'URL et renvoie le délai (secondes) à attendre avant d'envoyer la requête.
+    # Le seau peut devenir négatif : les réservations suivantes attendent d'autant plus longtemps.
+    def reserve(self, url: str) -> float:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.setdefault(host, [self.capacity, now])
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            bucket[0] -= 1.0
+            if bucket[0] >= 0.0:
+                return 0.0
+            return -bucket[0] / self.rate
+
+    # Bloque jusqu'à obtenir un jeton pour l'hôte de l'URL ; renvoie le temps attendu (secondes)
+    def acquire(self, url: str) -> float:
+        wait = self.reserve(url)
+        crawl_metrics.sleep(wait, "limiteur")
+        return wait
+
+
+class AdaptiveRateController(RateLimiter):
+    """
+    Limiteur de débit adaptatif (AIMD) : le débit autorisé monte de façon additive
+    tant que les réponses sont rapides et réussies (+increase requête/s environ par
+    seconde de succès), et il est multiplié par `decrease` à chaque réponse
+    403 / 429 / 5xx, erreur réseau ou pic de latence (réponse plus lente que
+    `latency_factor` fois la latence moyenne et que min_spike_latency secondes).
+    Une seule baisse par fenêtre de `cooldown` secondes : les requêtes déjà en vol
+    au moment d'une surcharge ne font pas s'effondrer le débit.
+
+    http_get_with_retries (et le moteur async) signalent chaque réponse via observe ;
+    snapshot() donne le débit courant et l'état pour les journaux.
+    """
+
+    def __init__(self, rate: float = 2.0, min_rate: float = 0.2, max_rate: float = 16.0, burst: int = 1, increase: float = 0.5, decrease: float = 0.5, latency_factor: float = 3.0, min_spike_latency: float = 1.0, cooldown: float = 1.0):
+        super().__init__(rate, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.min_spike_latency = min_spike_latency
+        self.cooldown = cooldown
+        self.state = "hausse"
+        self.successes = 0
+        self.backoffs = 0
+        self.latency_avg: Optional[float] = None
+        self._last_backoff = float("-inf")
+
+    # Signale une réponse : statut HTTP (None pour une erreur réseau / un délai dépassé) et latence en secondes
+    def observe(self, status: Optional[int], latency: float) -> None:
+        with self._lock:
+            overloaded = status is None or status in (403, 429) or status >= 500
+            spike = (
+                not overloaded
+                and self.latency_avg is not None
+                and latency > self.min_spike_latency
+                and latency > self.latency_factor * self.latency_avg
+            )
+            if overloaded or spike:
+                now = time.monotonic()
+                if now - self._last_backoff >= self.cooldown:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self._last_backoff = now
+                    self.backoffs += 1
+                self.state = "recul"
+            else:
+                self.successes += 1
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+                self.state = "plafond" if self.rate >= self.max_rate else "hausse"
+            if status is not None and status < 400:
+                self.latency_avg = latency if self.latency_avg is None else 0.8 * self.latency_avg + 0.2 * latency
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "rate": round(self.rate, 2),
+                "state": self.state,
+                "successes": self.successes,
+                "backoffs": self.backoffs,
+                "latency_ms": round(self.latency_avg * 1000) if self.latency_avg is not None else None,
+            }
+
+    def describe(self) -> str:
+        snap = self.snapshot()
+        latency = f", latence {snap['latency_ms']} ms" if snap["latency_ms"] is not None else ""
+        return f"{snap['rate']:g} requête(s)/s ({snap['state']}, {snap['backoffs']} recul(s){latency})"
+
+
+# Limiteur utilisé par défaut par http_get_with_retries (aucune limite tant que set_rate_limiter n'est pas appelé)
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    global _rate_limiter
+    _rate_limiter = limiter
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    return _rate_limiter
+
+
+class RequestRegistry:
+    """
+    Registre des requêtes d'une exécution, indexé par URL normalisée.
+
+    Une même compétition apparaît sous plusieurs idtyp et ses pages d'épreuves
+    sous les filtres Dames et Messieurs : une URL déjà téléchargée est resservie
+    depuis la mémoire, et une URL en cours de téléchargement dans un autre thread
+    est attendue au lieu d'être demandée une seconde fois.
+    - max_bytes : taille maximale des corps gardés en mémoire (les moins
+      récemment utilisés sont oubliés au-delà). Les doublons d'une compétition
+      sont demandés à peu d'intervalle : quelques Mo suffisent, le cache disque
+      (ResponseCache) prend le relais pour les répétitions lointaines.
+    `fetched` compte les requêtes réellement envoyées, `saved` celles évitées.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.fetched = 0
+        self.saved = 0
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        self._completed: "OrderedDict[str, requests.Response]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+
+    # Réponse déjà obtenue pour cette URL (comptée comme requête évitée), ou None
+    def lookup(self, url: str) -> Optional[requests.Response]:
+        key = normalize_url(url)
+        with self._lock:
+            resp = self._completed.get(key)
+            if resp is not None:
+                self._completed.move_to_end(key)
+                self.saved += 1
+            return resp
+
+    # Enregistre une réponse obtenue hors de fetch() (moteur async)
+    def store(self, url: str, resp: requests.Response) -> None:
+        with self._lock:
+            self.fetched += 1
+            self._remember(normalize_url(url), resp)
+
+    # Compte une requête évitée hors de fetch() (moteur async : requête jumelée à une requête en vol)
+    def note_saved(self) -> None:
+        with self._lock:
+            self.saved += 1
+
+    # Renvoie la réponse de l'URL : déjà obtenue, attendue si un autre thread la télécharge, sinon fetcher()
+    def fetch(self, url: str, fetcher: Callable[[], requests.Response]) -> requests.Response:
+        key = normalize_url(url)
+        with self._lock:
+            resp = self._completed.get(key)
+            if resp is not None:
+                self._completed.move_to_end(key)
+                self.saved += 1
+                return resp
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.saved += 1
+        if not owner:
+            return future.result()
+
+        try:
+            resp = fetcher()
+        except Exception as e:
+            # Échec partagé avec les requêtes en attente ; une requête ultérieure retentera l'URL
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._in_flight.pop(key, None)
+            self.fetched += 1
+            self._remember(key, resp)
+        future.set_result(resp)
+        return resp
+
+    def _remember(self, key: str, resp: requests.Response) -> None:
+        size = len(resp.content)
+        if size > self.max_bytes:
+            return
+        previous = self._completed.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= len(previous.content)
+        self._completed[key] = resp
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and self._completed:
+            _, evicted = self._completed.popitem(last=False)
+            self.total_bytes -= len(evicted.content)
+
+
+# Registre utilisé par http_get_with_retries (désactivé tant que set_request_registry n'est pas appelé)
+_request_registry: Optional[RequestRegistry] = None
+
+
+def set_request_registry(registry: Optional[RequestRegistry]) -> None:
+    global _request_registry
+    _request_registry = registry
+
+
+def get_request_registry() -> Optional[RequestRegistry]:
+    return _request_registry
+
+
+# Requêtes réseau envoyées par le thread courant (hors cache disque et registre) : un thread qui compare
+# ce compteur avant / après le traitement d'une page sait si elle a été servie sans requête,
+# sans être faussé par les téléchargements des autres threads
+_thread_requests = threading.local()
+
+
+def thread_request_count() -> int:
+    return getattr(_thread_requests, "count", 0)
+
+
+# En-têtes If-None-Match / If-Modified-Since tirés des validateurs d'une réponse en cache
+def conditional_headers(resp: requests.Response) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if resp.headers.get("ETag"):
+        headers["If-None-Match"] = resp.headers["ETag"]
+    if resp.headers.get("Last-Modified"):
+        headers["If-Modified-Since"] = resp.headers["Last-Modified"]
+    return headers
+
+
+# Transmet le statut et la latence d'une réponse au limiteur s'il est adaptatif
+def _observe_response(status: Optional[int], latency: float) -> None:
+    if isinstance(_rate_limiter, AdaptiveRateController):
+        _rate_limiter.observe(status, latency)
+
+
+# Effectue une requête GET HTTP avec relances automatiques (en passant d'abord par le cache disque s'il est actif)
+def http_get_with_retries(url: str, headers: Optional[dict] = None, max_retries: int = 3, base_delay: float = 1.0, debug: bool = False, session: Optional[requests.Session] = None, retry_forever: bool = False, cache: Optional[ResponseCache] = None):
+    if cache is None:
+        cache = _http_cache
+    if cache is not None:
+        cached = cache.get(url)
+        if cached is not None:
+            if debug:
+                print(f"[http_get_with_retries] {url} → servi depuis le cache")
+            metrics = crawl_metrics.get_metrics()
+            if metrics is not None:
+                metrics.record_cache_hit()
+            return cached
+
+    if _request_registry is not None:
+        return _request_registry.fetch(
+            url,
+            lambda: _get_with_retries(url, headers, max_retries, base_delay, debug, session, retry_forever, cache),
+        )
+    return _get_with_retries(url, headers, max_retries, base_delay, debug, session, retry_forever, cache)
+
+
+# Boucle de requêtes de http_get_with_retries (hors cache et registre), avec délais croissants entre tentatives
+def _get_with_retries(url: str, headers: Optional[dict], max_retries: int, base_delay: float, debug: bool, session: Optional[requests.Session], retry_forever: bool, cache: Optional[ResponseCache]):
+    _thread_requests.count = thread_request_count() + 1
     if headers is None:
         headers = {
             "User-Agent": (
@@ -27,18 +607,39 @@ def http_get_with_retries(url: str, headers: Optional[dict] = None, max_retries:
             "Cache-Control": "max-age=0",
         }
 
+    # Copie expirée en cache avec un validateur : requête conditionnelle, une réponse 304 la resservira
+    stale = cache.get_stale(url) if cache is not None else None
+    if stale is not None:
+        headers = {**headers, **conditional_headers(stale)}
+
     last_exc: Optional[Exception] = None
     attempt = 0
     max_delay = 300.0
 
+    metrics = crawl_metrics.get_metrics()
     while True:
         attempt += 1
+        if metrics is not None and attempt > 1:
+            metrics.record_retry(url)
+        if _rate_limiter is not None:
+            _rate_limiter.acquire(url)
+        started = time.monotonic()
         try:
             if session is not None:
                 resp = session.get(url, headers=headers, timeout=20)
             else:
                 resp = requests.get(url, headers=headers, timeout=20)
+            _observe_response(resp.status_code, time.monotonic() - started)
+            if metrics is not None:
+                metrics.record_request(url, resp.status_code, time.monotonic() - started, len(resp.content))
+            if resp.status_code == 304 and stale is not None:
+                if debug:
+                    print(f"[http_get_with_retries] {url} → 304, copie en cache revalidée")
+                cache.revalidate(url, resp)
+                return stale
             if resp.status_code < 400:
+                if cache is not None:
+                    cache.put(url, resp)
                 return resp
 
             if resp.status_code not in (403, 429) and not (500 <= resp.status_code < 600):
@@ -69,6 +670,10 @@ def http_get_with_retries(url: str, headers: Optional[dict] = None, max_retries:
 
         except requests.RequestException as exc:
             last_exc = exc
+            if not isinstance(exc, requests.HTTPError):
+                _observe_response(None, time.monotonic() - started)
+                if metrics is not None:
+                    metrics.record_request(url, None, time.monotonic() - started)
             if debug:
                 if retry_forever:
                     print(
@@ -92,7 +697,7 @@ def http_get_with_retries(url: str, headers: Optional[dict] = None, max_retries:
         else:
             delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
 
-        time.sleep(delay)
+        crawl_metrics.sleep(delay, "relance")
 
     if isinstance(last_exc, requests.HTTPError) and getattr(last_exc, "response", None) is not None:
         raise last_exc
@@ -102,72 +707,128 @@ def http_get_with_retries(url: str, headers: Optional[dict] = None, max_retries:
         )
 
 # Récupère les données de compétition (résultats de natation) depuis l'URL fournie 
-def get_competition_data(url: str, debug: bool = False, session: Optional[requests.Session] = None, retry_forever: bool = True) -> List[Dict]:
+def get_competition_data(url: str, debug: bool = False, session: Optional[requests.Session] = None, retry_forever: bool = True, cache: Optional[ResponseCache] = None) -> List[Dict]:
     response = http_get_with_retries(
         url,
         debug=debug,
         max_retries=5,
         session=session,
         retry_forever=retry_forever,
+        cache=cache,
     )
+    return parse_competition_page(response.content, debug=debug, layout_key=result_layout_key(url))
 
-    soup = BeautifulSoup(response.content, 'html.parser')
 
-    table = None
-    table_div = soup.find('div', class_='relative overflow-x-auto shadow-md sm:rounded-lg print-not-shadow')
-    if table_div:
-        table = table_div.find('table')
+# Gabarits des pages de résultats : où trouver la table (dans l'ordre où les stratégies sont essayées)
+RESULT_LAYOUTS = ("result_div", "result_table", "text_table", "text_div")
 
-    if not table:
-        table = soup.find('table', class_='w-full text-sm text-left text-gray-500')
+# Classe CSS indispensable à chacune des deux premières stratégies : absente du HTML brut, la stratégie est sautée
+_LAYOUT_MARKERS = ((b"print-not-shadow", "result_div"), (b"text-gray-500", "result_table"))
 
-    if not table:
-        all_tables = soup.find_all('table')
-        for t in all_tables:
-            if '100 Nage Libre' in t.get_text() or 'Brasse' in t.get_text():
-                table = t
-                break
 
-    if not table:
-        divs = soup.find_all('div')
-        for div in divs:
-            if '100 Nage Libre' in div.get_text() or 'Brasse' in div.get_text():
-                table = div.find('table')
-                if table:
-                    break
+# Gabarit d'une page d'après des marqueurs bon marché (recherche d'octets dans le HTML brut, sans arbre) :
+# première stratégie qui peut aboutir ; None si seule la recherche par texte (text_table, text_div) reste possible
+def classify_result_layout(content: bytes) -> Optional[str]:
+    for marker, layout in _LAYOUT_MARKERS:
+        if marker in content:
+            return layout
+    return None
 
-    if not table:
-        print("Table non trouvée - Débogage:")
-        print(f"Taille du HTML: {len(response.content)} bytes")
-        with open('debug.html', 'w', encoding='utf-8') as f:
-            f.write(response.text)
-        print("HTML sauvegardé dans 'debug.html' pour inspection")
-        all_tables = soup.find_all('table')
-        print(f"Nombre total de tables trouvées: {len(all_tables)}")
-        return []
 
-    if debug:
-        print("Table trouvée! Recherche des données...")
+# Compétition d'une URL de page de résultats (paramètre idcpt), clé du cache des gabarits
+def result_layout_key(url: str) -> Optional[str]:
+    return dict(parse_qsl(urlsplit(url).query)).get("idcpt")
+
+
+# Stratégie de recherche de la table retenue pour chaque compétition : les pages suivantes d'une même
+# compétition l'essaient directement, sans classer leur HTML (classify_result_layout)
+_result_layouts: Dict[str, str] = {}
+_result_layouts_lock = threading.Lock()
+
+
+def get_result_layout(key: Optional[str]) -> Optional[str]:
+    if key is None:
+        return None
+    with _result_layouts_lock:
+        return _result_layouts.get(key)
+
+
+def remember_result_layout(key: Optional[str], layout: str) -> None:
+    if key is None:
+        return
+    with _result_layouts_lock:
+        _result_layouts[key] = layout
+
+
+# Div les plus externes (sans div parmi leurs ancêtres), dans l'ordre du document, sans descendre dans les div
+def _outermost_divs(node: Tag) -> Iterator[Tag]:
+    for child in node.children:
+        if not isinstance(child, Tag):
+            continue
+        if child.name == 'div':
+            yield child
+        else:
+            yield from _outermost_divs(child)
+
+
+# Table de résultats selon une stratégie ; None si elle n'aboutit pas sur cette page
+def _locate_result_table(soup: BeautifulSoup, layout: str) -> Optional[Tag]:
+    if layout == "result_div":
+        table_div = soup.find('div', class_=RESULT_DIV_CLASS)
+        return table_div.find('table') if table_div else None
+    if layout == "result_table":
+        return soup.find('table', class_='w-full text-sm text-left text-gray-500')
+    if layout == "text_table":
+        for t in soup.find_all('table'):
+            text = t.get_text()
+            if '100 Nage Libre' in text or 'Brasse' in text:
+                return t
+        return None
+    # text_div : premier div contenant une épreuve et une table. Seuls les div les plus externes sont lus :
+    # le texte d'un div intérieur est inclus dans celui de son div externe, et un div externe sans table
+    # n'en contient aucun qui en ait une ; le résultat est donc celui du parcours de tous les div, sans
+    # relire le texte de chaque niveau d'imbrication (coût quadratique sur les grandes pages)
+    for div in _outermost_divs(soup):
+        text = div.get_text()
+        if '100 Nage Libre' in text or 'Brasse' in text:
+            table = div.find('table')
+            if table:
+                return table
+    return None
+
+
+# Cherche la table de résultats : stratégies impossibles d'après classify_result_layout sautées.
+# allowed : stratégies que l'arbre (partiel) permet de suivre ; la recherche s'arrête à la première qui
+# n'en fait pas partie, pour ne jamais retenir une table que l'arbre complet n'aurait pas donnée
+def find_result_table(soup: BeautifulSoup, content: bytes, allowed: Optional[Tuple[str, ...]] = None) -> Tuple[Optional[Tag], Optional[str]]:
+    detected = classify_result_layout(content)
+    order = RESULT_LAYOUTS[RESULT_LAYOUTS.index(detected):] if detected is not None else ("text_table", "text_div")
+    for layout in order:
+        if allowed is not None and layout not in allowed:
+            break
+        table = _locate_result_table(soup, layout)
+        if table:
+            return table, layout
+    return None, None
+
+
+# Arbre partiel suffisant pour les premières stratégies d'une page : le div englobant pour result_div,
+# les seules tables pour result_table et text_table (text_div lit les div de la page entière)
+def _partial_result_tree(content: bytes) -> Tuple[SoupStrainer, Tuple[str, ...]]:
+    if classify_result_layout(content) == "result_div":
+        return RESULT_WRAPPER, ("result_div",)
+    return RESULT_TABLES, ("result_table", "text_table")
+
 
+# Arbre partiel suffisant pour chaque stratégie (None : page entière)
+_LAYOUT_STRAINERS = {"result_div": RESULT_WRAPPER, "result_table": RESULT_TABLES, "text_table": RESULT_TABLES, "text_div": None}
+
+
+# Résultats d'une table organisée en blocs thead (épreuve, date) / tbody (lignes de résultats)
+def _results_from_sections(all_elements: List[Tag], debug: bool = False) -> List[Dict]:
     results = []
     current_event = None
     current_date = None
-    all_rows = table.find_all('tr')
-    all_elements = table.find_all(['thead', 'tbody'])
-
-    if debug:
-        print(f"Nombre total de lignes (tr) trouvées: {len(all_rows)}")
-        print(f"Nombre d'éléments thead/tbody trouvés: {len(all_elements)}")
-
-    if not all_elements:
-        rows = table.find_all('tr')
-        if debug:
-            print(f"Nombre de lignes trouvées: {len(rows)}")
-            for i, row in enumerate(rows[:5]):
-                cells = row.find_all(['td', 'th'])
-                if len(cells) > 0:
-                    text_content = ' '.join([cell.get_text(strip=True) for cell in cells[:3]])
-                    print(f"Ligne {i+1}: {text_content[:100]}...")
 
     for idx, element in enumerate(all_elements):
         if element.name == 'thead':
@@ -281,109 +942,170 @@ def get_competition_data(url: str, debug: bool = False, session: Optional[reques
                     elif debug:
                         print(f"Ligne ignorée - Rank: '{rank}', Swimmer: '{swimmer_name}', Time: '{time}'")
 
-    if len(results) == 0:
-        if debug:
-            print("\nTentative avec approche alternative: parcourir toutes les lignes...")
-        current_event = None
-        current_date = None
-
-        for row in all_rows:
-            cells = row.find_all(['td', 'th'])
-
-            if len(cells) == 1 and ('Nage Libre' in row.get_text() or 'Brasse' in row.get_text()):
-                text = row.get_text(strip=True)
-                if ' - ' in text:
-                    parts = text.split(' - ')
-                    if len(parts) >= 2:
-                        current_event = parts[0].strip()
-                        date_text = ' - '.join(parts[1:])
-                        days = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
-                        for day in days:
-                            if day in date_text:
-                                day_index = date_text.find(day)
-                                date_parts = date_text[day_index:].split()
-                                if len(date_parts) >= 4:
-                                    current_date = ' '.join(date_parts[:4])
-                                break
-                        if not current_date:
-                            current_date = date_text.strip()
-                        if debug:
-                            print(f"Épreuve détectée (alt): {current_event} - Date: {current_date}")
-
-            elif len(cells) >= 4:
-                rank = cells[0].get_text(strip=True)
-                swimmer_cell = cells[1]
-                swimmer_link = swimmer_cell.find('a')
-                swimmer_name = swimmer_link.get_text(strip=True) if swimmer_link else swimmer_cell.get_text(strip=True)
-
-                club_cell = cells[2] if len(cells) > 2 else None
-                club_name = ""
-                if club_cell:
-                    club_link = club_cell.find('a')
-                    club_name = club_link.get_text(strip=True) if club_link else club_cell.get_text(strip=True)
+    return results
 
-                time_cell = cells[3] if len(cells) > 3 else None
-                time = time_cell.get_text(strip=True) if time_cell else ""
 
-                splits = []
-                if time_cell:
-                    split_links = time_cell.find_all('a', class_='text-blue-600')
-                    for split_link in split_links:
-                        split_time = split_link.get_text(strip=True)
-                        if split_time:
-                            split_info = {'time': split_time}
-                            if split_link.get('title'):
-                                split_info['distance'] = split_link.get('title')
-                            elif split_link.get('data-distance'):
-                                split_info['distance'] = split_link.get('data-distance')
-                            elif split_link.get('data-tippy-content'):
-                                tippy_content = split_link.get('data-tippy-content', '')
-                                distance_match = re.search(r'(\d+)\s*m', tippy_content, re.IGNORECASE)
-                                if distance_match:
-                                    split_info['distance'] = distance_match.group(1) + 'm'
-                                splits.append(split_info)
+# Résultats d'une table parcourue ligne par ligne (épreuve sur une ligne à cellule unique)
+def _results_from_rows(all_rows: List[Tag], debug: bool = False) -> List[Dict]:
+    results = []
+    current_event = None
+    current_date = None
 
-                if not splits and time_cell:
-                    split_links = row.find_all('a', class_='text-blue-600')
-                    for split_link in split_links:
-                        split_time = split_link.get_text(strip=True)
-                        if split_time:
-                            split_info = {'time': split_time}
-                            if split_link.get('title'):
-                                split_info['distance'] = split_link.get('title')
-                            elif split_link.get('data-distance'):
-                                split_info['distance'] = split_link.get('data-distance')
-                            elif split_link.get('data-tippy-content'):
-                                tippy_content = split_link.get('data-tippy-content', '')
-                                distance_match = re.search(r'(\d+)\s*m', tippy_content, re.IGNORECASE)
-                                if distance_match:
-                                    split_info['distance'] = distance_match.group(1) + 'm'
-                                splits.append(split_info)
+    for row in all_rows:
+        cells = row.find_all(['td', 'th'])
 
-                mpp_info = ""
-                if len(cells) >= 7:
-                    mpp_cell = cells[6]
-                    mpp_button = mpp_cell.find('button')
-                    if mpp_button and mpp_button.get('data-tippy-content'):
-                        mpp_info = mpp_button.get('data-tippy-content', '')
-                        mpp_info = mpp_info.replace('&lt;b&gt;', '').replace('&lt;/b&gt;', '').replace('<b>', '').replace('</b>', '')
-
-                if rank and rank.replace('.', '').isdigit() and swimmer_name and time:
-                    result = {
-                        'event': current_event,
-                        'date': current_date,
-                        'rank': rank,
-                        'swimmer': swimmer_name,
-                        'club': club_name,
-                        'time': time,
-                        'mpp': mpp_info
-                    }
-                    if splits:
-                        result['splits'] = splits
-                    results.append(result)
+        if len(cells) == 1 and ('Nage Libre' in row.get_text() or 'Brasse' in row.get_text()):
+            text = row.get_text(strip=True)
+            if ' - ' in text:
+                parts = text.split(' - ')
+                if len(parts) >= 2:
+                    current_event = parts[0].strip()
+                    date_text = ' - '.join(parts[1:])
+                    days = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
+                    for day in days:
+                        if day in date_text:
+                            day_index = date_text.find(day)
+                            date_parts = date_text[day_index:].split()
+                            if len(date_parts) >= 4:
+                                current_date = ' '.join(date_parts[:4])
+                            break
+                    if not current_date:
+                        current_date = date_text.strip()
                     if debug:
-                        print(f"Résultat trouvé (alt): {swimmer_name} - {time}")
+                        print(f"Épreuve détectée (alt): {current_event} - Date: {current_date}")
+
+        elif len(cells) >= 4:
+            rank = cells[0].get_text(strip=True)
+            swimmer_cell = cells[1]
+            swimmer_link = swimmer_cell.find('a')
+            swimmer_name = swimmer_link.get_text(strip=True) if swimmer_link else swimmer_cell.get_text(strip=True)
+
+            club_cell = cells[2] if len(cells) > 2 else None
+            club_name = ""
+            if club_cell:
+                club_link = club_cell.find('a')
+                club_name = club_link.get_text(strip=True) if club_link else club_cell.get_text(strip=True)
+
+            time_cell = cells[3] if len(cells) > 3 else None
+            time = time_cell.get_text(strip=True) if time_cell else ""
+
+            splits = []
+            if time_cell:
+                split_links = time_cell.find_all('a', class_='text-blue-600')
+                for split_link in split_links:
+                    split_time = split_link.get_text(strip=True)
+                    if split_time:
+                        split_info = {'time': split_time}
+                        if split_link.get('title'):
+                            split_info['distance'] = split_link.get('title')
+                        elif split_link.get('data-distance'):
+                            split_info['distance'] = split_link.get('data-distance')
+                        elif split_link.get('data-tippy-content'):
+                            tippy_content = split_link.get('data-tippy-content', '')
+                            distance_match = re.search(r'(\d+)\s*m', tippy_content, re.IGNORECASE)
+                            if distance_match:
+                                split_info['distance'] = distance_match.group(1) + 'm'
+                            splits.append(split_info)
+
+            if not splits and time_cell:
+                split_links = row.find_all('a', class_='text-blue-600')
+                for split_link in split_links:
+                    split_time = split_link.get_text(strip=True)
+                    if split_time:
+                        split_info = {'time': split_time}
+                        if split_link.get('title'):
+                            split_info['distance'] = split_link.get('title')
+                        elif split_link.get('data-distance'):
+                            split_info['distance'] = split_link.get('data-distance')
+                        elif split_link.get('data-tippy-content'):
+                            tippy_content = split_link.get('data-tippy-content', '')
+                            distance_match = re.search(r'(\d+)\s*m', tippy_content, re.IGNORECASE)
+                            if distance_match:
+                                split_info['distance'] = distance_match.group(1) + 'm'
+                            splits.append(split_info)
+
+            mpp_info = ""
+            if len(cells) >= 7:
+                mpp_cell = cells[6]
+                mpp_button = mpp_cell.find('button')
+                if mpp_button and mpp_button.get('data-tippy-content'):
+                    mpp_info = mpp_button.get('data-tippy-content', '')
+                    mpp_info = mpp_info.replace('&lt;b&gt;', '').replace('&lt;/b&gt;', '').replace('<b>', '').replace('</b>', '')
+
+            if rank and rank.replace('.', '').isdigit() and swimmer_name and time:
+                result = {
+                    'event': current_event,
+                    'date': current_date,
+                    'rank': rank,
+                    'swimmer': swimmer_name,
+                    'club': club_name,
+                    'time': time,
+                    'mpp': mpp_info
+                }
+                if splits:
+                    result['splits'] = splits
+                results.append(result)
+                if debug:
+                    print(f"Résultat trouvé (alt): {swimmer_name} - {time}")
+
+    return results
+
+
+# Extrait les résultats (épreuve, rang, nageur, club, temps, splits, MPP) du HTML brut d'une page de compétition.
+# layout_key (voir result_layout_key) : compétition de la page, dont la stratégie déjà retenue est essayée d'abord
+def parse_competition_page(content: bytes, debug: bool = False, layout_key: Optional[str] = None) -> List[Dict]:
+    layout = get_result_layout(layout_key)
+    table = None
+    if layout is not None:
+        soup = make_soup(content, parse_only=_LAYOUT_STRAINERS[layout])
+        table = _locate_result_table(soup, layout)
+    if not table and partial_parsing_applies():
+        strainer, allowed = _partial_result_tree(content)
+        soup = make_soup(content, parse_only=strainer)
+        table, layout = find_result_table(soup, content, allowed=allowed)
+    if not table:
+        # Stratégie hors de l'arbre partiel (text_div, table hors du div englobant) : page entière
+        soup = make_soup(content)
+        table, layout = find_result_table(soup, content)
+
+    if not table:
+        print("Table non trouvée - Débogage:")
+        print(f"Taille du HTML: {len(content)} bytes")
+        with open('debug.html', 'w', encoding='utf-8') as f:
+            f.write(content.decode('utf-8', errors='replace'))
+        print("HTML sauvegardé dans 'debug.html' pour inspection")
+        all_tables = soup.find_all('table')
+        print(f"Nombre total de tables trouvées: {len(all_tables)}")
+        return []
+
+    if debug:
+        print("Table trouvée! Recherche des données...")
+
+    all_rows = table.find_all('tr')
+    all_elements = table.find_all(['thead', 'tbody'])
+
+    if debug:
+        print(f"Nombre total de lignes (tr) trouvées: {len(all_rows)}")
+        print(f"Nombre d'éléments thead/tbody trouvés: {len(all_elements)}")
+
+    if not all_elements:
+        rows = table.find_all('tr')
+        if debug:
+            print(f"Nombre de lignes trouvées: {len(rows)}")
+            for i, row in enumerate(rows[:5]):
+                cells = row.find_all(['td', 'th'])
+                if len(cells) > 0:
+                    text_content = ' '.join([cell.get_text(strip=True) for cell in cells[:3]])
+                    print(f"Ligne {i+1}: {text_content[:100]}...")
+
+    results = _results_from_sections(all_elements, debug)
+    if len(results) == 0:
+        if debug:
+            print("\nTentative avec approche alternative: parcourir toutes les lignes...")
+        results = _results_from_rows(all_rows, debug)
 
+    if results:
+        remember_result_layout(layout_key, layout)
     if debug:
         print(f"Total de résultats extraits: {len(results)}")
     return results
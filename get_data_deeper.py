@@ -1,28 +1,44 @@
+import copy
+import hashlib
 import html as html_module
 import json, os
-from typing import Dict, List, Optional
-from bs4 import BeautifulSoup
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 import re as re_module
-from get_data import (http_get_with_retries, get_competition_data)
+from crawl_state import get_base_url, get_event_plan_stats, get_listing_workers, get_parse_pool, record_event_plan, set_base_url, set_listing_workers, set_parse_pool
+from crawl_metrics import CrawlMetrics, get_metrics, set_metrics, sleep as metrics_sleep, timed_stage
+from get_data import (http_get_with_retries, get_competition_data, ResponseCache, set_http_cache, get_http_cache, RateLimiter, AdaptiveRateController, set_rate_limiter, get_rate_limiter, RequestRegistry, set_request_registry, get_request_registry, make_soup, set_html_parser, get_html_parser, set_partial_parsing, get_partial_parsing, RESULT_TABLES, normalize_url, parse_competition_page, result_layout_key, thread_request_count)
 import time, requests
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse, parse_qs, parse_qsl, urlencode
 import sys
 from datetime import datetime, date
 import re
 
+# Site par défaut ; le site effectivement crawlé (option base=) est crawl_state.get_base_url()
 BASE_URL = "https://ffn.extranat.fr/webffn/"
 COMPETITIONS_PATH = "competitions.php?idact=nat"
 INTERNATIONALS_URL = ("https://ffn.extranat.fr/webffn/competitions.php?idact=nat&idsai=&idreg=&idtyp=7")
 NEW_ENTRIES_URL = ("https://ffn.extranat.fr/webffn/competitions.php?idact=nat&idaff=1") # Page “Les nouvelles entrées” (la liste des compétitions nouvellement ajoutées.)
 
+# Sous-arbres construits en analyse partielle (voir get_data.make_soup), selon le type de page
+LISTING_BLOCKS = SoupStrainer("div", class_="border-b pb-2 mt-4")   # blocs compétition d'une page de liste
+COMPETITION_FORM = SoupStrainer(["form", "select"])                 # page compétition : formulaire « choix » et selects d'épreuves
+FILTER_PAGE = SoupStrainer(["select", "table"])                     # page filtrée Dames/Messieurs : selects et tables
+EVENT_SELECTS = SoupStrainer("select")                              # selects seuls (types de compétition, épreuves)
+
 
 # Construction de l'URL de la page des compétitions FFN pour un type donné (idtyp).
 def get_competitions_url_by_idtyp(idtyp: int) -> str:
-    return f"{BASE_URL}competitions.php?idact=nat&idsai=&idreg=&idtyp={idtyp}"
+    return f"{get_base_url()}competitions.php?idact=nat&idsai=&idreg=&idtyp={idtyp}"
 
 
 # Récupèration de la liste des types de compétition depuis la page FFN (retourne types)
-def get_competition_types(base_url: str = BASE_URL, path: str = COMPETITIONS_PATH, debug: bool = False)-> List[Dict]:
+def get_competition_types(base_url: Optional[str] = None, path: str = COMPETITIONS_PATH, debug: bool = False)-> List[Dict]:
+    base_url = base_url or get_base_url()
     url = f"{base_url}{path}"
     if debug: 
         print(f"Récupération des types de compétitions depuis : {url}")
@@ -33,7 +49,7 @@ def get_competition_types(base_url: str = BASE_URL, path: str = COMPETITIONS_PAT
             print(" x 403 Forbidden sur la page des compétitions ")
             return []
         raise
-    soup = BeautifulSoup(resp.content, "html.parser")
+    soup = make_soup(resp.content, parse_only=EVENT_SELECTS)
 
     select = soup.find("select", id="liste_type") 
     if not select:
@@ -79,150 +95,261 @@ def get_competition_types(base_url: str = BASE_URL, path: str = COMPETITIONS_PAT
     return types
 
 
-# Récupèration de la liste des compétitions pour une URL donnée
-def get_competitions_for_url(url: str, debug: bool = False) -> List[Dict]:
-    competitions: List[Dict] = []
-    if debug:
-        print(f"Récupération des compétitions (avec pagination) depuis : {url}")
+# Extrait les informations d'un bloc compétition (div.border-b.pb-2.mt-4) d'une page de liste
+def parse_competition_block(comp_div) -> Dict:
+    comp_info: Dict = {}
 
-    from urllib.parse import urljoin, urlparse, parse_qs
-    start_url = url
-    parsed_start = urlparse(start_url)
-    start_qs = parse_qs(parsed_start.query)
+    date_elements = comp_div.find_all("div", class_="text-blue-600")
+    if date_elements:
+        date_long = comp_div.find(
+            "div",
+            class_="text-blue-600 text-xs uppercase hidden md:block",
+        )
+        if date_long:
+            comp_info["date"] = date_long.get_text(strip=True)
+        else:
+            comp_info["date"] = date_elements[0].get_text(strip=True)
+
+    # Titre + URL
+    title_link = comp_div.find("a", href=True)
+    if title_link:
+        comp_info["name"] = title_link.get_text(strip=True)
+        href = title_link.get("href")
+        if href:
+            if "idcpt=" in href:
+                idcpt = href.split("idcpt=")[1].split("&")[0]
+                comp_info["competition_id"] = idcpt
+                comp_info["url"] = urljoin(get_base_url(), href)
+            else:
+                comp_info["url"] = urljoin(get_base_url(), href)
 
-    def _same_filter(list_url: str) -> bool:
-        p = urlparse(list_url)
-        if "competitions.php" not in p.path:
-            return False
-        qs = parse_qs(p.query)
+    # Lieu
+    location_span = comp_div.find(
+        "span",
+        class_=["uppercase", "text-green-700", "font-bold"],
+    )
+    if not location_span:
+        location_span = comp_div.find(
+            "span", class_="uppercase text-green-700 font-bold"
+        )
+    if location_span:
+        comp_info["location"] = location_span.get_text(strip=True)
+
+    # Titre original
+    title_original = comp_div.find("div", class_="text-xs text-orange-600")
+    if title_original:
+        text = title_original.get_text(strip=True)
+        if text.startswith("Titre original :"):
+            comp_info["original_title"] = (
+                text.replace("Titre original :", "").strip()
+            )
 
-        if start_qs.get("idtyp") != qs.get("idtyp"):
-            return False
-        for key in ("idsai", "idreg"):
-            if key in start_qs and start_qs.get(key) != qs.get(key):
-                return False
-        return True
+    # Type de compétition
+    type_divs = comp_div.find_all("div", class_="text-xs text-orange-600")
+    for type_div in type_divs:
+        text = type_div.get_text(strip=True)
+        if text.startswith("Type de compétition :"):
+            comp_info["competition_type"] = (
+                text.replace("Type de compétition :", "").strip()
+            )
 
-    visited: set[str] = set()
-    to_visit: List[str] = [start_url]
+    # Taille de bassin
+    bassin_img = comp_div.find("img", alt="taille bassin")
+    if bassin_img:
+        src = bassin_img.get("src", "")
+        if "25m" in src:
+            comp_info["pool_size"] = "25m"
+        elif "50m" in src:
+            comp_info["pool_size"] = "50m"
 
-    while to_visit:
-        current_url = to_visit.pop(0)
-        if current_url in visited:
-            continue
-        visited.add(current_url)
+    # Niveau (Régional, Départemental, etc.)
+    level_div = comp_div.find("div", class_="text-red-700 font-light")
+    if level_div:
+        comp_info["level"] = level_div.get_text(strip=True)
 
-        if debug:
-            print(f"  → Page liste : {current_url}")
+    extract_span = comp_div.find("span", class_="md:block hidden")
+    if extract_span and "extrait" in extract_span.get_text(strip=True).lower():
+        comp_info["is_extract"] = True
 
-        resp = http_get_with_retries(current_url, debug=debug)
-        soup = BeautifulSoup(resp.content, "html.parser")
+    new_comp_img = comp_div.find("img", alt="nouvelle compétition")
+    if new_comp_img:
+        comp_info["is_new"] = True
 
-        competition_divs = soup.find_all("div", class_="border-b pb-2 mt-4")
+    return comp_info
 
-        if debug:
-            print(f"    → {len(competition_divs)} bloc(s) de compétition trouvé(s) sur cette page")
 
-        for comp_div in competition_divs:
-            comp_info: Dict = {}
+# Extrait toutes les compétitions d'une page de liste (competitions.php)
+def parse_competitions_listing(soup: BeautifulSoup, debug: bool = False) -> List[Dict]:
+    competitions: List[Dict] = []
+    competition_divs = soup.find_all("div", class_="border-b pb-2 mt-4")
 
-            date_elements = comp_div.find_all("div", class_="text-blue-600")
-            if date_elements:
-                date_long = comp_div.find(
-                    "div",
-                    class_="text-blue-600 text-xs uppercase hidden md:block",
-                )
-                if date_long:
-                    comp_info["date"] = date_long.get_text(strip=True)
-                else:
-                    comp_info["date"] = date_elements[0].get_text(strip=True)
-
-            title_link = comp_div.find("a", href=True)
-            if title_link:
-                comp_info["name"] = title_link.get_text(strip=True)
-                href = title_link.get("href")
-                if href:
-                    if "idcpt=" in href:
-                        idcpt = href.split("idcpt=")[1].split("&")[0]
-                        comp_info["competition_id"] = idcpt
-                        comp_info["url"] = urljoin(BASE_URL, href)
-                    else:
-                        comp_info["url"] = urljoin(BASE_URL, href)
+    if debug:
+        print(f"    → {len(competition_divs)} bloc(s) de compétition trouvé(s) sur cette page")
 
-            location_span = comp_div.find(
-                "span",
-                class_=["uppercase", "text-green-700", "font-bold"],
-            )
-            if not location_span:
-                location_span = comp_div.find(
-                    "span", class_="uppercase text-green-700 font-bold"
+    for comp_div in competition_divs:
+        comp_info = parse_competition_block(comp_div)
+        if "competition_id" in comp_info or "url" in comp_info:
+            competitions.append(comp_info)
+            if debug:
+                print(
+                    f"      Compétition : {comp_info.get('name', 'N/A')} "
+                    f"(ID: {comp_info.get('competition_id', 'N/A')})"
                 )
-            if location_span:
-                comp_info["location"] = location_span.get_text(strip=True)
-
-            title_original = comp_div.find("div", class_="text-xs text-orange-600")
-            if title_original:
-                text = title_original.get_text(strip=True)
-                if text.startswith("Titre original :"):
-                    comp_info["original_title"] = (
-                        text.replace("Titre original :", "").strip()
-                    )
+    return competitions
 
-            type_divs = comp_div.find_all("div", class_="text-xs text-orange-600")
-            for type_div in type_divs:
-                text = type_div.get_text(strip=True)
-                if text.startswith("Type de compétition :"):
-                    comp_info["competition_type"] = (
-                        text.replace("Type de compétition :", "").strip()
-                    )
 
-            bassin_img = comp_div.find("img", alt="taille bassin")
-            if bassin_img:
-                src = bassin_img.get("src", "")
-                if "25m" in src:
-                    comp_info["pool_size"] = "25m"
-                elif "50m" in src:
-                    comp_info["pool_size"] = "50m"
+# Attributs href des liens <a> d'une page, lus directement dans le HTML brut (les pages de liste
+# sont analysées partiellement : seuls les blocs compétition sont construits en arbre)
+_A_HREF_RE = re_module.compile(
+    r"""<a\b[^>]*?\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""",
+    re_module.IGNORECASE,
+)
 
-            level_div = comp_div.find("div", class_="text-red-700 font-light")
-            if level_div:
-                comp_info["level"] = level_div.get_text(strip=True)
 
-            extract_span = comp_div.find("span", class_="md:block hidden")
-            if extract_span and "extrait" in extract_span.get_text(strip=True).lower():
-                comp_info["is_extract"] = True
+# Liens vers les autres pages de la même liste (mêmes idtyp / idsai / idreg que start_url), dans l'ordre de la page
+def listing_page_links(content: bytes, start_url: str) -> List[str]:
+    start_qs = parse_qs(urlparse(start_url).query)
 
-            new_comp_img = comp_div.find("img", alt="nouvelle compétition")
-            if new_comp_img:
-                comp_info["is_new"] = True
+    def _same_filter(list_url: str) -> bool:
+        p = urlparse(list_url)
+        if "competitions.php" not in p.path:
+            return False
+        qs = parse_qs(p.query)
 
-            if "competition_id" in comp_info or "url" in comp_info:
-                competitions.append(comp_info)
-                if debug:
-                    print(
-                        f"      Compétition : {comp_info.get('name', 'N/A')} "
-                        f"(ID: {comp_info.get('competition_id', 'N/A')})"
-                    )
+        if start_qs.get("idtyp") != qs.get("idtyp"):
+            return False
+        for key in ("idsai", "idreg"):
+            if key in start_qs and start_qs.get(key) != qs.get(key):
+                return False
+        return True
 
-        for a in soup.find_all("a", href=True):
-            href = a.get("href", "")
-            if "competitions.php" not in href:
-                continue
-            if "resultats.php" in href:
-                continue
-            full_url = urljoin(BASE_URL, href)
-            if not _same_filter(full_url):
-                continue
-            if full_url not in visited and full_url not in to_visit:
-                if debug:
-                    print(f"    → Page de liste supplémentaire détectée : {full_url}")
-                to_visit.append(full_url)
+    text = content.decode("utf-8", errors="replace") if isinstance(content, bytes) else content
+    links: List[str] = []
+    for m in _A_HREF_RE.finditer(text):
+        href = html_module.unescape(next(g for g in m.groups() if g is not None)).strip()
+        if "competitions.php" not in href:
+            continue
+        if "resultats.php" in href:
+            continue
+        full_url = urljoin(get_base_url(), href)
+        if _same_filter(full_url):
+            links.append(full_url)
+    return links
+
+
+# Numéro de page d'une URL de liste (paramètre page=) ; None si absent ou non numérique
+def listing_page_number(url: str) -> Optional[int]:
+    values = parse_qs(urlparse(url).query).get("page")
+    if not values or not values[0].isdigit():
+        return None
+    return int(values[0])
+
+
+# Clé d'une page de liste (URL normalisée) : une URL sans paramètre page est la première page de la liste,
+# la même que le lien « 1 » de sa pagination, qui n'est donc pas demandé une seconde fois ; les paramètres
+# vides (idsai=&idreg= des liens de pagination) ne filtrent rien et sont ignorés
+def listing_page_key(url: str) -> str:
+    parts = urlparse(url)
+    params = [(name, value) for name, value in parse_qsl(parts.query) if value]
+    if not any(name == "page" for name, _ in params):
+        params.append(("page", "1"))
+    return normalize_url(parts._replace(query=urlencode(params)).geturl())
+
+
+_PAGE_PARAM_RE = re_module.compile(r"([?&]page=)\d+")
+
+
+# Complète les liens de pagination d'une page de liste : quand les numéros de page sont connus
+# (« 1 2 3 ... 40 »), les pages manquantes sont déduites du lien de la dernière page, si bien que
+# toutes les pages peuvent être demandées dès la première page analysée. Liens triés par numéro de page.
+def expand_listing_pages(links: List[str]) -> List[str]:
+    numbered = [(listing_page_number(link), link) for link in links]
+    pages = {number: link for number, link in numbered if number is not None}
+    expanded = list(links)
+    if pages:
+        last = max(pages)
+        template = pages[last]
+        for number in range(1, last):
+            if number not in pages:
+                expanded.append(_PAGE_PARAM_RE.sub(lambda m: f"{m.group(1)}{number}", template, count=1))
+    return sorted(expanded, key=lambda link: listing_page_number(link) or 0)
+
+
+# Télécharge et analyse une page de liste : (compétitions, liens vers les autres pages de la liste)
+def _fetch_listing_page(page_url: str, start_url: str, debug: bool = False) -> Tuple[List[Dict], List[str]]:
+    if debug:
+        print(f"  → Page liste : {page_url}")
+    resp = http_get_with_retries(page_url, debug=debug)
+    with timed_stage("parse"):
+        soup = make_soup(resp.content, parse_only=LISTING_BLOCKS)
+        competitions = parse_competitions_listing(soup, debug=debug)
+        links = listing_page_links(resp.content, start_url)
+    return competitions, links
+
+
+# Vrai si toute une page de liste est déjà stockée avec les mêmes champs (manifeste known) :
+# les pages suivantes, plus anciennes, n'ont pas besoin d'être parcourues
+def listing_page_is_known(page_competitions: List[Dict], known: Optional["CompetitionManifest"]) -> bool:
+    return known is not None and bool(page_competitions) and all(known.is_current(c) for c in page_competitions)
+
+
+# Récupèration de la liste des compétitions pour une URL donnée.
+# Avec plusieurs workers (set_listing_workers), les pages sont demandées niveau par niveau en parallèle
+# (sous le limiteur de débit global) et toutes les pages annoncées par la pagination de la première
+# page partent ensemble ; les compétitions restent dans l'ordre des pages.
+# Avec known (manifeste des compétitions stockées), les pages sont lues une à une dans l'ordre du site
+# et le parcours s'arrête à la première page entièrement connue et inchangée (rafraîchissement incrémental).
+def get_competitions_for_url(url: str, debug: bool = False, workers: Optional[int] = None, known: Optional["CompetitionManifest"] = None) -> List[Dict]:
+    workers = get_listing_workers() if workers is None else max(1, workers)
+    competitions: List[Dict] = []
+    if debug:
+        print(f"Récupération des compétitions (avec pagination) depuis : {url}")
 
+    queued = {listing_page_key(url)}
+    if workers <= 1 or known is not None:
+        to_visit = deque([url])
+        while to_visit:
+            page_competitions, links = _fetch_listing_page(to_visit.popleft(), url, debug=debug)
+            competitions.extend(page_competitions)
+            if listing_page_is_known(page_competitions, known):
+                if debug:
+                    print(f"    → Page entièrement connue : arrêt du parcours des pages de liste")
+                break
+            for full_url in links:
+                key = listing_page_key(full_url)
+                if key not in queued:
+                    if debug:
+                        print(f"    → Page de liste supplémentaire détectée : {full_url}")
+                    queued.add(key)
+                    to_visit.append(full_url)
+        return competitions
+
+    level = [url]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while level:
+            pages = list(executor.map(lambda page_url: _fetch_listing_page(page_url, url, debug=debug), level))
+            next_level: List[str] = []
+            for page_competitions, links in pages:
+                competitions.extend(page_competitions)
+                for full_url in links:
+                    key = listing_page_key(full_url)
+                    if key not in queued:
+                        queued.add(key)
+                        next_level.append(full_url)
+            found = set(next_level)
+            level = []
+            for full_url in expand_listing_pages(next_level):
+                key = listing_page_key(full_url)
+                if full_url in found or key not in queued:
+                    queued.add(key)
+                    level.append(full_url)
+            if debug and level:
+                print(f"    → {len(level)} page(s) de liste supplémentaire(s) en parallèle ({workers} workers)")
     return competitions
 
 
 # Pour chaque type de compétition, récupère les compétitions puis les résultats de chaque compétition (via get_competition_data) 
-def get_all_results_by_type(base_url: str = BASE_URL, path: str = COMPETITIONS_PATH, delay_between_comps: float = 1.0, debug: bool = False, only_idtyps: Optional[List[int]] = None) -> Dict:
+def get_all_results_by_type(base_url: Optional[str] = None, path: str = COMPETITIONS_PATH, delay_between_comps: float = 1.0, debug: bool = False, only_idtyps: Optional[List[int]] = None, competition_filter: Optional[Callable[[Dict], bool]] = None, on_competition: Optional[Callable[[Dict], None]] = None, keep_results: bool = True) -> Dict:
     types = get_competition_types(base_url=base_url, path=path, debug=debug)
     data: Dict = {"types": []}
 
@@ -248,7 +375,9 @@ def get_all_results_by_type(base_url: str = BASE_URL, path: str = COMPETITIONS_P
             print(
                 f"\n[{idx}/{total_types}] Type: idtyp={t.get('idtyp')} - {label}\n"
             )
-        competitions = get_competitions_for_url(url, debug=debug)
+        competitions = plan_competitions(
+            get_competitions_for_url(url, debug=debug), competition_filter, debug=debug
+        )
         for c_idx, comp in enumerate(competitions, 1):
             comp_url = comp.get("url")
             if not comp_url:
@@ -260,8 +389,11 @@ def get_all_results_by_type(base_url: str = BASE_URL, path: str = COMPETITIONS_P
                     f"{comp.get('name', 'N/A')}"
                 )
 
+            served_from_cache = False
             try:
-                results = get_competition_data(comp_url, debug=False)
+                resp = http_get_with_retries(comp_url, max_retries=5, retry_forever=True)
+                served_from_cache = getattr(resp, "from_cache", False)
+                results = parse_competition_page(resp.content, layout_key=result_layout_key(comp_url))
                 comp["results"] = results
                 comp["results_count"] = len(results)
 
@@ -273,10 +405,11 @@ def get_all_results_by_type(base_url: str = BASE_URL, path: str = COMPETITIONS_P
                 comp["error"] = str(e)
                 if debug:
                     print(f"      ✗ Erreur lors de la récupération : {e}")
+            deliver_competition(comp, on_competition, keep_results)
 
-            # Petite pause pour éviter de spammer le site
-            if delay_between_comps > 0 and c_idx < len(competitions):
-                time.sleep(delay_between_comps)
+            # Petite pause pour éviter de spammer le site (inutile si la page venait du cache)
+            if delay_between_comps > 0 and c_idx < len(competitions) and not served_from_cache:
+                metrics_sleep(delay_between_comps, "entre_competitions")
 
         t_data = dict(t)
         t_data["competitions"] = competitions
@@ -285,6 +418,75 @@ def get_all_results_by_type(base_url: str = BASE_URL, path: str = COMPETITIONS_P
     return data
 
 
+# Fragments du tableau de temps de passage (contenu data-tippy-content, déjà décodé)
+_SPLITS_TABLE_RE = re_module.compile(
+    r"<table\b[^>]*\bid\s*=\s*[\"']?styleNoBorderNoBottom\b[^>]*>(.*?)(?:</table\s*>|$)",
+    re_module.IGNORECASE | re_module.DOTALL,
+)
+_SPLITS_ROW_RE = re_module.compile(r"<tr\b[^>]*>(.*?)</tr\s*>", re_module.IGNORECASE | re_module.DOTALL)
+_SPLITS_CELL_RE = re_module.compile(r"<td\b[^>]*>(.*?)</td\s*>", re_module.IGNORECASE | re_module.DOTALL)
+_TAG_RE = re_module.compile(r"<[^>]*>")
+
+
+# Équivalent de get_text(strip=True) pour un fragment de cellule : chaque nœud texte est décodé et nettoyé
+def _fragment_text(fragment: str) -> str:
+    if "<" not in fragment and "&" not in fragment:
+        return fragment.strip()
+    return "".join(html_module.unescape(part).strip() for part in _TAG_RE.split(fragment))
+
+
+# Une ligne du tableau de passages -> dict {distance, cumul, split}, ou None si la ligne est incomplète
+def _split_from_cells(cells: List[str]) -> Optional[Dict]:
+    if len(cells) < 4:
+        return None
+    # td[0]: "50 m : " (text-lime-600), td[1]: cumul (green),
+    # td[2]: (00:36.87) (red), td[3]: [00:36.87] (purple)
+    split_parens = cells[2].strip("()")
+    split_brackets = cells[3].strip("[]")
+    return {
+        "distance": cells[0].rstrip(" :").strip(),
+        "cumul": cells[1],
+        "split": split_parens or split_brackets,
+    }
+
+
+# Temps de passage d'un bouton tippy, en construisant un arbre BeautifulSoup du fragment (chemin historique)
+def parse_splits_tooltip_soup(tippy_content: str) -> List[Dict]:
+    splits: List[Dict] = []
+    # Décoder le HTML échappé (ex: &lt; → <)
+    tip_soup = make_soup(html_module.unescape(tippy_content))
+    table = tip_soup.find("table", id="styleNoBorderNoBottom")
+    if table:
+        for tr in table.find_all("tr"):
+            split = _split_from_cells([td.get_text(strip=True) for td in tr.find_all("td")])
+            if split:
+                splits.append(split)
+    return splits
+
+
+# Temps de passage d'un bouton tippy, lus par expressions régulières sans construire d'arbre :
+# le fragment a un format fixe (une ligne <tr> de 4 <td> par distance). Si le fragment ne suit pas
+# ce format (balises non fermées...), on se replie sur l'analyse BeautifulSoup.
+def parse_splits_tooltip(tippy_content: str) -> List[Dict]:
+    if not tippy_content or "styleNoBorderNoBottom" not in tippy_content:
+        return []
+    decoded = html_module.unescape(tippy_content)
+    table_match = _SPLITS_TABLE_RE.search(decoded)
+    if not table_match:
+        return parse_splits_tooltip_soup(tippy_content)
+    body = table_match.group(1)
+    rows = [_SPLITS_CELL_RE.findall(row) for row in _SPLITS_ROW_RE.findall(body)]
+    lowered = body.lower()
+    if len(rows) != lowered.count("<tr") or sum(len(cells) for cells in rows) != lowered.count("<td"):
+        return parse_splits_tooltip_soup(tippy_content)
+    splits: List[Dict] = []
+    for cells in rows:
+        split = _split_from_cells([_fragment_text(cell) for cell in cells])
+        if split:
+            splits.append(split)
+    return splits
+
+
 # Parse le HTML (soup) des pages « filtre » : extrait les épreuves et leurs performances (nom épreuve, catégorie, nageurs, temps, splits, etc.) depuis les tables.
 def extract_results_from_filter_table(soup: BeautifulSoup, debug: bool = False) -> List[Dict]:
     epreuves: List[Dict] = []
@@ -503,25 +705,7 @@ def extract_results_from_filter_table(soup: BeautifulSoup, debug: bool = False)
                 tippy_content = tippy_button.get("data-tippy-content", "")
                 if tippy_content and "styleNoBorderNoBottom" in tippy_content:
                     try:
-                        # Décoder le HTML échappé (ex: &lt; → <)
-                        decoded = html_module.unescape(tippy_content)
-                        tip_soup = BeautifulSoup(decoded, "html.parser")
-                        table = tip_soup.find("table", id="styleNoBorderNoBottom")
-                        if table:
-                            for tr in table.find_all("tr"):
-                                tds = tr.find_all("td")
-                                if len(tds) >= 4:
-                                    # td[0]: "50 m : " (text-lime-600), td[1]: cumul (green),
-                                    # td[2]: (00:36.87) (red), td[3]: [00:36.87] (purple)
-                                    dist_text = tds[0].get_text(strip=True).rstrip(" :").strip()
-                                    cumul = tds[1].get_text(strip=True)
-                                    split_parens = tds[2].get_text(strip=True).strip("()")
-                                    split_brackets = tds[3].get_text(strip=True).strip("[]")
-                                    splits.append({
-                                        "distance": dist_text,
-                                        "cumul": cumul,
-                                        "split": split_parens or split_brackets,
-                                    })
+                        splits = parse_splits_tooltip(tippy_content)
                     except Exception:
                         pass
             if not splits:
@@ -594,8 +778,536 @@ def extract_results_from_filter_table(soup: BeautifulSoup, debug: bool = False)
     return epreuves
 
 
+# Les processus d'analyse reprennent la configuration d'analyse HTML du processus principal
+def _init_parse_worker(parser: str, partial_parsing: bool) -> None:
+    set_html_parser(parser)
+    set_partial_parsing(partial_parsing)
+
+
+# Installe (workers >= 1) ou arrête (workers = 0) le pool de processus qui analyse les pages d'épreuves
+# pendant que les threads continuent à télécharger (sans pool : analyse dans le thread qui a téléchargé la page)
+def set_parse_workers(workers: int) -> None:
+    pool = get_parse_pool()
+    if pool is not None:
+        pool.shutdown(wait=True)
+        set_parse_pool(None)
+    if workers > 0:
+        set_parse_pool(ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_parse_worker,
+            initargs=(get_html_parser(), get_partial_parsing()),
+        ))
+
+
+# Page d'épreuve (octets bruts) -> épreuves extraites ; fonction de module pour être exécutable dans le pool
+def parse_event_page(content: bytes, debug: bool = False) -> List[Dict]:
+    return extract_results_from_filter_table(make_soup(content, parse_only=RESULT_TABLES), debug=debug)
+
+
+# parse_event_page chronométrée (dans le processus qui l'exécute) : renvoie (épreuves, durée en secondes)
+def parse_event_page_timed(content: bytes, debug: bool = False) -> Tuple[List[Dict], float]:
+    started = time.perf_counter()
+    epreuves = parse_event_page(content, debug)
+    return epreuves, time.perf_counter() - started
+
+
+# Comptabilise l'analyse d'une page d'épreuve (durée, performances extraites) dans les mesures du crawl
+def record_event_parse(epreuves: List[Dict], seconds: float) -> None:
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.record_parse(seconds, sum(len(e.get("performances") or []) for e in epreuves))
+
+
+# Confie l'analyse d'une page au pool s'il existe, sinon l'exécute tout de suite ; renvoie toujours un Future
+def submit_event_parse(content: bytes, debug: bool = False) -> Future:
+    future: Future = Future()
+    pool = get_parse_pool()
+    if pool is not None:
+        def _done(timed: Future) -> None:
+            try:
+                epreuves, seconds = timed.result()
+            except Exception as e:
+                future.set_exception(e)
+                return
+            record_event_parse(epreuves, seconds)
+            future.set_result(epreuves)
+
+        pool.submit(parse_event_page_timed, content, debug).add_done_callback(_done)
+        return future
+    try:
+        epreuves, seconds = parse_event_page_timed(content, debug)
+        record_event_parse(epreuves, seconds)
+        future.set_result(epreuves)
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+# Version de l'extraction des pages d'épreuves (extract_results_from_filter_table) : à incrémenter quand
+# le résultat de l'analyse change, pour que les analyses gardées dans le cache HTTP soient refaites
+EVENT_PARSE_VERSION = 1
+
+
+# Nom des analyses de pages d'épreuves gardées dans le cache : version de l'extraction, analyseur HTML
+# et analyse partielle, qui peuvent chacun changer les épreuves extraites d'un même corps de page
+def event_parse_name() -> str:
+    return f"event_page/v{EVENT_PARSE_VERSION}/{get_html_parser()}/{'partial' if get_partial_parsing() else 'full'}"
+
+
+# Épreuves déjà extraites de ce corps de page lors d'un passage précédent (cache HTTP actif), ou None
+def cached_event_parse(url: str, content: bytes) -> Optional[List[Dict]]:
+    cache = get_http_cache()
+    if cache is None:
+        return None
+    return cache.get_parsed(url, content, event_parse_name())
+
+
+# Garde les épreuves extraites d'une page pour les passages suivants (page inchangée : pas de nouvelle analyse)
+def store_event_parse(url: str, content: bytes, epreuves: List[Dict]) -> None:
+    cache = get_http_cache()
+    if cache is not None:
+        cache.put_parsed(url, content, event_parse_name(), epreuves)
+
+
+# Télécharge dans l'ordre les pages d'épreuves [(libellé, url)] et transmet chaque page au pool d'analyse
+# dès sa réception, sans attendre son analyse pour lancer la requête suivante. Une page dont le corps
+# n'a pas changé depuis son analyse précédente (cache HTTP, réponse 304) n'est pas réanalysée.
+# Renvoie [(libellé, épreuves extraites ou exception)] dans l'ordre des épreuves.
+def fetch_and_parse_events(events: List[Tuple[str, str]], fetch: Callable[[str], requests.Response], debug: bool = False) -> List[Tuple[str, Union[List[Dict], Exception]]]:
+    pending: List[Tuple[str, str, Optional[bytes], Union[Future, Exception]]] = []
+    for label, event_url in events:
+        try:
+            content = fetch(event_url).content
+            known = cached_event_parse(event_url, content)
+            if known is not None:
+                future: Future = Future()
+                future.set_result(known)
+                pending.append((label, event_url, None, future))
+            else:
+                pending.append((label, event_url, content, submit_event_parse(content, debug)))
+        except Exception as e:
+            pending.append((label, event_url, None, e))
+
+    outcomes: List[Tuple[str, Union[List[Dict], Exception]]] = []
+    for label, event_url, content, item in pending:
+        if isinstance(item, Exception):
+            outcomes.append((label, item))
+            continue
+        try:
+            epreuves = item.result()
+        except Exception as e:
+            outcomes.append((label, e))
+            continue
+        if content is not None:
+            store_event_parse(event_url, content, epreuves)
+        outcomes.append((label, epreuves))
+    return outcomes
+
+
+# Pages d'épreuves distinctes (URL normalisée) de plusieurs groupes d'options [(libellé, url)], dans l'ordre
+# de première apparition ; les URL de known (pages déjà obtenues pour la compétition) sont écartées
+def plan_event_urls(groups: List[List[Tuple[str, str]]], known=()) -> List[Tuple[str, str]]:
+    planned: List[Tuple[str, str]] = []
+    seen = set(known)
+    for events in groups:
+        for label, event_url in events:
+            key = normalize_url(event_url)
+            if key not in seen:
+                seen.add(key)
+                planned.append((label, event_url))
+    return planned
+
+
+class EventFetchPlan:
+    """
+    Pages d'épreuves d'une compétition, téléchargées une seule fois chacune.
+
+    Une même page d'épreuve peut être proposée par plusieurs <select> (Dames, Messieurs,
+    pages filtrées idsex=, formulaire « choix »), parfois avec ses paramètres dans un autre
+    ordre : les options sont regroupées par URL normalisée, chaque page distincte est
+    téléchargée et analysée une fois, et les options suivantes reçoivent une copie de son
+    résultat. `planned` compte les pages qu'aurait demandées le parcours option par option,
+    `fetched` celles réellement demandées.
+    """
+
+    def __init__(self, fetch: Callable[[str], requests.Response], debug: bool = False):
+        self.fetch = fetch
+        self.debug = debug
+        self.planned = 0
+        self.fetched = 0
+        self._outcomes: Dict[str, Union[List[Dict], Exception]] = {}
+        self._served: set = set()
+
+    @property
+    def saved(self) -> int:
+        return self.planned - self.fetched
+
+    # Résultat d'une page pour une option : l'original la première fois, une copie ensuite
+    def _serve(self, key: str) -> Union[List[Dict], Exception]:
+        outcome = self._outcomes[key]
+        if key in self._served and isinstance(outcome, list):
+            return copy.deepcopy(outcome)
+        self._served.add(key)
+        return outcome
+
+    # Résultats [(libellé, épreuves ou exception)] de chaque groupe d'options, dans l'ordre des options ;
+    # les pages pas encore obtenues (tous groupes confondus) passent en un seul lot par fetch_and_parse_events
+    def run(self, groups: List[List[Tuple[str, str]]]) -> List[List[Tuple[str, Union[List[Dict], Exception]]]]:
+        pending = plan_event_urls(groups, known=self._outcomes)
+        for (_, event_url), (_, outcome) in zip(pending, fetch_and_parse_events(pending, self.fetch, debug=self.debug)):
+            self._outcomes[normalize_url(event_url)] = outcome
+        self._count(sum(len(events) for events in groups), len(pending))
+        return [[(label, self._serve(normalize_url(event_url))) for label, event_url in events] for events in groups]
+
+    # Résultat de fetcher() pour cette URL (téléchargement + analyse), obtenu une seule fois pour la compétition
+    def fetch_once(self, event_url: str, fetcher: Callable[[], List[Dict]]) -> List[Dict]:
+        key = normalize_url(event_url)
+        fetched = key not in self._outcomes
+        self._count(1, int(fetched))
+        if fetched:
+            try:
+                self._outcomes[key] = fetcher()
+            except Exception as e:
+                self._outcomes[key] = e
+        outcome = self._serve(key)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    # Page que le parcours option par option aurait retéléchargée alors qu'elle est déjà en main
+    def note_reused(self) -> None:
+        self._count(1, 0)
+
+    # Compteurs de la compétition et bilan de l'exécution (record_event_plan)
+    def _count(self, planned: int, fetched: int) -> None:
+        self.planned += planned
+        self.fetched += fetched
+        record_event_plan(planned, fetched)
+
+
+# Répartit les <select> d'épreuves d'une page selon le libellé de leur première option (« Épreuves Dames » / « Épreuves Messieurs »)
+def find_gender_selects(soup: BeautifulSoup) -> Tuple[List, List]:
+    selects_dames: List = []
+    selects_messieurs: List = []
+    for sel in soup.find_all("select"):
+        opts = sel.find_all("option")
+        if not opts:
+            continue
+        first_label = opts[0].get_text(strip=True)
+        if "Dames" in first_label:
+            selects_dames.append(sel)
+        elif "Messieurs" in first_label:
+            selects_messieurs.append(sel)
+    return selects_dames, selects_messieurs
+
+
+# Liste (libellé, URL absolue) des épreuves proposées par des <select>, sans les options d'en-tête
+# (« Épreuves ... », « Relais ... ») ni, si skip_series_view, l'option « Affichage par séries ».
+# Les selects de la page principale (get_competition_results_grouped_by_event) gardent cette dernière.
+def event_options(select_elements, skip_series_view: bool = True) -> List[Tuple[str, str]]:
+    options: List[Tuple[str, str]] = []
+    for sel in select_elements:
+        for opt in sel.find_all("option"):
+            value = opt.get("value", "").strip()
+            label_opt = opt.get_text(strip=True)
+            if not value or not label_opt:
+                continue
+            if "Épreuves" in label_opt or "Relais" in label_opt:
+                continue
+            if skip_series_view and "Affichage par séries" in label_opt:
+                continue
+            options.append((label_opt, urljoin(get_base_url(), value)))
+    return options
+
+
+# Résultats d'une page filtrée Dames / Messieurs (idsex=) : les tables de la page elle-même
+def filter_page_results(filter_soup: BeautifulSoup, debug: bool = False) -> List[Dict]:
+    return extract_results_from_filter_table(filter_soup, debug=debug)
+
+
+# Compte le nombre total de lignes de résultats d'un dict de résultats groupés (par filtre ou par épreuve)
+def count_grouped_results(grouped_dict: Dict) -> int:
+    total = 0
+    for key, value in grouped_dict.items():
+        if isinstance(key, str) and key.startswith("_"):
+            continue
+        if not isinstance(value, list):
+            continue
+        if not value:
+            continue
+        if isinstance(value[0], dict) and "performances" in value[0]:
+            for epreuve in value:
+                if isinstance(epreuve, dict):
+                    perfs = epreuve.get("performances", [])
+                    if isinstance(perfs, list):
+                        total += len(perfs)
+        else:
+            total += len(value)
+    return total
+
+
+def parse_competition_date(date_str: str) -> Optional[date]:
+    """
+    Extrait une date JJ/MM/AAAA d'une chaîne comme
+    'Samedi 10/01/2026' ou 'Sa 10/01/26' et la convertit en date.
+    Seule la partie JJ/MM/AAAA est utilisée pour la comparaison.
+    """
+    if not date_str:
+        return None
+    # Chercher explicitement un motif JJ/MM/AAAA
+    m = re.search(r"(\d{2}/\d{2}/\d{4})", date_str)
+    if not m:
+        return None
+    try:
+        return datetime.strptime(m.group(1), "%d/%m/%Y").date()
+    except ValueError:
+        return None
+
+
+# Construit le filtre appliqué à la liste des compétitions AVANT tout téléchargement de résultats
+# (plage de dates, taille de bassin, niveau, nouvelles compétitions). Renvoie None si aucun critère.
+def build_competition_predicate(start_date: Optional[date] = None, end_date: Optional[date] = None, pool_size: Optional[str] = None, level: Optional[str] = None, only_new: bool = False) -> Optional[Callable[[Dict], bool]]:
+    if start_date is None and end_date is None and not pool_size and not level and not only_new:
+        return None
+
+    def _predicate(comp: Dict) -> bool:
+        if start_date is not None or end_date is not None:
+            # Comme auparavant, une compétition sans date lisible est écartée
+            comp_date = parse_competition_date(comp.get("date") or "")
+            if comp_date is None:
+                return False
+            if start_date is not None and comp_date < start_date:
+                return False
+            if end_date is not None and comp_date > end_date:
+                return False
+        if pool_size and comp.get("pool_size") != pool_size:
+            return False
+        if level and level.casefold() not in (comp.get("level") or "").casefold():
+            return False
+        if only_new and not comp.get("is_new"):
+            return False
+        return True
+
+    return _predicate
+
+
+# Applique le filtre de planification à la liste des compétitions (ordre conservé)
+def plan_competitions(competitions: List[Dict], competition_filter: Optional[Callable[[Dict], bool]], debug: bool = False) -> List[Dict]:
+    if competition_filter is None:
+        return competitions
+    planned = [c for c in competitions if competition_filter(c)]
+    if debug:
+        print(
+            f"Planification : {len(planned)} compétition(s) retenue(s) sur {len(competitions)} "
+            f"({len(competitions) - len(planned)} écartée(s) avant téléchargement des résultats)"
+        )
+    return planned
+
+
+class CrawlJournal:
+    """
+    Journal de reprise d'un crawl, au format JSON Lines et en ajout seul : une
+    ligne par compétition terminée (identifiant, résultats groupés, nombre de
+    résultats), écrite et synchronisée sur disque dès la fin de la compétition.
+
+    Avec resume=True, les lignes existantes sont relues et restore() remet les
+    résultats dans la compétition au lieu de la retélécharger ; sinon le
+    journal repart de zéro. Les compétitions en erreur ne sont pas
+    journalisées : elles sont retentées à la reprise.
+    En mémoire, le journal ne garde que la position de chaque ligne et le
+    nombre de résultats : restore() relit les résultats sur disque.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        # clé de compétition → (position de sa ligne dans le fichier, nombre de résultats)
+        self._done: Dict[str, Tuple[int, int]] = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        truncated = False
+        if resume and os.path.exists(path):
+            with open(path, "rb") as f:
+                offset = 0
+                for line in f:
+                    start, offset = offset, offset + len(line)
+                    truncated = not line.endswith(b"\n")
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Dernière ligne tronquée par un arrêt brutal : ignorée
+                        continue
+                    if isinstance(entry, dict) and entry.get("key"):
+                        self._done[entry["key"]] = (start, entry.get("results_count", 0))
+        self._file = open(path, "ab" if resume else "wb")
+        if truncated:
+            # Les lignes suivantes ne doivent pas prolonger la ligne tronquée
+            self._file.write(b"\n")
+            self._file.flush()
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    @staticmethod
+    def key_for(comp: Dict) -> Optional[str]:
+        return comp.get("competition_id") or comp.get("url")
+
+    # Remet dans comp les résultats journalisés ; renvoie False si la compétition n'est pas encore dans le journal
+    def restore(self, comp: Dict) -> bool:
+        with self._lock:
+            done = self._done.get(self.key_for(comp) or "")
+        if done is None:
+            return False
+        offset, results_count = done
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            entry = json.loads(f.readline())
+        comp["results"] = entry.get("results", {})
+        comp["results_count"] = results_count
+        return True
+
+    def record(self, comp: Dict) -> None:
+        key = self.key_for(comp)
+        if not key or "error" in comp:
+            return
+        entry = {
+            "key": key,
+            "competition_id": comp.get("competition_id"),
+            "results": comp.get("results", {}),
+            "results_count": comp.get("results_count", 0),
+            "journaled_at": datetime.now().isoformat(),
+        }
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._done[key] = (offset, entry["results_count"])
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CompetitionManifest:
+    """
+    Manifeste des compétitions déjà stockées (fichier JSON) : identifiant de compétition
+    → empreinte des champs de la liste qui changent quand la FFN publie ou corrige des
+    résultats (date, mention « extrait », marque « nouvelle compétition »).
+
+    Le mode update ne retélécharge que les compétitions inconnues du manifeste ou dont
+    l'empreinte a changé ; une compétition en erreur n'est pas enregistrée et sera
+    retentée au prochain passage.
+    """
+
+    FINGERPRINT_FIELDS = ("date", "is_extract", "is_new")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            self._entries = payload.get("competitions", {}) if isinstance(payload, dict) else {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, comp: Dict) -> bool:
+        return (CrawlJournal.key_for(comp) or "") in self._entries
+
+    @classmethod
+    def fingerprint(cls, comp: Dict) -> str:
+        fields = {name: comp.get(name) for name in cls.FINGERPRINT_FIELDS}
+        return hashlib.sha1(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    # Vrai si la compétition est déjà stockée avec les mêmes champs de liste
+    def is_current(self, comp: Dict) -> bool:
+        entry = self._entries.get(CrawlJournal.key_for(comp) or "")
+        return entry is not None and entry.get("fingerprint") == self.fingerprint(comp)
+
+    def record(self, comp: Dict) -> None:
+        key = CrawlJournal.key_for(comp)
+        if not key or "error" in comp:
+            return
+        with self._lock:
+            self._entries[key] = {
+                "fingerprint": self.fingerprint(comp),
+                "name": comp.get("name"),
+                "date": comp.get("date"),
+                "results_count": comp.get("results_count", 0),
+                "stored_at": datetime.now().isoformat(),
+            }
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            payload = {"competitions": self._entries}
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+# Sérialise les appels à on_competition (les workers peuvent terminer des compétitions en même temps)
+_delivery_lock = threading.Lock()
+
+
+# Transmet une compétition terminée au consommateur en flux (on_competition) ; avec keep_results=False,
+# ses résultats sont ensuite libérés et seul results_count reste en mémoire
+def deliver_competition(comp: Dict, on_competition: Optional[Callable[[Dict], None]], keep_results: bool = True) -> None:
+    if on_competition is None:
+        return
+    with _delivery_lock, timed_stage("write"):
+        on_competition(comp)
+    if not keep_results:
+        comp["results"] = {}
+
+
+def _record_session_rotation() -> None:
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.record_session_rotation()
+
+
+# Crée une nouvelle session HTTP avec des headers réalistes (version de Chrome tirée au hasard)
+def create_browser_session() -> requests.Session:
+    new_session = requests.Session()
+    new_session.headers.update(browser_headers())
+    return new_session
+
+
+def browser_headers() -> Dict[str, str]:
+    chrome_version = f"Chrome/{random.randint(120, 130)}.0.{random.randint(1000, 9999)}.{random.randint(100, 999)}"
+    return {
+        "User-Agent": (
+            f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            f"AppleWebKit/537.36 (KHTML, like Gecko) "
+            f"{chrome_version} Safari/537.36"
+        ),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+        "Accept-Language": "fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7",
+        "Accept-Encoding": "gzip, deflate, br",
+        "DNT": "1",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "none",
+        "Sec-Fetch-User": "?1",
+        "Cache-Control": "max-age=0",
+    }
+
+
 # LA récupèration de toutes les compétitions listées sur l'URL (ex. internationales idtyp=7), charge chaque page compétition, récupère les résultats par épreuve et gère les pauses session.
-def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0, debug: bool = False, max_competitions_before_pause: int = 50, rest_delay: float = 30.0) -> Dict:
+# workers > 1 : plusieurs compétitions sont traitées en parallèle (voir le mode concurrent plus bas).
+# competition_filter : critère (voir build_competition_predicate) appliqué à la liste avant de télécharger les résultats.
+# journal : chaque compétition terminée y est enregistrée aussitôt ; celles déjà journalisées (reprise) ne sont pas retéléchargées.
+def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0, debug: bool = False, max_competitions_before_pause: int = 50, rest_delay: float = 30.0, workers: int = 1, competition_filter: Optional[Callable[[Dict], bool]] = None, journal: Optional["CrawlJournal"] = None, on_competition: Optional[Callable[[Dict], None]] = None, keep_results: bool = True, manifest: Optional["CompetitionManifest"] = None) -> Dict:
     def get_competition_results_grouped_by_event(comp_url: str, debug: bool = False,
         session: Optional[requests.Session] = None,
     ) -> Dict[str, List[Dict]]:
@@ -607,96 +1319,63 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
         """
         grouped_results: Dict[str, List[Dict]] = {}
 
-        nonlocal requests_since_session
-
         # 1) Charger la page principale de la compétition (avec le formulaire)
         if debug:
             print(f"    [grouped] Chargement page principale : {comp_url}")
 
         resp = http_get_with_retries(comp_url, debug=debug, max_retries=5, session=session, retry_forever=False )
-        requests_since_session += 1
-        soup = BeautifulSoup(resp.content, "html.parser")
+        with timed_stage("parse"):
+            soup = make_soup(resp.content, parse_only=COMPETITION_FORM)
+
+        # Téléchargement d'une page d'épreuve (l'analyse est faite par fetch_and_parse_events)
+        def _fetch_event(event_url: str) -> requests.Response:
+            return http_get_with_retries(
+                event_url,
+                debug=debug,
+                max_retries=5,
+                session=session,
+                retry_forever=False,
+            )
+
+        # Chaque page d'épreuve distincte de la compétition n'est demandée qu'une fois,
+        # quel que soit le chemin (selects directs, filtres, formulaire) qui la propose
+        plan = EventFetchPlan(_fetch_event, debug=debug)
 
         # 1.a) TENTE D'ABORD de lire directement les <select> d'épreuves dans le bloc
         #      <div class="mb-3"> qui contient "Épreuves Dames/Messieurs" et "Relais ...".
         #      Cela permet de couvrir les compétitions où il n'y a pas de liens idsex=
         #      mais uniquement ces selects.
-        def _scrape_events_from_selects(
-            select_elements, gender_label: str
-        ) -> List[Dict]:
-            all_epreuves: List[Dict] = []
-            nonlocal requests_since_session
-            from urllib.parse import urljoin as _urljoin_local
-
-            for sel in select_elements:
-                for opt in sel.find_all("option"):
-                    value = opt.get("value", "").strip()
-                    label_opt = opt.get_text(strip=True)
-
-                    if not value or not label_opt:
-                        continue
-                    if "Épreuves" in label_opt or "Relais" in label_opt:
-                        continue
+        def _select_events(select_elements, gender_label: str) -> List[Tuple[str, str]]:
+            events = event_options(select_elements, skip_series_view=False)
+            if debug:
+                for label_opt, event_url in events:
+                    print(f"        [grouped] ({gender_label}) épreuve '{label_opt}' → {event_url}")
+            return events
 
+        def _epreuves_from_outcomes(outcomes, gender_label: str) -> List[Dict]:
+            all_epreuves: List[Dict] = []
+            for label_opt, epreuves_event in outcomes:
+                if isinstance(epreuves_event, Exception):
                     if debug:
                         print(
-                            f"        [grouped] ({gender_label}) épreuve '{label_opt}' → {value}"
-                        )
-
-                    event_url = _urljoin_local(BASE_URL, value)
-                    try:
-                        event_resp = http_get_with_retries(
-                            event_url,
-                            debug=debug,
-                            max_retries=5,
-                            session=session,
-                            retry_forever=False,
-                        )
-                        requests_since_session += 1
-                        event_soup = BeautifulSoup(event_resp.content, "html.parser")
-                        epreuves_event = extract_results_from_filter_table(
-                            event_soup, debug=debug
-                        )
-                        if epreuves_event:
-                            all_epreuves.extend(epreuves_event)
-                        else:
-                            all_epreuves.append(
-                                {
-                                    "nom": label_opt,
-                                    "categorie": gender_label,
-                                    "tour": "",
-                                    "performances": [],
-                                }
-                            )
-                    except Exception as e:
-                        if debug:
-                            print(
-                                f"        ✗ Erreur lors du scraping de l'épreuve '{label_opt}' ({gender_label}) : {e}"
-                            )
-                        all_epreuves.append(
-                            {
-                                "nom": label_opt,
-                                "categorie": gender_label,
-                                "tour": "",
-                                "performances": [],
-                            }
+                            f"        ✗ Erreur lors du scraping de l'épreuve '{label_opt}' ({gender_label}) : {epreuves_event}"
                         )
+                elif epreuves_event:
+                    all_epreuves.extend(epreuves_event)
+                    continue
+                all_epreuves.append(
+                    {
+                        "nom": label_opt,
+                        "categorie": gender_label,
+                        "tour": "",
+                        "performances": [],
+                    }
+                )
 
             return all_epreuves
 
         # Cherche tous les <select> et regroupe ceux qui concernent Dames/Messieurs
-        all_selects = soup.find_all("select")
-        selects_dames = []
-        selects_messieurs = []
-        for sel in all_selects:
-            opts = sel.find_all("option")
-            if not opts:
-                continue
-            first_label = opts[0].get_text(strip=True)
-            if "Dames" in first_label:
-                selects_dames.append(sel)
-            elif "Messieurs" in first_label:
-                selects_messieurs.append(sel)
+        selects_dames, selects_messieurs = find_gender_selects(soup)
 
         used_direct_selects = False
         if selects_dames or selects_messieurs:
@@ -705,14 +1384,14 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
                     f"    [grouped] Selects trouvés dans le bloc filtres : "
                     f"{len(selects_dames)} pour Dames, {len(selects_messieurs)} pour Messieurs"
                 )
-            if selects_dames:
-                grouped_results["Dames"] = _scrape_events_from_selects(
-                    selects_dames, "Dames"
-                )
-            if selects_messieurs:
-                grouped_results["Messieurs"] = _scrape_events_from_selects(
-                    selects_messieurs, "Messieurs"
-                )
+            # Dames et Messieurs planifiés ensemble : une page proposée dans les deux listes n'est demandée qu'une fois
+            gender_events = [
+                (gender_label, _select_events(selects, gender_label))
+                for gender_label, selects in (("Dames", selects_dames), ("Messieurs", selects_messieurs))
+                if selects
+            ]
+            for (gender_label, _), outcomes in zip(gender_events, plan.run([events for _, events in gender_events])):
+                grouped_results[gender_label] = _epreuves_from_outcomes(outcomes, gender_label)
 
             if grouped_results:
                 return grouped_results
@@ -724,10 +1403,11 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
             if debug:
                 print("    [grouped] Formulaire 'choix' non trouvé, fallback simple.")
             try:
-                simple_results = get_competition_data(
-                    comp_url, debug=debug, session=session, retry_forever=False
+                # La page principale est déjà téléchargée : analysée telle quelle, sans nouvelle requête
+                simple_results = parse_competition_page(
+                    resp.content, debug=debug, layout_key=result_layout_key(comp_url)
                 )
-                requests_since_session += 1
+                plan.note_reused()
                 if simple_results:
                     grouped_results["default"] = simple_results
                 else:
@@ -748,12 +1428,11 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
             if "idsex=" in href and text in ["Dames", "Messieurs"]:
                 filter_links_valid.append({
                     "label": text,
-                    "url": urljoin(BASE_URL, href)
+                    "url": urljoin(get_base_url(), href)
                 })
         
-        # Si on a trouvé des filtres, scraper les résultats pour chaque filtre
-        # en utilisant également le formulaire AU-DESSUS de la section "Filtres"
-        # (selects des épreuves / relais) pour parcourir toutes les combinaisons.
+        # Si on a trouvé des filtres, chaque page filtrée (idsex=) donne directement les résultats
+        # de son sexe, lus dans sa table (même comportement que le moteur async, mode debug ou non).
         if filter_links_valid:
             if debug:
                 print(f"    [grouped] {len(filter_links_valid)} filtre(s) trouvé(s) : {[f['label'] for f in filter_links_valid]}")
@@ -773,108 +1452,9 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
                         session=session,
                         retry_forever=False,
                     )
-                    requests_since_session += 1
-                    filter_soup = BeautifulSoup(filter_resp.content, "html.parser")
-
-                    # TENTER D'ABORD de parcourir les <select> d'épreuves visibles
-                    # dans la zone de filtres (Épreuves Dames/Messieurs, Relais, etc.),
-                    # sans dépendre strictement du <form name="choix">.
-                    all_epreuves_for_filter: List[Dict] = []
-
-                    # Sélectionner les <select> pertinents en fonction du filtre courant.
-                    selects_candidates = filter_soup.find_all("select")
-                    selects_in_filter: List = []
-                    for sel in selects_candidates:
-                        opts = sel.find_all("option")
-                        if not opts:
-                            continue
-                        first_label = opts[0].get_text(strip=True)
-                        # Rendre la détection plus tolérante : on regarde
-                        # simplement si le libellé contient "Dames" ou "Messieurs".
-                        if filter_label == "Dames" and "Dames" in first_label:
-                            selects_in_filter.append(sel)
-                        elif filter_label == "Messieurs" and "Messieurs" in first_label:
-                            selects_in_filter.append(sel)
-
-                    if debug:
-                        print(
-                            f"        [grouped] {len(selects_in_filter)} select(s) "
-                            f"d'épreuves trouvée(s) pour le filtre '{filter_label}'."
-                        )
-
-                        events_for_filter = 0
-                        for sel in selects_in_filter:
-                            for opt in sel.find_all("option"):
-                                value = opt.get("value", "").strip()
-                                label_opt = opt.get_text(strip=True)
-
-                                if not value or not label_opt:
-                                    continue
-                                if (
-                                    "Épreuves" in label_opt
-                                    or "Relais" in label_opt
-                                    or "Affichage par séries" in label_opt
-                                ):
-                                    continue
-
-                                events_for_filter += 1
-                                event_url = urljoin(BASE_URL, value)
-
-                                if debug:
-                                    print(
-                                        f"        [grouped] Filtre '{filter_label}' → "
-                                        f"épreuve '{label_opt}' → {event_url}"
-                                    )
-
-                                try:
-                                    event_resp = http_get_with_retries(
-                                        event_url,
-                                        debug=debug,
-                                        max_retries=5,
-                                        session=session,
-                                        retry_forever=False,
-                                    )
-                                    requests_since_session += 1
-                                    event_soup = BeautifulSoup(
-                                        event_resp.content, "html.parser"
-                                    )
-                                    epreuves_event = extract_results_from_filter_table(
-                                        event_soup, debug=debug
-                                    )
-                                    if epreuves_event:
-                                        all_epreuves_for_filter.extend(epreuves_event)
-                                    else:
-                                        all_epreuves_for_filter.append(
-                                            {
-                                                "nom": label_opt,
-                                                "categorie": filter_label,
-                                                "tour": "",
-                                                "performances": [],
-                                            }
-                                        )
-                                except Exception as e:
-                                    if debug:
-                                        print(
-                                            f"        ✗ Erreur lors du scraping de "
-                                            f"l'épreuve '{label_opt}' pour le filtre "
-                                            f"'{filter_label}' : {e}"
-                                        )
-
-                        # Si on a effectivement trouvé des épreuves via le formulaire,
-                        # on les utilise comme résultat principal pour ce filtre.
-                        if events_for_filter > 0 and all_epreuves_for_filter:
-                            grouped_results[filter_label] = all_epreuves_for_filter
-                        else:
-                            filter_results = extract_results_from_filter_table(
-                                filter_soup, debug=debug
-                            )
-                            grouped_results[filter_label] = filter_results
-                    else:
-                        # Aucun formulaire trouvé sur la page filtrée :
-                        filter_results = extract_results_from_filter_table(
-                            filter_soup, debug=debug
-                        )
-                    grouped_results[filter_label] = filter_results
+                    with timed_stage("parse"):
+                        filter_soup = make_soup(filter_resp.content, parse_only=FILTER_PAGE)
+                    grouped_results[filter_label] = filter_page_results(filter_soup, debug=debug)
                     
                     if debug:
                         nb = len(grouped_results.get(filter_label, []))
@@ -893,48 +1473,34 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
         if debug:
             print(f"    [grouped] {len(selects)} select(s) trouvée(s) dans le formulaire.")
 
-        events_found = 0
-        for select in selects:
-            for opt in select.find_all("option"):
-                value = opt.get("value", "").strip()
-                label = opt.get_text(strip=True)
+        def _fetch_form_event(event_url: str) -> List[Dict]:
+            return get_competition_data(
+                event_url,
+                debug=False,
+                session=session,
+                retry_forever=False,
+            )
 
-                if not value or not label:
-                    continue
-                if (
-                    "Épreuves" in label
-                    or "Relais" in label
-                    or "Affichage par séries" in label
-                ):
-                    continue
+        events_found = 0
+        for event_name, event_url in event_options(selects):
+            events_found += 1
 
-                events_found += 1
-                event_name = label  
-                event_url = urljoin(BASE_URL, value)
+            if debug:
+                print(f"    [grouped] Épreuve détectée : '{event_name}' → {event_url}")
 
+            try:
+                event_results = plan.fetch_once(event_url, lambda: _fetch_form_event(event_url))
+                grouped_results[event_name] = event_results
                 if debug:
-                    print(f"    [grouped] Épreuve détectée : '{event_name}' → {event_url}")
-
-                try:
-                    
-                    event_results = get_competition_data(
-                        event_url,
-                        debug=False,
-                        session=session,
-                        retry_forever=False,
+                    print(
+                        f"        → {len(event_results)} résultat(s) pour '{event_name}'"
                     )
-                    requests_since_session += 1
-                    grouped_results[event_name] = event_results
-                    if debug:
-                        print(
-                            f"        → {len(event_results)} résultat(s) pour '{event_name}'"
-                        )
-                except Exception as e:
-                    if debug:
-                        print(
-                            f"        ✗ Erreur lors du scraping de '{event_name}' ({event_url}) : {e}"
-                        )
-                    grouped_results[event_name] = []
+            except Exception as e:
+                if debug:
+                    print(
+                        f"        ✗ Erreur lors du scraping de '{event_name}' ({event_url}) : {e}"
+                    )
+                grouped_results[event_name] = []
 
         if events_found == 0 and len(grouped_results) == 0:
             grouped_results["_info"] = f"Formulaire trouvé avec {len(selects)} select(s) mais aucune épreuve valide détectée"
@@ -944,7 +1510,13 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
     if debug:
         print(f"Récupération des compétitions (URL directe) : {url}")
 
-    competitions = get_competitions_for_url(url, debug=debug)
+    # Mode incrémental (manifest) : liste arrêtée à la première page connue, compétitions inchangées non retéléchargées
+    competitions, unchanged = split_unchanged_competitions(
+        plan_competitions(get_competitions_for_url(url, debug=debug, known=manifest), competition_filter, debug=debug),
+        manifest,
+    )
+    if debug and unchanged:
+        print(f"{len(unchanged)} compétition(s) inchangée(s) depuis le dernier passage, non retéléchargée(s)")
 
     competitions_since_pause = 0
     requests_since_session = 0
@@ -952,35 +1524,155 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
     recent_success_count = 0  
     competitions_since_new_session = 0 
 
-    def create_new_session():
-        """ pour créer une nouvelle session avec des headers réalistes"""
-        import random
-        new_session = requests.Session()
-        chrome_version = f"Chrome/{random.randint(120, 130)}.0.{random.randint(1000, 9999)}.{random.randint(100, 999)}"
-        new_session.headers.update({
-            "User-Agent": (
-                f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                f"AppleWebKit/537.36 (KHTML, like Gecko) "
-                f"{chrome_version} Safari/537.36"
-            ),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-            "Accept-Language": "fr-FR,fr;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "Cache-Control": "max-age=0",
-        })
-        return new_session
+    # Débit adaptatif (AdaptiveRateController) : le contrôleur règle seul le rythme des requêtes, sans
+    # pauses fixes ni renouvellement périodique de session ; une série de 403 renouvelle encore la session
+    controller = get_rate_limiter()
+    adaptive = isinstance(controller, AdaptiveRateController)
+    if adaptive:
+        delay_between_comps = 0.0
+        rest_delay = 0.0
+        max_competitions_before_pause = 0
+
+    # Récupère les résultats groupés d'une compétition dans comp ; renvoie "ok", "403" ou "error"
+    def _fetch_competition(comp: Dict, session: requests.Session) -> str:
+        try:
+            # Récupérer les résultats groupés par épreuve (50 NL, 50 Dos, ...)
+            grouped = get_competition_results_grouped_by_event(
+                comp["url"], debug=debug, session=session
+            )
+            comp["results"] = grouped
+            comp["results_count"] = count_grouped_results(grouped)
+            if journal is not None:
+                journal.record(comp)
+            if manifest is not None:
+                manifest.record(comp)
+
+            deliver_competition(comp, on_competition, keep_results)
+
+            if debug:
+                total_grouped = comp.get("results_count", 0)
+                print(f"      → {total_grouped} résultat(s) (toutes épreuves confondues)")
+            return "ok"
+        except Exception as e:
+            comp["results"] = []
+            comp["results_count"] = 0
+            comp["error"] = str(e)
+            deliver_competition(comp, on_competition, keep_results)
+            if debug:
+                print(f"      ✗ Erreur lors de la récupération : {e}")
+            # Vérifier si c'est un 403
+            if "403" in str(e) or "Status 403" in str(e):
+                return "403"
+            return "error"
 
-    # Créer une session HTTP initiale avec des headers réalistes
-    session = create_new_session()
     # Seuil de requêtes "logiques" avant de renouveler la session
-    max_requests_before_new_session = 50
+    max_requests_before_new_session = 0 if adaptive else 50
+
+    # Mode concurrent : un pool de `workers` threads traite plusieurs compétitions à la fois.
+    # Chaque worker garde sa propre session HTTP, renouvelée selon les mêmes règles que la
+    # boucle séquentielle ; le débit global est plafonné par le RateLimiter partagé de get_data.
+    # Les résultats sont rangés dans les dicts de `competitions`, donc l'ordre est conservé.
+    if workers > 1:
+        worker_state = threading.local()
+        open_sessions: List[requests.Session] = []
+        sessions_lock = threading.Lock()
+
+        def _worker(item) -> None:
+            idx, comp = item
+            state = getattr(worker_state, "state", None)
+            if state is None:
+                state = {
+                    "session": create_browser_session(),
+                    "since_new_session": 0,
+                    "requests": 0,
+                    "consecutive_403": 0,
+                    "recent_success": 0,
+                }
+                worker_state.state = state
+                with sessions_lock:
+                    open_sessions.append(state["session"])
+
+            if debug:
+                print(f"  [{idx}/{len(competitions)}] {comp.get('name', 'N/A')}")
+
+            network_before = thread_request_count()
+            status = _fetch_competition(comp, state["session"])
+            network_requests = thread_request_count() - network_before
+            if adaptive and debug:
+                print(f"      Débit adaptatif : {controller.describe()}")
+            if status == "ok":
+                state["consecutive_403"] = 0
+                state["recent_success"] = min(state["recent_success"] + 1, 10)
+            elif status == "403":
+                state["consecutive_403"] += 1
+                state["recent_success"] = max(state["recent_success"] - 1, 0)
+            else:
+                state["consecutive_403"] = 0
+
+            # Compétition entièrement servie depuis le cache : ni pause, ni comptage pour la rotation de session
+            if network_requests == 0:
+                if debug:
+                    print("      (servie depuis le cache, pas de pause)")
+                return
+            state["since_new_session"] += 1
+            state["requests"] += network_requests
+
+            pause: Optional[float] = None
+            if (
+                state["consecutive_403"] >= 5
+                and state["recent_success"] > 0
+                and state["since_new_session"] > 5
+            ):
+                pause = rest_delay * 2
+            elif state["consecutive_403"] >= 5:
+                state["consecutive_403"] = 0
+            elif (
+                max_competitions_before_pause > 0
+                and state["since_new_session"] >= max_competitions_before_pause
+            ) or (
+                max_requests_before_new_session > 0
+                and state["requests"] >= max_requests_before_new_session
+            ):
+                pause = rest_delay
+
+            if pause is not None:
+                if debug:
+                    print(f"      Nouvelle session HTTP pour ce worker (pause de {pause}s)...")
+                state["session"].close()
+                metrics_sleep(pause, "repos_session")
+                new_session = create_browser_session()
+                _record_session_rotation()
+                with sessions_lock:
+                    open_sessions.append(new_session)
+                state.update(
+                    session=new_session,
+                    since_new_session=0,
+                    requests=0,
+                    consecutive_403=0,
+                    recent_success=0,
+                )
+            elif delay_between_comps > 0:
+                metrics_sleep(delay_between_comps, "entre_competitions")
+
+        items = []
+        for idx, comp in enumerate(competitions, 1):
+            if not comp.get("url"):
+                continue
+            if journal is not None and journal.restore(comp):
+                deliver_competition(comp, on_competition, keep_results)
+                continue
+            items.append((idx, comp))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_worker, items))
+        finally:
+            for s in open_sessions:
+                s.close()
+
+        return {"url": url, "competitions": competitions, "unchanged_competitions": unchanged}
+
+    # Créer une session HTTP initiale avec des headers réalistes
+    session = create_browser_session()
 
     try:
         for idx, comp in enumerate(competitions, 1):
@@ -988,57 +1680,40 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
             if not comp_url:
                 continue
 
+            if journal is not None and journal.restore(comp):
+                deliver_competition(comp, on_competition, keep_results)
+                if debug:
+                    print(f"  [{idx}/{len(competitions)}] {comp.get('name', 'N/A')} (déjà dans le journal, ignorée)")
+                continue
+
             if debug:
                 print(f"  [{idx}/{len(competitions)}] {comp.get('name', 'N/A')}")
 
-            is_403 = False
-            try:
-                # Récupérer les résultats groupés par épreuve (50 NL, 50 Dos, ...)
-                grouped = get_competition_results_grouped_by_event(
-                    comp_url, debug=debug, session=session
-                )
-                comp["results"] = grouped
-                # Compter le nombre total de lignes de résultats
-                def _count_grouped_results(grouped_dict: Dict) -> int:
-                    total = 0
-                    for key, value in grouped_dict.items():
-                        if isinstance(key, str) and key.startswith("_"):
-                            continue
-                        if not isinstance(value, list):
-                            continue
-                        if not value:
-                            continue
-                        if isinstance(value[0], dict) and "performances" in value[0]:
-                            for epreuve in value:
-                                if isinstance(epreuve, dict):
-                                    perfs = epreuve.get("performances", [])
-                                    if isinstance(perfs, list):
-                                        total += len(perfs)
-                        else:
-                            total += len(value)
-                    return total
+            network_before = thread_request_count()
 
-                comp["results_count"] = _count_grouped_results(grouped)
+            status = _fetch_competition(comp, session)
+            # Requêtes réseau de la compétition (thread courant), hors pages servies par le cache ou le registre
+            requests_since_session += thread_request_count() - network_before
+            if adaptive and debug:
+                print(f"      Débit adaptatif : {controller.describe()}")
+            is_403 = status == "403"
+            if status == "ok":
                 consecutive_403_count = 0  # Réinitialiser le compteur si succès
-                recent_success_count = min(recent_success_count + 1, 10)  
+                recent_success_count = min(recent_success_count + 1, 10)
+            elif is_403:
+                consecutive_403_count += 1
+                # Décrémenter le compteur de succès récents (mais pas en dessous de 0)
+                recent_success_count = max(recent_success_count - 1, 0)
+            else:
+                consecutive_403_count = 0  # Réinitialiser si ce n'est pas un 403
 
+            # Compétition entièrement servie depuis le cache : aucune requête réseau,
+            # donc ni pause, ni comptage pour la rotation de session.
+            served_from_cache = thread_request_count() == network_before
+            if served_from_cache:
                 if debug:
-                    total_grouped = comp.get("results_count", 0)
-                    print(f"      → {total_grouped} résultat(s) (toutes épreuves confondues)")
-            except Exception as e:
-                comp["results"] = []
-                comp["results_count"] = 0
-                comp["error"] = str(e)
-                # Vérifier si c'est un 403
-                if "403" in str(e) or "Status 403" in str(e):
-                    is_403 = True
-                    consecutive_403_count += 1
-                    # Décrémenter le compteur de succès récents (mais pas en dessous de 0)
-                    recent_success_count = max(recent_success_count - 1, 0)
-                else:
-                    consecutive_403_count = 0  # Réinitialiser si ce n'est pas un 403
-                if debug:
-                    print(f"      ✗ Erreur lors de la récupération : {e}")
+                    print("      (servie depuis le cache, pas de pause)")
+                continue
 
             competitions_since_pause += 1
             competitions_since_new_session += 1
@@ -1060,8 +1735,9 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
                     )
                 session.close()
                 if rest_delay > 0:
-                    time.sleep(rest_delay * 2)  # Pause double pour laisser le serveur se reposer
-                session = create_new_session()
+                    metrics_sleep(rest_delay * 2, "repos_session")  # Pause double pour laisser le serveur se reposer
+                session = create_browser_session()
+                _record_session_rotation()
                 consecutive_403_count = 0
                 competitions_since_pause = 0
                 competitions_since_new_session = 0  # Réinitialiser le compteur depuis la nouvelle session
@@ -1078,7 +1754,7 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
 
             # Pause courte éventuelle entre compétitions (optionnelle)
             if delay_between_comps > 0 and idx < len(competitions):
-                time.sleep(delay_between_comps)
+                metrics_sleep(delay_between_comps, "entre_competitions")
 
             # Créer une nouvelle session après chaque batch de compétitions
             if max_competitions_before_pause > 0 and competitions_since_pause >= max_competitions_before_pause:
@@ -1093,9 +1769,10 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
                 if rest_delay > 0:
                     if debug:
                         print(f"      Pause de {rest_delay}s avant la nouvelle session...")
-                    time.sleep(rest_delay)
+                    metrics_sleep(rest_delay, "repos_session")
                 # Créer une nouvelle session
-                session = create_new_session()
+                session = create_browser_session()
+                _record_session_rotation()
                 competitions_since_pause = 0
                 competitions_since_new_session = 0  # Réinitialiser le compteur depuis la nouvelle session
                 consecutive_403_count = 0  # Réinitialiser aussi le compteur de 403
@@ -1115,20 +1792,21 @@ def get_results_for_competitions_url(url: str, delay_between_comps: float = 1.0,
                 if rest_delay > 0:
                     if debug:
                         print(f"      Pause de {rest_delay}s avant la nouvelle session (requêtes)...")
-                    time.sleep(rest_delay)
-                session = create_new_session()
+                    metrics_sleep(rest_delay, "repos_session")
+                session = create_browser_session()
+                _record_session_rotation()
                 requests_since_session = 0
     finally:
         # Fermer la session à la fin
         session.close()
 
-    return {"url": url, "competitions": competitions}
+    return {"url": url, "competitions": competitions, "unchanged_competitions": unchanged}
 
 
 # Raccourci : récupère les compétitions « Compétitions internationales » (idtyp=7) et leurs résultats.
 def get_international_results(delay_between_comps: float = 1.0,debug: bool = False) -> Dict:
     return get_results_for_competitions_url(
-        INTERNATIONALS_URL,
+        get_competitions_url_by_idtyp(7),
         delay_between_comps=delay_between_comps,
         debug=debug,
     )
@@ -1141,8 +1819,9 @@ def get_international_competitions_list(debug: bool = False) -> Dict:
             "Récupération de la liste des compétitions pour "
             '"Compétitions internationales" (idtyp=7)'
         )
-    competitions = get_competitions_for_url(INTERNATIONALS_URL, debug=debug)
-    return {"url": INTERNATIONALS_URL, "competitions": competitions}
+    url = get_competitions_url_by_idtyp(7)
+    competitions = get_competitions_for_url(url, debug=debug)
+    return {"url": url, "competitions": competitions}
 
 
 # Normalisation
@@ -1281,84 +1960,53 @@ def get_epreuves_for_competition_via_filters(comp_url: str, debug: bool = False)
         max_retries=5,
         retry_forever=False,
     )
-    soup = BeautifulSoup(resp.content, "html.parser")
-
-    def _scrape_events_from_selects(select_elements, gender_label: Optional[str]) -> List[Dict]:
-        all_epreuves: List[Dict] = []
-        from urllib.parse import urljoin as _urljoin_local
+    soup = make_soup(resp.content, parse_only=EVENT_SELECTS)
 
-        for sel in select_elements:
-            for opt in sel.find_all("option"):
-                value = opt.get("value", "").strip()
-                label_opt = opt.get_text(strip=True)
+    # Téléchargement d'une page d'épreuve (l'analyse est faite par fetch_and_parse_events)
+    def _fetch_event(event_url: str) -> requests.Response:
+        return http_get_with_retries(
+            event_url,
+            debug=debug,
+            max_retries=5,
+            retry_forever=False,
+        )
 
-                if not value or not label_opt:
-                    continue
-                if (
-                    "Épreuves" in label_opt
-                    or "Relais" in label_opt
-                    or "Affichage par séries" in label_opt
-                ):
-                    continue
+    # Liste (libellé, URL) des épreuves proposées par des selects
+    def _select_events(select_elements, gender_label: Optional[str]) -> List[Tuple[str, str]]:
+        events: List[Tuple[str, str]] = []
+        for label_opt, event_url in event_options(select_elements):
+            if debug:
+                print(
+                    f"        [update] ({gender_label}) épreuve '{label_opt}' → {event_url}"
+                )
+            events.append((label_opt, event_url))
+        return events
 
-                event_url = _urljoin_local(BASE_URL, value)
+    def _epreuves_from_outcomes(outcomes, gender_label: Optional[str]) -> List[Dict]:
+        all_epreuves: List[Dict] = []
+        for label_opt, epreuves_event in outcomes:
+            if isinstance(epreuves_event, Exception):
                 if debug:
                     print(
-                        f"        [update] ({gender_label}) épreuve '{label_opt}' → {event_url}"
-                    )
-
-                try:
-                    event_resp = http_get_with_retries(
-                        event_url,
-                        debug=debug,
-                        max_retries=5,
-                        retry_forever=False,
-                    )
-                    event_soup = BeautifulSoup(event_resp.content, "html.parser")
-                    epreuves_event = extract_results_from_filter_table(
-                        event_soup, debug=debug
-                    )
-                    if epreuves_event:
-                        all_epreuves.extend(epreuves_event)
-                    else:
-                        all_epreuves.append(
-                            {
-                                "nom": label_opt,
-                                "categorie": gender_label or "",
-                                "tour": "",
-                                "performances": [],
-                            }
-                        )
-                except Exception as e:
-                    if debug:
-                        print(
-                            f"        ✗ [update] Erreur lors du scraping de l'épreuve "
-                            f"'{label_opt}' ({gender_label}) : {e}"
-                        )
-                    all_epreuves.append(
-                        {
-                            "nom": label_opt,
-                            "categorie": gender_label or "",
-                            "tour": "",
-                            "performances": [],
-                        }
+                        f"        ✗ [update] Erreur lors du scraping de l'épreuve "
+                        f"'{label_opt}' ({gender_label}) : {epreuves_event}"
                     )
+            elif epreuves_event:
+                all_epreuves.extend(epreuves_event)
+                continue
+            all_epreuves.append(
+                {
+                    "nom": label_opt,
+                    "categorie": gender_label or "",
+                    "tour": "",
+                    "performances": [],
+                }
+            )
 
         return all_epreuves
 
     # Chercher tous les selects et repérer ceux pour Dames / Messieurs
-    all_selects = soup.find_all("select")
-    selects_dames: List = []
-    selects_messieurs: List = []
-    for sel in all_selects:
-        opts = sel.find_all("option")
-        if not opts:
-            continue
-        first_label = opts[0].get_text(strip=True)
-        if "Dames" in first_label:
-            selects_dames.append(sel)
-        elif "Messieurs" in first_label:
-            selects_messieurs.append(sel)
+    selects_dames, selects_messieurs = find_gender_selects(soup)
 
     if selects_dames or selects_messieurs:
         if debug:
@@ -1366,10 +2014,15 @@ def get_epreuves_for_competition_via_filters(comp_url: str, debug: bool = False)
                 f"    [update] Selects trouvés : "
                 f"{len(selects_dames)} pour Dames, {len(selects_messieurs)} pour Messieurs"
             )
-        if selects_dames:
-            epreuves_all.extend(_scrape_events_from_selects(selects_dames, "Dames"))
-        if selects_messieurs:
-            epreuves_all.extend(_scrape_events_from_selects(selects_messieurs, "Messieurs"))
+        # Dames et Messieurs planifiés ensemble : chaque page d'épreuve distincte n'est demandée qu'une fois
+        gender_events = [
+            (gender_label, _select_events(selects, gender_label))
+            for gender_label, selects in (("Dames", selects_dames), ("Messieurs", selects_messieurs))
+            if selects
+        ]
+        plan = EventFetchPlan(_fetch_event, debug=debug)
+        for (gender_label, _), outcomes in zip(gender_events, plan.run([events for _, events in gender_events])):
+            epreuves_all.extend(_epreuves_from_outcomes(outcomes, gender_label))
 
         if epreuves_all:
             return epreuves_all
@@ -1377,14 +2030,9 @@ def get_epreuves_for_competition_via_filters(comp_url: str, debug: bool = False)
     if debug:
         print("    [update] Aucuns selects Dames/Messieurs utilisables, fallback get_competition_data.")
 
-    try:
-        results = get_competition_data(
-            comp_url,
-            debug=debug,
-            retry_forever=False,
-        )
-    except TypeError:
-        results = get_competition_data(comp_url, debug=debug)
+    # La page compétition est déjà téléchargée : analysée telle quelle, sans nouvelle requête
+    results = parse_competition_page(resp.content, debug=debug, layout_key=result_layout_key(comp_url))
+    record_event_plan(1, 0)
 
     if isinstance(results, list):
         return results_list_to_epreuves(results, default_categorie=None)
@@ -1400,88 +2048,71 @@ def get_epreuves_for_competition_via_filters(comp_url: str, debug: bool = False)
     return []
 
 
-# Récupère les compétitions de la derniere mise a jour
-def get_new_competitions_latest_update(debug: bool = False) -> Dict:
-    """
-    Mode spécial utilisé par la commande :
-      python get_data_deeper.py --update
-    """
-    main_url = f"{BASE_URL}{COMPETITIONS_PATH}"
+# Mois en français pour parser la date dans "Mise à jour du : Lundi 9 Février 2026"
+MOIS_FR = {
+    "janvier": 1,
+    "février": 2,
+    "fevrier": 2,
+    "mars": 3,
+    "avril": 4,
+    "mai": 5,
+    "juin": 6,
+    "juillet": 7,
+    "août": 8,
+    "aout": 8,
+    "septembre": 9,
+    "octobre": 10,
+    "novembre": 11,
+    "décembre": 12,
+    "decembre": 12,
+}
+
+
+def _parse_update_date(text: str) -> Optional[date]:
+    m = re_module.search(
+        r"(\d{1,2})\s+([A-Za-zéèêëàâäôöûüùîïçÉÈÊËÀÂÄÔÖÛÜÙÎÏÇ]+)\s+(\d{4})",
+        text,
+    )
+    if not m:
+        return None
     try:
-        resp = http_get_with_retries(main_url, debug=debug)
-        soup = BeautifulSoup(resp.content, "html.parser")
-    except Exception as e:
-        if debug:
-            print(f"Erreur lors de la récupération de la page principale compétitions : {e}")
-        soup = None
+        j = int(m.group(1))
+        mois_str = m.group(2).lower()
+        an = int(m.group(3))
+        mois_num = MOIS_FR.get(mois_str)
+        if not mois_num:
+            return None
+        return date(an, mois_num, j)
+    except Exception:
+        return None
+
 
+# Sur la page principale des compétitions, repère le bloc « Mise à jour du ... » le plus récent et les compétitions qu'il liste.
+# Renvoie (texte de la mise à jour, date parsée, compétitions).
+def parse_latest_update(soup: BeautifulSoup) -> Tuple[Optional[str], Optional[date], List[Dict]]:
     last_update_text: Optional[str] = None
     last_update_date: Optional[date] = None
     last_update_span = None
-    if soup is not None:
-        spans = soup.find_all(
-            "span",
-            class_="block rounded-sm bg-white px-4 py-1.5 text-sm font-medium",
-        )
-        # Mois en français pour parser la date dans "Mise à jour du : Lundi 9 Février 2026"
-        mois_fr = {
-            "janvier": 1,
-            "février": 2,
-            "fevrier": 2,
-            "mars": 3,
-            "avril": 4,
-            "mai": 5,
-            "juin": 6,
-            "juillet": 7,
-            "août": 8,
-            "aout": 8,
-            "septembre": 9,
-            "octobre": 10,
-            "novembre": 11,
-            "décembre": 12,
-            "decembre": 12,
-        }
-
-        def _parse_update_date(text: str) -> Optional[date]:
-            m = re_module.search(
-                r"(\d{1,2})\s+([A-Za-zéèêëàâäôöûüùîïçÉÈÊËÀÂÄÔÖÛÜÙÎÏÇ]+)\s+(\d{4})",
-                text,
-            )
-            if not m:
-                return None
-            try:
-                j = int(m.group(1))
-                mois_str = m.group(2).lower()
-                an = int(m.group(3))
-                mois_num = mois_fr.get(mois_str)
-                if not mois_num:
-                    return None
-                return date(an, mois_num, j)
-            except Exception:
-                return None
-
-        for sp in spans:
-            txt = sp.get_text(strip=True)
-            if "Mise à jour du" not in txt:
-                continue
-            d = _parse_update_date(txt)
-            if d is None:
-                continue
-            if last_update_date is None or d > last_update_date:
-                last_update_date = d
-                last_update_text = txt
-                last_update_span = sp
 
-    if debug and last_update_text:
-        print(f"Dernière mise à jour détectée : {last_update_text}")
-        if last_update_date:
-            print(f"Date de mise à jour parsée : {last_update_date.isoformat()}")
+    spans = soup.find_all(
+        "span",
+        class_="block rounded-sm bg-white px-4 py-1.5 text-sm font-medium",
+    )
+    for sp in spans:
+        txt = sp.get_text(strip=True)
+        if "Mise à jour du" not in txt:
+            continue
+        d = _parse_update_date(txt)
+        if d is None:
+            continue
+        if last_update_date is None or d > last_update_date:
+            last_update_date = d
+            last_update_text = txt
+            last_update_span = sp
 
     new_competitions: List[Dict] = []
 
-    if soup is not None and last_update_span is not None:
-        from bs4 import Tag
-
+    if last_update_span is not None:
         for elem in last_update_span.next_elements:
             if (
                 isinstance(elem, Tag)
@@ -1502,83 +2133,44 @@ def get_new_competitions_latest_update(debug: bool = False) -> Dict:
             ):
                 continue
 
-            comp_div = elem
-            comp_info: Dict = {}
-
-            date_elements = comp_div.find_all("div", class_="text-blue-600")
-            if date_elements:
-                date_long = comp_div.find(
-                    "div",
-                    class_="text-blue-600 text-xs uppercase hidden md:block",
-                )
-                if date_long:
-                    comp_info["date"] = date_long.get_text(strip=True)
-                else:
-                    comp_info["date"] = date_elements[0].get_text(strip=True)
-
-            # Titre + URL
-            title_link = comp_div.find("a", href=True)
-            if title_link:
-                comp_info["name"] = title_link.get_text(strip=True)
-                href = title_link.get("href")
-                if href:
-                    if "idcpt=" in href:
-                        idcpt = href.split("idcpt=")[1].split("&")[0]
-                        comp_info["competition_id"] = idcpt
-                        comp_info["url"] = urljoin(BASE_URL, href)
-                    else:
-                        comp_info["url"] = urljoin(BASE_URL, href)
+            comp_info = parse_competition_block(elem)
+            if "competition_id" in comp_info or "url" in comp_info:
+                new_competitions.append(comp_info)
 
-            # Lieu
-            location_span = comp_div.find(
-                "span",
-                class_=["uppercase", "text-green-700", "font-bold"],
-            )
-            if not location_span:
-                location_span = comp_div.find(
-                    "span", class_="uppercase text-green-700 font-bold"
-                )
-            if location_span:
-                comp_info["location"] = location_span.get_text(strip=True)
+    return last_update_text, last_update_date, new_competitions
 
-            # Titre original
-            title_original = comp_div.find(
-                "div", class_="text-xs text-orange-600"
-            )
-            if title_original:
-                text = title_original.get_text(strip=True)
-                if text.startswith("Titre original :"):
-                    comp_info["original_title"] = (
-                        text.replace("Titre original :", "").strip()
-                    )
 
-            # Type de compétition
-            type_divs = comp_div.find_all(
-                "div", class_="text-xs text-orange-600"
-            )
-            for type_div in type_divs:
-                text = type_div.get_text(strip=True)
-                if text.startswith("Type de compétition :"):
-                    comp_info["competition_type"] = (
-                        text.replace("Type de compétition :", "").strip()
-                    )
+# Récupère les compétitions de la derniere mise a jour
+def get_new_competitions_latest_update(debug: bool = False, manifest: Optional[CompetitionManifest] = None) -> Dict:
+    """
+    Mode spécial utilisé par la commande :
+      python get_data_deeper.py --update
+    Avec un manifeste, les compétitions déjà stockées et inchangées ne sont pas
+    retéléchargées (listées dans unchanged_competitions).
+    """
+    main_url = f"{get_base_url()}{COMPETITIONS_PATH}"
+    try:
+        resp = http_get_with_retries(main_url, debug=debug)
+        soup = make_soup(resp.content)
+    except Exception as e:
+        if debug:
+            print(f"Erreur lors de la récupération de la page principale compétitions : {e}")
+        soup = None
 
-            # Taille de bassin
-            bassin_img = comp_div.find("img", alt="taille bassin")
-            if bassin_img:
-                src = bassin_img.get("src", "")
-                if "25m" in src:
-                    comp_info["pool_size"] = "25m"
-                elif "50m" in src:
-                    comp_info["pool_size"] = "50m"
+    last_update_text: Optional[str] = None
+    last_update_date: Optional[date] = None
+    new_competitions: List[Dict] = []
+    if soup is not None:
+        last_update_text, last_update_date, new_competitions = parse_latest_update(soup)
 
-            # Niveau (Régional, Départemental, etc.)
-            level_div = comp_div.find("div", class_="text-red-700 font-light")
-            if level_div:
-                comp_info["level"] = level_div.get_text(strip=True)
+    if debug and last_update_text:
+        print(f"Dernière mise à jour détectée : {last_update_text}")
+        if last_update_date:
+            print(f"Date de mise à jour parsée : {last_update_date.isoformat()}")
 
-            if "competition_id" in comp_info or "url" in comp_info:
-                new_competitions.append(comp_info)
+    new_competitions, unchanged = split_unchanged_competitions(new_competitions, manifest)
+    if debug and unchanged:
+        print(f"[update] {len(unchanged)} compétition(s) déjà stockée(s) et inchangée(s) : ignorée(s)")
 
     for idx, comp in enumerate(new_competitions, 1):
         comp_url = comp.get("url")
@@ -1606,6 +2198,8 @@ def get_new_competitions_latest_update(debug: bool = False) -> Dict:
             comp["error"] = str(e)
             if debug:
                 print(f"[update]   ✗ Erreur lors de la récupération des résultats : {e}")
+        if manifest is not None:
+            manifest.record(comp)
 
     payload: Dict = {
         "generation_date": datetime.now().isoformat(),
@@ -1614,11 +2208,28 @@ def get_new_competitions_latest_update(debug: bool = False) -> Dict:
         "source_url": main_url,
         "new_competitions_count": len(new_competitions),
         "competitions": new_competitions,
+        "unchanged_competitions": unchanged,
     }
 
     return payload
 
 
+# Sépare les compétitions de la mise à jour entre celles à télécharger (inconnues du manifeste,
+# ou dont la date / la mention extrait / la marque nouvelle ont changé) et celles déjà stockées
+# (renvoyées sous forme abrégée : identifiant, nom, date)
+def split_unchanged_competitions(competitions: List[Dict], manifest: Optional[CompetitionManifest]) -> Tuple[List[Dict], List[Dict]]:
+    if manifest is None:
+        return competitions, []
+    to_fetch: List[Dict] = []
+    unchanged: List[Dict] = []
+    for comp in competitions:
+        if manifest.is_current(comp):
+            unchanged.append({k: comp.get(k) for k in ("competition_id", "name", "date", "url")})
+        else:
+            to_fetch.append(comp)
+    return to_fetch, unchanged
+
+
 # Génère un résumé des erreurs de collecte (par type et global)
 def generate_resume(data: Dict, output_dir: str = "competitions_per_type", idtyp: Optional[int] = None, type_name: Optional[str] = None) -> Dict:
     resume: Dict = {
@@ -1777,6 +2388,55 @@ def generate_resume(data: Dict, output_dir: str = "competitions_per_type", idtyp
     return resume
 
 
+# Mots-clés de la ligne de commande qui ne sont ni des idtyp ni des dates
+CLI_FLAGS = ("debug", "fast", "list", "--update", "update", "cache", "async", "new", "resume", "fullparse", "nodedup", "nojson", "centiemes", "nomanifest", "adaptive", "incremental")
+
+
+# Bilan du registre des requêtes de l'exécution (voir get_data.RequestRegistry) et du cache HTTP
+def _print_request_summary() -> None:
+    registry = get_request_registry()
+    if registry is not None:
+        print(f"- Requêtes HTTP envoyées : {registry.fetched}")
+        print(f"- Requêtes évitées (doublons) : {registry.saved}")
+    planned, fetched = get_event_plan_stats()
+    if planned:
+        print(f"- Pages d'épreuves : {fetched} demandée(s) pour {planned} option(s), {planned - fetched} requête(s) évitée(s) (planificateur)")
+    limiter = get_rate_limiter()
+    if isinstance(limiter, AdaptiveRateController):
+        print(f"- Débit adaptatif final : {limiter.describe()}")
+    cache = get_http_cache()
+    if cache is not None and (cache.hits or cache.revalidated or cache.parse_hits):
+        print(
+            f"- Cache HTTP : {cache.hits} page(s) servie(s), {cache.revalidated} revalidée(s) (304), "
+            f"{cache.parse_hits} analyse(s) évitée(s)"
+        )
+
+
+# Écrit le rapport des mesures du crawl (voir crawl_metrics.CrawlMetrics) et en affiche l'essentiel
+def _write_metrics_report(path: str) -> None:
+    metrics = get_metrics()
+    if metrics is None:
+        return
+    metrics.write_report(path)
+    report = metrics.report()
+    stages = ", ".join(f"{stage} {seconds:.1f} s" for stage, seconds in report["stage_seconds"].items())
+    print(f"- Mesures : {report['requests']} requête(s), {report['bytes_downloaded'] / 1e6:.1f} Mo, {report['retries']} relance(s), {stages}")
+    print(f"- Rapport des mesures : {path}")
+
+
+# Options CLI de la forme cle=valeur (ex. cache_ttl=48) → {"cache_ttl": "48"}
+def _parse_cli_options(args: List[str]) -> Dict[str, str]:
+    options: Dict[str, str] = {}
+    for arg in args:
+        if "=" not in arg:
+            continue
+        key, value = arg.split("=", 1)
+        key = key.strip().lstrip("-").lower()
+        if key:
+            options[key] = value.strip()
+    return options
+
+
 # Point d'entrée CLI : scrape types/compétitions selon les arguments (debug, fast, intl, dates), et sauvegarde les résultats et résumés dans les dossiers configurés.
 def main():
     output_dir = "competitions_per_type"
@@ -1788,7 +2448,118 @@ def main():
     dates_dir = "competitions_per_dates"
     os.makedirs(dates_dir, exist_ok=True)
 
+    checkpoints_dir = "checkpoints"
+
     raw_args = sys.argv[1:]
+    cli_options = _parse_cli_options(raw_args)
+
+    # Site cible : python get_data_deeper.py intl 7 base=http://127.0.0.1:8765/webffn/
+    # (serveur local fake_extranat_server.py pour mesurer un crawl sans solliciter ffn.extranat.fr)
+    if "base" in cli_options:
+        set_base_url(cli_options["base"])
+        print(f"Site cible : {get_base_url()}")
+
+    # Cache disque des réponses HTTP : python get_data_deeper.py intl 7 cache [cache_ttl=48]
+    # (cache_ttl en heures pour les pages de résultats ; les listes restent valides 1 heure)
+    if "cache" in [a.lower() for a in raw_args]:
+        cache_ttl_hours = float(cli_options.get("cache_ttl", 7 * 24))
+        cache = ResponseCache(directory=cli_options.get("cache_dir", ".http_cache"), ttl=cache_ttl_hours * 3600.0)
+        set_http_cache(cache)
+        print(f"Cache HTTP actif : {cache.directory} ({len(cache)} entrée(s), TTL {cache_ttl_hours:g} h)")
+
+    # Récupération concurrente : python get_data_deeper.py intl 6 workers=4 [rps=4]
+    # (rps = plafond global de requêtes par seconde vers ffn.extranat.fr, 4 par défaut en mode concurrent)
+    workers = max(1, int(cli_options.get("workers", "1")))
+    # Pages de liste (pagination) téléchargées en parallèle : python get_data_deeper.py intl 16 listing_workers=8
+    # (autant que workers par défaut ; toujours sous le limiteur de débit)
+    listing_workers = max(1, int(cli_options.get("listing_workers", str(workers))))
+    set_listing_workers(listing_workers)
+    if "adaptive" in [a.lower() for a in raw_args]:
+        # Débit adaptatif (AIMD) : python get_data_deeper.py intl 6 adaptive [rps=2] [max_rps=16] [min_rps=0.2]
+        # (rps = débit de départ ; remplace les pauses fixes et les renouvellements de session périodiques)
+        controller = AdaptiveRateController(
+            rate=float(cli_options.get("rps", "2")),
+            min_rate=float(cli_options.get("min_rps", "0.2")),
+            max_rate=float(cli_options.get("max_rps", "16")),
+            burst=max(workers, listing_workers),
+        )
+        set_rate_limiter(controller)
+        print(f"Débit adaptatif actif : départ {controller.rate:g} requête(s)/s, entre {controller.min_rate:g} et {controller.max_rate:g}, {workers} worker(s)")
+    elif "rps" in cli_options or workers > 1 or listing_workers > 1:
+        rps = float(cli_options.get("rps", "4"))
+        set_rate_limiter(RateLimiter(rps, burst=max(workers, listing_workers)))
+        print(f"Limiteur de débit actif : {rps:g} requête(s)/s, {workers} worker(s), {listing_workers} pour les listes")
+
+    # Mesures du crawl (requêtes, latences, temps par étape...), écrites en fin d'exécution dans
+    # Resumes/metrics.json (metrics=chemin) ; metrics_port=9108 les sert en direct au format Prometheus
+    metrics = CrawlMetrics()
+    set_metrics(metrics)
+    metrics_path = cli_options.get("metrics", os.path.join(resumes_dir, "metrics.json"))
+    if "metrics_port" in cli_options:
+        metrics.serve(int(cli_options["metrics_port"]))
+        print(f"Mesures en direct : http://127.0.0.1:{cli_options['metrics_port']}/metrics")
+
+    # Base SQLite des résultats : python get_data_deeper.py intl 7 sqlite=resultats.sqlite [nojson]
+    # (alimentée en plus des fichiers JSON par compétition, ou à leur place avec nojson)
+    results_store = None
+    if "sqlite" in cli_options:
+        from results_store import ResultsStore
+        results_store = ResultsStore(cli_options["sqlite"])
+        print(f"Base SQLite des résultats : {results_store.path}")
+    write_json_files = "nojson" not in [a.lower() for a in raw_args]
+
+    # Index des nageurs sur disque, mis à jour au fil du crawl : python get_data_deeper.py intl 7 index=swimmer_index
+    swimmer_index = None
+    if "index" in cli_options:
+        from swimmer_index import SwimmerIndex
+        swimmer_index = SwimmerIndex(cli_options["index"])
+        print(f"Index des nageurs : {swimmer_index.path}")
+
+    # Temps en centièmes à côté des textes d'origine (temps_cs, cumul_cs, split_cs) : python get_data_deeper.py intl 7 centiemes
+    add_cs = None
+    if "centiemes" in [a.lower() for a in raw_args]:
+        from time_parsing import add_centiseconds as add_cs
+
+    # Sortie JSON Lines au fil du crawl : python get_data_deeper.py intl 7 stream=resultats.jsonl [stream_per=performance]
+    # (une ligne par compétition, ou par performance, écrite dès que la compétition est terminée).
+    # Avec nojson, sans sqlite ni index, les résultats sont libérés après écriture : mémoire constante.
+    stream_writer = None
+    if "stream" in cli_options:
+        from results_stream import JsonlWriter
+        stream_writer = JsonlWriter(cli_options["stream"], per=cli_options.get("stream_per", "competition"))
+        print(f"Sortie JSON Lines : {stream_writer.path} (une ligne par {stream_writer.per})")
+    keep_results = stream_writer is None or write_json_files or results_store is not None or swimmer_index is not None
+
+    # Registre des requêtes de l'exécution : une URL déjà téléchargée (ou en cours) n'est pas redemandée
+    # (même compétition sous plusieurs idtyp, mêmes épreuves sous Dames / Messieurs) ; "nodedup" le désactive.
+    # Sans conserver les résultats (flux seul), il n'est pas installé : la mémoire reste constante
+    if "nodedup" not in [a.lower() for a in raw_args] and keep_results:
+        dedup_mb = float(cli_options.get("dedup_mb", "16"))
+        set_request_registry(RequestRegistry(max_bytes=int(dedup_mb * 1024 * 1024)))
+
+    # Analyseur HTML : lxml par défaut (repli automatique sur html.parser), ex. parser=html.parser
+    if "parser" in cli_options:
+        set_html_parser(cli_options["parser"])
+    # Analyse partielle (SoupStrainer) active par défaut ; "fullparse" reconstruit l'arbre complet des pages
+    if "fullparse" in [a.lower() for a in raw_args]:
+        set_partial_parsing(False)
+    # Analyse des pages d'épreuves dans un pool de processus : python get_data_deeper.py intl 7 parse_workers=4
+    # (les téléchargements continuent pendant l'analyse, qui n'est plus limitée à un cœur par le GIL)
+    parse_workers = max(0, int(cli_options.get("parse_workers", "0")))
+    if parse_workers > 0:
+        set_parse_workers(parse_workers)
+        print(f"Analyse en parallèle : {parse_workers} processus")
+
+    # Moteur asyncio (aiohttp) : python get_data_deeper.py intl 1 2 3 async [max_in_flight=64]
+    use_async = "async" in [a.lower() for a in raw_args]
+    async_kwargs: Dict = {}
+    if use_async:
+        import crawl_async
+        async_kwargs["max_in_flight"] = int(cli_options.get("max_in_flight", "32"))
+        # Débit adaptatif : comme le moteur synchrone, ni pause de repos ni nouvelle session à intervalle fixe
+        if isinstance(get_rate_limiter(), AdaptiveRateController):
+            async_kwargs.update(max_competitions_before_pause=0, max_requests_before_new_session=0, rest_delay=0.0)
+        print(f"Moteur async actif : {async_kwargs['max_in_flight']} requête(s) en vol au maximum")
 
     # Mode spécial : récupération des compétitions marquées « nouvelle compétition » pour la dernière mise à jour 
     # python get_data_deeper.py --update [debug]
@@ -1798,7 +2569,16 @@ def main():
         updates_dir = "updates"
         os.makedirs(updates_dir, exist_ok=True)
 
-        data_update = get_new_competitions_latest_update(debug=debug_update)
+        # Manifeste des compétitions déjà stockées : seules les compétitions nouvelles ou modifiées
+        # sont retéléchargées (manifest=chemin pour un autre fichier, nomanifest pour tout retélécharger)
+        manifest: Optional[CompetitionManifest] = None
+        if "nomanifest" not in lowered_args:
+            manifest = CompetitionManifest(cli_options.get("manifest", os.path.join(updates_dir, "manifest.json")))
+
+        if use_async:
+            data_update = crawl_async.get_new_competitions_latest_update_async(manifest=manifest, debug=debug_update, **async_kwargs)
+        else:
+            data_update = get_new_competitions_latest_update(debug=debug_update, manifest=manifest)
 
         # Si on a réussi à parser la date de dernière mise à jour, on l'utilise pour le nom du fichier.
         # Sinon, on retombe sur la date du jour.
@@ -1814,8 +2594,25 @@ def main():
             filename_date_str = date.today().strftime("%Y%m%d")
 
         update_filename = os.path.join(updates_dir, f"update_{filename_date_str}.json")
-        with open(update_filename, "w", encoding="utf-8") as f:
-            json.dump(data_update, f, ensure_ascii=False, indent=2)
+        fetched = data_update["competitions"]
+        if manifest is not None and not fetched and os.path.exists(update_filename):
+            print(f"Aucune compétition nouvelle ou modifiée : {update_filename} inchangé")
+        else:
+            # Même mise à jour déjà enregistrée par un passage précédent : les compétitions inchangées
+            # (non retéléchargées) gardent leurs résultats, les compétitions retéléchargées les remplacent
+            if data_update.get("unchanged_competitions") and os.path.exists(update_filename):
+                try:
+                    with open(update_filename, "r", encoding="utf-8") as f:
+                        previous = json.load(f)
+                except (OSError, ValueError):
+                    previous = {}
+                refreshed = {CrawlJournal.key_for(c) for c in fetched}
+                kept = [c for c in previous.get("competitions", []) if CrawlJournal.key_for(c) not in refreshed]
+                data_update["competitions"] = kept + fetched
+            with open(update_filename, "w", encoding="utf-8") as f:
+                json.dump(data_update, f, ensure_ascii=False, indent=2)
+        if manifest is not None:
+            manifest.save()
 
         print("*" * 60)
         print("MODE UPDATE - NOUVELLES COMPÉTITIONS")
@@ -1823,10 +2620,20 @@ def main():
         print(f"- Date de génération : {data_update.get('generation_date')}")
         print(f"- Dernière mise à jour détectée : {data_update.get('last_update_text')}")
         print(f"- Nombre de nouvelles compétitions : {data_update.get('new_competitions_count')}")
+        if manifest is not None:
+            print(f"- Compétitions déjà stockées et inchangées : {len(data_update.get('unchanged_competitions', []))}")
+            print(f"- Manifeste : {manifest.path} ({len(manifest)} compétition(s))")
         print(f"- Fichier JSON : {update_filename}")
+        _print_request_summary()
+        _write_metrics_report(metrics_path)
         print("*" * 60)
         return
 
+    # Sans fichiers JSON (nojson), les résultats doivent aller ailleurs : flux JSON Lines, base SQLite ou index
+    if not write_json_files and stream_writer is None and results_store is None and swimmer_index is None:
+        print("L'option nojson demande une autre sortie (stream=, sqlite= ou index=) : sinon les résultats ne seraient enregistrés nulle part, crawl annulé")
+        return
+
     debug = False
     delay_between_comps = 0.0
     only_idtyps: Optional[List[int]] = None
@@ -1851,7 +2658,7 @@ def main():
         except ValueError:
             return None
 
-    non_option = [a for a in raw_args if a.lower() not in ("debug", "fast", "list", "--update", "update")]
+    non_option = [a for a in raw_args if a.lower() not in CLI_FLAGS and "=" not in a]
     if non_option:
         if len(non_option) == 1 and _is_year_token(non_option[0]):
             year = int(non_option[0])
@@ -1906,26 +2713,21 @@ def main():
             start_date = min(parsed_dates)
             end_date = max(parsed_dates)
 
-    def _parse_competition_date(date_str: str) -> Optional[date]:
-        """
-        Extrait une date JJ/MM/AAAA d'une chaîne comme
-        'Samedi 10/01/2026' ou 'Sa 10/01/26' et la convertit en date.
-        Seule la partie JJ/MM/AAAA est utilisée pour la comparaison.
-        """
-        if not date_str:
-            return None
-        # Chercher explicitement un motif JJ/MM/AAAA
-        m = re.search(r"(\d{2}/\d{2}/\d{4})", date_str)
-        if not m:
-            return None
-        try:
-            return datetime.strptime(m.group(1), "%d/%m/%Y").date()
-        except ValueError:
-            return None
+    # Critères appliqués à la liste des compétitions avant le téléchargement des résultats :
+    # plage de dates, pool=25m|50m, level=<niveau>, new (uniquement les nouvelles compétitions)
+    competition_filter = build_competition_predicate(
+        start_date=start_date,
+        end_date=end_date,
+        pool_size=cli_options.get("pool"),
+        level=cli_options.get("level"),
+        only_new="new" in [a.lower() for a in sys.argv[1:]],
+    )
+
+    resume = "resume" in [a.lower() for a in sys.argv[1:]]
 
     if "debug" in args:
         debug = True
-    if "fast" in args:
+    if "fast" in args or isinstance(get_rate_limiter(), AdaptiveRateController):
         delay_between_comps = 0.0
 
     # Mode spécial : compétitions par type (idtyp)
@@ -1972,10 +2774,22 @@ def main():
                 print(f"Options : delay_between_comps={delay_between_comps}")
             
             url = get_competitions_url_by_idtyp(idtyp)
+
+            # Rafraîchissement incrémental : python get_data_deeper.py intl 15 incremental
+            # (manifeste par type checkpoints/manifest_idtyp_<idtyp>.json : la liste s'arrête à la première page
+            # entièrement connue et seules les compétitions nouvelles ou modifiées sont retéléchargées)
+            manifest: Optional[CompetitionManifest] = None
+            if "incremental" in args:
+                manifest = CompetitionManifest(os.path.join(checkpoints_dir, f"manifest_idtyp_{idtyp}.json"))
+                print(f"Mode incrémental : {len(manifest)} compétition(s) connue(s) dans {manifest.path}")
             
             # Pour avoir la liste des compétitions (sans résultats), ajouter "list" dans les arguments
             if "list" in args:
-                competitions = get_competitions_for_url(url, debug=debug)
+                if use_async:
+                    competitions = crawl_async.get_competitions_for_url_async(url, known=manifest, debug=debug, **async_kwargs)
+                else:
+                    competitions = get_competitions_for_url(url, debug=debug, known=manifest)
+                competitions = plan_competitions(competitions, competition_filter, debug=debug)
                 data = {"url": url, "competitions": competitions}
                 filename = os.path.join(output_dir, f"competitions_idtyp_{idtyp}.json")
             
@@ -1990,25 +2804,49 @@ def main():
                 print("*" * 60)
                 continue
             else:
-                data = get_results_for_competitions_url(
-                    url,
-                    delay_between_comps=delay_between_comps,
-                    debug=debug,
+                # Journal de reprise : chaque compétition terminée est écrite aussitôt dans
+                # checkpoints/journal_idtyp_<idtyp>.jsonl ; avec "resume", celles déjà présentes sont sautées.
+                journal = CrawlJournal(
+                    os.path.join(checkpoints_dir, f"journal_idtyp_{idtyp}.jsonl"),
+                    resume=resume,
                 )
+                if resume:
+                    print(f"Reprise : {len(journal)} compétition(s) déjà dans le journal {journal.path}")
+                on_competition = None
+                if stream_writer is not None:
+                    def on_competition(comp: Dict, idtyp=idtyp, type_name=type_name) -> None:
+                        stream_writer.write_competition(comp, idtyp=idtyp, type_name=type_name)
+                try:
+                    if use_async:
+                        data = crawl_async.get_results_for_competitions_url_async(
+                            url,
+                            competition_filter=competition_filter,
+                            journal=journal,
+                            on_competition=on_competition,
+                            keep_results=keep_results,
+                            manifest=manifest,
+                            debug=debug,
+                            **async_kwargs,
+                        )
+                    else:
+                        data = get_results_for_competitions_url(
+                            url,
+                            delay_between_comps=delay_between_comps,
+                            debug=debug,
+                            workers=workers,
+                            competition_filter=competition_filter,
+                            journal=journal,
+                            on_competition=on_competition,
+                            keep_results=keep_results,
+                            manifest=manifest,
+                        )
+                finally:
+                    journal.close()
+                    if manifest is not None:
+                        manifest.save()
             
+                # Le filtre (dates, bassin, niveau...) a déjà été appliqué avant le téléchargement des résultats
                 competitions = data.get("competitions", [])
-                if start_date is not None and end_date is not None:
-                    filtered_competitions: List[Dict] = []
-                    for comp in competitions:
-                        comp_date_str = comp.get("date")
-                        comp_date = _parse_competition_date(comp_date_str) if comp_date_str else None
-                        if comp_date is None:
-                            continue
-                        if start_date <= comp_date <= end_date:
-                            filtered_competitions.append(comp)
-            
-                    competitions = filtered_competitions
-                    data["competitions"] = competitions
             
                 total_competitions = len(competitions)
                 total_results = sum(c.get("results_count", 0) for c in competitions)
@@ -2023,6 +2861,20 @@ def main():
                 used_bases: set[str] = set()
             
                 competitions_files: List[str] = []
+
+                # Écrit une compétition filtrée (Dames / Messieurs...) : fichier JSON et/ou base SQLite
+                def _emit_competition(comp_doc: Dict, comp_path: str, competition_name: Optional[str]) -> None:
+                    if add_cs is not None:
+                        add_cs(comp_doc.get("epreuves") or [])
+                    with timed_stage("write"):
+                        if write_json_files:
+                            with open(comp_path, "w", encoding="utf-8") as f:
+                                json.dump(comp_doc, f, ensure_ascii=False, indent=2)
+                            competitions_files.append(comp_path)
+                        if results_store is not None:
+                            results_store.add_competition(comp_doc, idtyp=idtyp, type_name=folder_name, name=competition_name)
+                        if swimmer_index is not None:
+                            swimmer_index.add_competition(comp_doc, path=comp_path if write_json_files else None)
             
                 for comp in competitions:
                     raw_name = comp.get("name", "competition_sans_nom")
@@ -2086,9 +2938,7 @@ def main():
             
                             comp_filename = f"{safe_base}-{filter_name}.json"
                             comp_path = os.path.join(type_dir, comp_filename)
-                            with open(comp_path, "w", encoding="utf-8") as f:
-                                json.dump(comp_filtered, f, ensure_ascii=False, indent=2)
-                            competitions_files.append(comp_path)
+                            _emit_competition(comp_filtered, comp_path, raw_name)
                     else:
                         def _normalize_event_fields(results_dict: Dict):
                             for event_name, perfs in results_dict.items():
@@ -2314,20 +3164,24 @@ def main():
                             comp_gender["name"] = f"{safe_base}-{gender_label}"
                             comp_filename = f"{safe_base}-{gender_label}.json"
                             comp_path = os.path.join(type_dir, comp_filename)
-                            with open(comp_path, "w", encoding="utf-8") as f:
-                                json.dump(comp_gender, f, ensure_ascii=False, indent=2)
-                            competitions_files.append(comp_path)
+                            _emit_competition(comp_gender, comp_path, raw_name)
         
                         _write_gender_file("Dames", epreuves_dames)
                         _write_gender_file("Messieurs", epreuves_messieurs)
             
-                # Générer le résumé des erreurs (dans le dossier Resumes)
-                resume_data = generate_resume(
-                    data,
-                    output_dir=resumes_dir,
-                    idtyp=idtyp,
-                    type_name=type_name
-                )
+                # Générer le résumé des erreurs (dans le dossier Resumes). En mode incrémental, data ne contient
+                # que les compétitions nouvelles ou modifiées : les résumés (type, global, par dates) des passages
+                # complets précédents ne sont pas réécrits avec ces chiffres partiels
+                if manifest is None:
+                    resume_data = generate_resume(
+                        data,
+                        output_dir=resumes_dir,
+                        idtyp=idtyp,
+                        type_name=type_name
+                    )
+                    error_pct = resume_data["par_type"][0]["error_percentage"] if resume_data["par_type"] else "0.0%"
+                else:
+                    error_pct = f"{round(total_errors / total_competitions * 100, 2) if total_competitions else 0.0}%"
                 
                 def _type_name_to_filename(tn: str) -> str:
                     import re
@@ -2347,16 +3201,20 @@ def main():
                 print(f"RÉSUMÉ ({type_name})")
                 print("*" * 60)
                 print(f"- Compétitions : {total_competitions}")
+                if manifest is not None:
+                    print(f"- Inchangées (incrémental) : {len(data.get('unchanged_competitions', []))}")
                 print(f"- Résultats    : {total_results}")
                 print(f"- Erreurs      : {total_errors}")
-                error_pct = resume_data["par_type"][0]["error_percentage"] if resume_data["par_type"] else "0.0%"
                 print(f"- Taux d'erreur : {error_pct}")
                 print(f"- Dossier type : {type_dir}")
-                print(f"- Fichier résumé (type) : {os.path.join(resumes_dir, f'{resume_filename}.json')}")
-                print(f"- Fichier résumé (global) : {os.path.join(resumes_dir, 'resume.json')}")
+                if manifest is None:
+                    print(f"- Fichier résumé (type) : {os.path.join(resumes_dir, f'{resume_filename}.json')}")
+                    print(f"- Fichier résumé (global) : {os.path.join(resumes_dir, 'resume.json')}")
+                else:
+                    print(f"- Fichiers résumé : inchangés (mode incrémental, compétitions nouvelles ou modifiées seulement)")
                 print("*" * 60)
             
-                if start_date is not None and end_date is not None:
+                if start_date is not None and end_date is not None and manifest is None:
                     start_str = start_date.strftime("%d/%m/%Y")
                     end_str = end_date.strftime("%d/%m/%Y")
                     base_label = f"{type_name} {start_str} {end_str}"
@@ -2387,6 +3245,31 @@ def main():
                     with open(summary_path, "w", encoding="utf-8") as f:
                         json.dump(summary_payload, f, ensure_ascii=False, indent=2)
 
+        if results_store is not None:
+            results_store.close()
+        if swimmer_index is not None:
+            swimmer_index.close()
+        if stream_writer is not None:
+            stream_writer.close()
+            print(f"- Sortie JSON Lines : {stream_writer.path} ({stream_writer.lines} ligne(s))")
+        if get_request_registry() is not None or get_http_cache() is not None or get_rate_limiter() is not None:
+            print("\n" + "*" * 60)
+            print("RÉSUMÉ DES REQUÊTES")
+            _print_request_summary()
+            print("*" * 60)
+        _write_metrics_report(metrics_path)
+        return
+
+    # Le mode tous types (sans intl) n'écrit que results_by_type.json et le flux JSON Lines : la base SQLite
+    # et l'index des nageurs sont alimentés par l'écriture des compétitions filtrées (Dames / Messieurs) du mode intl
+    if results_store is not None or swimmer_index is not None:
+        print("Les options sqlite= et index= ne sont disponibles qu'avec intl (ex. python get_data_deeper.py intl 6 sqlite=resultats.sqlite) : crawl annulé")
+        if results_store is not None:
+            results_store.close()
+        if swimmer_index is not None:
+            swimmer_index.close()
+        if stream_writer is not None:
+            stream_writer.close()
         return
 
     for raw_arg in raw_args:
@@ -2406,11 +3289,17 @@ def main():
         delay_between_comps=delay_between_comps,
         debug=debug,
         only_idtyps=only_idtyps,
+        competition_filter=competition_filter,
+        on_competition=stream_writer.write_competition if stream_writer is not None else None,
+        keep_results=keep_results,
     )
+    if stream_writer is not None:
+        stream_writer.close()
 
     filename = os.path.join(output_dir, "results_by_type.json")
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if write_json_files:
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
 
     total_types = len(data.get("types", []))
     total_competitions = sum(
@@ -2436,9 +3325,14 @@ def main():
     print(f"- Erreurs               : {total_errors}")
     global_error_pct = resume_data["resume"]["global_error_percentage"]
     print(f"- Taux d'erreur global  : {global_error_pct}")
-    print(f"- Fichier               : {filename}")
+    if write_json_files:
+        print(f"- Fichier               : {filename}")
+    if stream_writer is not None:
+        print(f"- Sortie JSON Lines     : {stream_writer.path} ({stream_writer.lines} ligne(s))")
     print(f"- Fichier résumé (global) : {os.path.join(resumes_dir, 'resume.json')}")
     print(f"- Fichiers résumé (par type) : {total_types} fichier(s) resume_*.json")
+    _print_request_summary()
+    _write_metrics_report(metrics_path)
 
 if __name__ == "__main__":
     main()
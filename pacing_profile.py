@@ -0,0 +1,259 @@
+import json
+import re
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from export_columnar import iter_source_performances
+from time_parsing import format_time_cs, parse_distance_m, parse_times_cs
+
+try:
+    import numpy as np
+except ImportError:  # dépendance optionnelle, indispensable à ce module (calculs par lot)
+    np = None
+
+
+# Distance totale d'une épreuve d'après son nom : "200 Papillon" -> 200, "4 x 100 Nage Libre" -> 400
+_EVENT_DISTANCE_RE = re.compile(r"^\s*(?:(\d+)\s*x\s*)?(\d+)", re.IGNORECASE)
+
+# Bornes hautes des tranches de classement : 1-3, 4-8, 9-16, 17+
+DEFAULT_RANK_BANDS = (3, 8, 16)
+
+METRICS = ("split_index", "fade_pct", "even_pace_dev")
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def event_distance_m(name: Optional[str]) -> Optional[int]:
+    if not name:
+        return None
+    m = _EVENT_DISTANCE_RE.match(name)
+    if not m:
+        return None
+    return int(m.group(1) or 1) * int(m.group(2))
+
+
+def _rank(value) -> Optional[int]:
+    try:
+        return int(str(value).strip().rstrip("."))
+    except (TypeError, ValueError):
+        return None
+
+
+# Libellés des tranches de classement : (3, 8, 16) -> ["1-3", "4-8", "9-16", "17+"]
+def rank_band_labels(bounds: Sequence[int]) -> List[str]:
+    labels: List[str] = []
+    low = 1
+    for high in bounds:
+        labels.append(f"{low}-{high}" if high > low else str(low))
+        low = high + 1
+    labels.append(f"{low}+")
+    return labels
+
+
+# Passages d'une performance -> (distances cumulées en m, temps cumulés texte).
+# Le dernier passage manquant (tooltip arrêté avant l'arrivée) est complété par le temps final.
+def _split_layout(record: Dict, total_m: Optional[int]) -> Tuple[Tuple[int, ...], List[Optional[str]]]:
+    distances: List[int] = []
+    cumuls: List[Optional[str]] = []
+    for split in record.get("splits") or []:
+        if not isinstance(split, dict):
+            continue
+        distance = parse_distance_m(split.get("distance"))
+        if distance is None or (distances and distance <= distances[-1]):
+            return (), []
+        distances.append(distance)
+        cumuls.append(split.get("cumul"))
+    if not distances:
+        return (), []
+    if total_m is not None and distances[-1] < total_m:
+        distances.append(total_m)
+        cumuls.append(record.get("temps") or record.get("time"))
+    return tuple(distances), cumuls
+
+
+class EventPacing:
+    """
+    Allures de toutes les performances d'une épreuve ayant le même découpage de passages
+    (une ligne par performance, une colonne par longueur de passage) :
+    - velocity : vitesse moyenne de chaque passage (m/s) ;
+    - split_index : écart entre la seconde et la première moitié de course, en % du temps final
+      (positif : seconde moitié plus lente) ; NaN si aucun passage à mi-course ;
+    - fade_pct : baisse de vitesse du dernier passage par rapport au passage le plus rapide (%) ;
+    - even_pace_dev : coefficient de variation de l'allure (s/m) hors premier passage, qui
+      comprend le plongeon (%) ; NaN sous trois passages.
+    """
+
+    def __init__(self, epreuve: str, categorie: str, distances: Tuple[int, ...], ranks: "np.ndarray", cumul_cs: "np.ndarray"):
+        self.epreuve = epreuve
+        self.categorie = categorie
+        self.distances = np.asarray(distances, dtype=np.int32)
+        self.ranks = ranks
+        self.cumul_cs = cumul_cs
+
+        self.lap_m = np.diff(self.distances, prepend=0).astype(np.float64)
+        self.lap_cs = np.diff(cumul_cs, axis=1, prepend=0)
+        self.total_cs = cumul_cs[:, -1].astype(np.float64)
+        self.velocity = self.lap_m / (self.lap_cs / 100.0)
+
+        half = np.flatnonzero(self.distances * 2 == self.distances[-1])
+        if half.size:
+            first_half = cumul_cs[:, half[0]].astype(np.float64)
+            self.split_index = (self.total_cs - 2 * first_half) / self.total_cs * 100.0
+        else:
+            self.split_index = np.full(len(ranks), np.nan)
+
+        if self.lap_m.size > 1:
+            peak = self.velocity.max(axis=1)
+            self.fade_pct = (peak - self.velocity[:, -1]) / peak * 100.0
+        else:
+            self.fade_pct = np.full(len(ranks), np.nan)
+
+        if self.lap_m.size > 2:
+            pace = self.lap_cs[:, 1:] / self.lap_m[1:]
+            self.even_pace_dev = pace.std(axis=1) / pace.mean(axis=1) * 100.0
+        else:
+            self.even_pace_dev = np.full(len(ranks), np.nan)
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    @property
+    def layout(self) -> str:
+        laps = sorted({int(m) for m in self.lap_m})
+        lap = f"{laps[0]} m" if len(laps) == 1 else "/".join(str(m) for m in laps) + " m"
+        return f"{len(self.lap_m)} x {lap}"
+
+    # Distributions par tranche de classement : effectif, moyenne et centiles de chaque indicateur,
+    # vitesse médiane de chaque passage et temps final médian
+    def distributions(self, bounds: Sequence[int] = DEFAULT_RANK_BANDS) -> Dict[str, Dict]:
+        labels = rank_band_labels(bounds)
+        ranks = np.where(self.ranks > 0, self.ranks, np.iinfo(np.int32).max)
+        band = np.searchsorted(np.asarray(bounds), ranks, side="left")
+        bands: Dict[str, Dict] = {}
+        for index, label in enumerate(labels + ["sans classement"]):
+            if label == "sans classement":
+                rows = self.ranks <= 0
+            else:
+                rows = (band == index) & (self.ranks > 0)
+            if not rows.any():
+                continue
+            entry: Dict = {"count": int(rows.sum())}
+            for metric in METRICS:
+                values = getattr(self, metric)[rows]
+                values = values[~np.isnan(values)]
+                if values.size == 0:
+                    continue
+                centiles = np.percentile(values, PERCENTILES)
+                entry[metric] = {
+                    "mean": round(float(values.mean()), 2),
+                    **{f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, centiles)},
+                }
+            entry["lap_velocity_median"] = [round(float(v), 3) for v in np.median(self.velocity[rows], axis=0)]
+            entry["temps_median"] = format_time_cs(int(np.median(self.total_cs[rows])))
+            bands[label] = entry
+        return bands
+
+
+# Regroupe les performances par (épreuve, catégorie, découpage des passages) et calcule les allures
+# de chaque groupe sur des matrices numpy ; tous les temps cumulés sont convertis en un seul lot.
+# Les performances sans passages exploitables (DSQ, passages manquants ou non croissants) sont écartées.
+def compute_event_pacing(records: Iterable[Dict]) -> Tuple[List[EventPacing], int]:
+    if np is None:
+        raise RuntimeError("pacing_profile nécessite numpy (pip install numpy)")
+
+    groups: Dict[Tuple[str, str, Tuple[int, ...]], Tuple[List[int], List[int]]] = {}
+    texts: List[Optional[str]] = []
+    skipped = 0
+    for record in records:
+        epreuve = record.get("epreuve") or record.get("event") or ""
+        distances, cumuls = _split_layout(record, event_distance_m(epreuve))
+        if not distances:
+            skipped += 1
+            continue
+        key = (epreuve, record.get("categorie") or "", distances)
+        ranks, offsets = groups.setdefault(key, ([], []))
+        rank = _rank(record.get("classement"))
+        ranks.append(rank if rank is not None else 0)
+        offsets.append(len(texts))
+        texts.extend(cumuls)
+
+    cs, valid = parse_times_cs(texts)
+    events: List[EventPacing] = []
+    for (epreuve, categorie, distances), (ranks, offsets) in groups.items():
+        columns = np.arange(len(distances))
+        index = np.asarray(offsets)[:, None] + columns
+        cumul = cs[index].astype(np.int64)
+        # Temps tous valides et strictement croissants d'un passage à l'autre
+        keep = valid[index].all(axis=1) & (np.diff(cumul, axis=1, prepend=0) > 0).all(axis=1)
+        skipped += int((~keep).sum())
+        if keep.any():
+            events.append(
+                EventPacing(epreuve, categorie, distances, np.asarray(ranks, dtype=np.int32)[keep], cumul[keep])
+            )
+    events.sort(key=lambda e: (e.categorie, event_distance_m(e.epreuve) or 0, e.epreuve, -len(e)))
+    return events, skipped
+
+
+def build_report(events: List[EventPacing], bounds: Sequence[int] = DEFAULT_RANK_BANDS) -> List[Dict]:
+    return [
+        {
+            "epreuve": e.epreuve,
+            "categorie": e.categorie,
+            "passages": e.layout,
+            "distances": e.distances.tolist(),
+            "performances": len(e),
+            "rank_bands": e.distributions(bounds),
+        }
+        for e in events
+    ]
+
+
+def main() -> None:
+    """
+    python pacing_profile.py <source> [<source> ...] [sortie=pacing.json] [rangs=3,8,16] [epreuve=200 Papillon]
+    Sources : dossier competitions_per_type (ou un sous-dossier), fichiers .json de
+    compétition, fichiers .jsonl produits par l'option stream= de get_data_deeper.py.
+    """
+    sources = [a for a in sys.argv[1:] if "=" not in a]
+    if not sources:
+        raise SystemExit(
+            "Usage : python pacing_profile.py <source> [<source> ...] [sortie=pacing.json] [rangs=3,8,16] [epreuve=...]"
+        )
+    options = dict(a.split("=", 1) for a in sys.argv[1:] if "=" in a)
+    bounds = tuple(int(b) for b in options.get("rangs", ",".join(map(str, DEFAULT_RANK_BANDS))).split(",") if b.strip())
+    event_filter = options.get("epreuve", "").lower()
+
+    start = time.perf_counter()
+    records = iter_source_performances(sources)
+    if event_filter:
+        records = (r for r in records if event_filter in (r.get("epreuve") or r.get("event") or "").lower())
+    events, skipped = compute_event_pacing(records)
+    report = build_report(events, bounds)
+    elapsed = time.perf_counter() - start
+
+    output = options.get("sortie")
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"=== Allures : {sum(len(e) for e in events)} performance(s), {len(events)} épreuve(s) en {elapsed:.2f} s ===")
+    if skipped:
+        print(f"- Performances sans passages exploitables : {skipped}")
+    for entry in report:
+        print(f"\n{entry['epreuve']} {entry['categorie']} ({entry['passages']}, {entry['performances']} perf.)")
+        for label, band in entry["rank_bands"].items():
+            split = band.get("split_index", {}).get("p50")
+            fade = band.get("fade_pct", {}).get("p50")
+            dev = band.get("even_pace_dev", {}).get("p50")
+            print(
+                f"  {label:<16} n={band['count']:<5} temps {band['temps_median']:>9}  "
+                f"split {'-' if split is None else f'{split:+.2f} %':>9}  "
+                f"fade {'-' if fade is None else f'{fade:.2f} %':>8}  "
+                f"écart allure {'-' if dev is None else f'{dev:.2f} %':>8}"
+            )
+    if output:
+        print(f"\nRapport : {output}")
+
+
+if __name__ == "__main__":
+    main()
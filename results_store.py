@@ -0,0 +1,319 @@
+import json
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Schéma normalisé : compétitions (une ligne par fichier Dames / Messieurs), épreuves, performances,
+# nageurs d'une performance (plusieurs pour un relais) et temps de passage
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS competitions (
+    id INTEGER PRIMARY KEY,
+    idtyp INTEGER,
+    type_name TEXT,
+    idcpt TEXT,
+    filter TEXT,
+    name TEXT,
+    date TEXT,
+    date_debut TEXT,
+    location TEXT,
+    pool_size TEXT,
+    level TEXT,
+    url TEXT,
+    results_count INTEGER,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS epreuves (
+    id INTEGER PRIMARY KEY,
+    competition_ref INTEGER NOT NULL REFERENCES competitions(id) ON DELETE CASCADE,
+    position INTEGER,
+    nom TEXT,
+    categorie TEXT,
+    tour TEXT
+);
+CREATE TABLE IF NOT EXISTS performances (
+    id INTEGER PRIMARY KEY,
+    epreuve_ref INTEGER NOT NULL REFERENCES epreuves(id) ON DELETE CASCADE,
+    position INTEGER,
+    classement INTEGER,
+    club TEXT,
+    temps TEXT,
+    points INTEGER,
+    mpp TEXT,
+    is_relay INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS performance_nageurs (
+    performance_ref INTEGER NOT NULL REFERENCES performances(id) ON DELETE CASCADE,
+    position INTEGER,
+    name TEXT,
+    sexe TEXT,
+    annee_naissance INTEGER,
+    age INTEGER,
+    nationalite TEXT
+);
+CREATE TABLE IF NOT EXISTS splits (
+    performance_ref INTEGER NOT NULL REFERENCES performances(id) ON DELETE CASCADE,
+    position INTEGER,
+    distance TEXT,
+    cumul TEXT,
+    split TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_competitions_source ON competitions(idtyp, url, filter);
+CREATE INDEX IF NOT EXISTS idx_competitions_date ON competitions(date_debut);
+CREATE INDEX IF NOT EXISTS idx_competitions_idtyp ON competitions(idtyp);
+CREATE INDEX IF NOT EXISTS idx_epreuves_competition ON epreuves(competition_ref);
+CREATE INDEX IF NOT EXISTS idx_epreuves_nom ON epreuves(nom, categorie);
+CREATE INDEX IF NOT EXISTS idx_performances_epreuve ON performances(epreuve_ref);
+CREATE INDEX IF NOT EXISTS idx_performances_club ON performances(club);
+CREATE INDEX IF NOT EXISTS idx_nageurs_performance ON performance_nageurs(performance_ref);
+CREATE INDEX IF NOT EXISTS idx_nageurs_name ON performance_nageurs(name);
+CREATE INDEX IF NOT EXISTS idx_splits_performance ON splits(performance_ref);
+"""
+
+# Champs de compétition stockés dans des colonnes dédiées ; les autres vont dans la colonne JSON « extra »
+_COMPETITION_COLUMNS = ("competition_id", "filter", "name", "date", "location", "pool_size", "level", "url", "results_count", "epreuves")
+
+
+# Première date JJ/MM/AAAA d'un libellé de date de compétition, au format ISO (None si absente)
+def _iso_date(date_text: Optional[str]) -> Optional[str]:
+    if not date_text:
+        return None
+    m = re.search(r"(\d{2}/\d{2}/\d{4})", date_text)
+    if not m:
+        return None
+    try:
+        return datetime.strptime(m.group(1), "%d/%m/%Y").date().isoformat()
+    except ValueError:
+        return None
+
+
+def _int_or_none(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+class ResultsStore:
+    """
+    Base SQLite des résultats, alimentée par main() en parallèle (ou à la place)
+    des fichiers JSON competitions_per_type/<type>/<compétition>-<Dames|Messieurs>.json.
+
+    Chaque document ajouté (même structure que ces fichiers JSON) remplace la
+    version précédente de la même compétition / même filtre : relancer un crawl
+    met la base à jour sans doublons.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # Ajoute (ou remplace) une compétition filtrée et toutes ses épreuves / performances / passages
+    def add_competition(self, doc: Dict, idtyp: Optional[int] = None, type_name: Optional[str] = None, name: Optional[str] = None) -> int:
+        extra = {k: v for k, v in doc.items() if k not in _COMPETITION_COLUMNS}
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM competitions WHERE idtyp IS ? AND url IS ? AND filter IS ?",
+                (idtyp, doc.get("url"), doc.get("filter")),
+            )
+            cur = self.conn.execute(
+                "INSERT INTO competitions (idtyp, type_name, idcpt, filter, name, date, date_debut, location, pool_size, level, url, results_count, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    idtyp,
+                    type_name,
+                    doc.get("competition_id"),
+                    doc.get("filter"),
+                    name or doc.get("name"),
+                    doc.get("date"),
+                    _iso_date(doc.get("date")),
+                    doc.get("location"),
+                    doc.get("pool_size"),
+                    doc.get("level"),
+                    doc.get("url"),
+                    _int_or_none(doc.get("results_count")),
+                    json.dumps(extra, ensure_ascii=False) if extra else None,
+                ),
+            )
+            competition_ref = cur.lastrowid
+            for e_pos, epreuve in enumerate(doc.get("epreuves") or []):
+                if isinstance(epreuve, dict):
+                    self._add_epreuve(competition_ref, e_pos, epreuve)
+        return competition_ref
+
+    def _add_epreuve(self, competition_ref: int, position: int, epreuve: Dict) -> None:
+        cur = self.conn.execute(
+            "INSERT INTO epreuves (competition_ref, position, nom, categorie, tour) VALUES (?, ?, ?, ?, ?)",
+            (competition_ref, position, epreuve.get("nom"), epreuve.get("categorie"), epreuve.get("tour")),
+        )
+        epreuve_ref = cur.lastrowid
+
+        nageurs_rows: List[Tuple] = []
+        splits_rows: List[Tuple] = []
+        for p_pos, perf in enumerate(epreuve.get("performances") or []):
+            if not isinstance(perf, dict):
+                continue
+            nageurs = perf.get("nageur")
+            is_relay = isinstance(nageurs, list)
+            if not is_relay:
+                nageurs = [nageurs] if isinstance(nageurs, dict) else []
+            cur = self.conn.execute(
+                "INSERT INTO performances (epreuve_ref, position, classement, club, temps, points, mpp, is_relay) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    epreuve_ref,
+                    p_pos,
+                    _int_or_none(perf.get("classement")),
+                    perf.get("club"),
+                    perf.get("temps"),
+                    _int_or_none(perf.get("points")),
+                    perf.get("mpp"),
+                    int(is_relay),
+                ),
+            )
+            performance_ref = cur.lastrowid
+            for n_pos, nageur in enumerate(nageurs):
+                if not isinstance(nageur, dict):
+                    continue
+                nageurs_rows.append((
+                    performance_ref,
+                    n_pos,
+                    nageur.get("name"),
+                    nageur.get("sexe"),
+                    _int_or_none(nageur.get("annee_naissance")),
+                    _int_or_none(nageur.get("age")),
+                    nageur.get("nationalite"),
+                ))
+            for s_pos, split in enumerate(perf.get("splits") or []):
+                if not isinstance(split, dict):
+                    continue
+                splits_rows.append((
+                    performance_ref,
+                    s_pos,
+                    split.get("distance"),
+                    split.get("cumul"),
+                    split.get("split") or split.get("time"),
+                ))
+
+        self.conn.executemany(
+            "INSERT INTO performance_nageurs (performance_ref, position, name, sexe, annee_naissance, age, nationalite) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            nageurs_rows,
+        )
+        self.conn.executemany(
+            "INSERT INTO splits (performance_ref, position, distance, cumul, split) VALUES (?, ?, ?, ?, ?)",
+            splits_rows,
+        )
+
+    # Performances filtrées (nageur, club, épreuve, catégorie, plage de dates ISO), les plus récentes d'abord
+    def find_performances(self, nageur: Optional[str] = None, club: Optional[str] = None, epreuve: Optional[str] = None, categorie: Optional[str] = None, date_from: Optional[str] = None, date_to: Optional[str] = None, idtyp: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if nageur is not None:
+            clauses.append("p.id IN (SELECT performance_ref FROM performance_nageurs WHERE name = ?)")
+            params.append(nageur)
+        if club is not None:
+            clauses.append("p.club = ?")
+            params.append(club)
+        if epreuve is not None:
+            clauses.append("e.nom = ?")
+            params.append(epreuve)
+        if categorie is not None:
+            clauses.append("e.categorie = ?")
+            params.append(categorie)
+        if date_from is not None:
+            clauses.append("c.date_debut >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("c.date_debut <= ?")
+            params.append(date_to)
+        if idtyp is not None:
+            clauses.append("c.idtyp = ?")
+            params.append(idtyp)
+
+        sql = (
+            "SELECT p.id AS performance_id, c.name AS competition, c.date_debut, c.idtyp, c.filter, "
+            "e.nom AS epreuve, e.categorie, e.tour, p.classement, p.club, p.temps, p.points, p.is_relay, "
+            "(SELECT group_concat(name, ' / ') FROM performance_nageurs n WHERE n.performance_ref = p.id) AS nageurs "
+            "FROM performances p JOIN epreuves e ON e.id = p.epreuve_ref JOIN competitions c ON c.id = e.competition_ref"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY c.date_debut DESC, c.id, e.position, p.position"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    # Passages d'une performance, dans l'ordre des distances
+    def splits_for(self, performance_id: int) -> List[Dict]:
+        rows = self.conn.execute(
+            "SELECT distance, cumul, split FROM splits WHERE performance_ref = ? ORDER BY position",
+            (performance_id,),
+        )
+        return [dict(row) for row in rows]
+
+
+# Importe des fichiers JSON déjà générés (competitions_per_type/<type>/*.json) dans la base
+def import_json_files(store: ResultsStore, paths: Iterable[str]) -> int:
+    imported = 0
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                doc = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Fichier ignoré : {path} ({e})")
+            continue
+        if not isinstance(doc, dict) or "epreuves" not in doc:
+            continue
+        type_dir = path.replace("\\", "/").rsplit("/", 2)
+        type_name = type_dir[-2] if len(type_dir) >= 2 else None
+        store.add_competition(doc, type_name=type_name)
+        imported += 1
+    return imported
+
+
+def main() -> None:
+    """
+    python results_store.py base.sqlite [dossier=competitions_per_type]
+    Importe les fichiers JSON de compétitions existants dans une base SQLite.
+    """
+    if len(sys.argv) < 2:
+        raise SystemExit("Usage : python results_store.py base.sqlite [dossier=competitions_per_type]")
+
+    from pathlib import Path
+
+    db_path = sys.argv[1]
+    root = Path("competitions_per_type")
+    for arg in sys.argv[2:]:
+        if arg.startswith("dossier="):
+            root = Path(arg.split("=", 1)[1])
+
+    paths = sorted(str(p) for p in root.glob("*/*.json"))
+    with ResultsStore(db_path) as store:
+        imported = import_json_files(store, paths)
+    print(f"{imported} compétition(s) importée(s) dans {db_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+from typing import Dict, Iterator, Optional
+
+
+# Performances d'une compétition scrapée (comp["results"], groupés par filtre ou par épreuve),
+# aplaties en une ligne par performance avec le contexte compétition / épreuve
+def iter_performance_records(comp: Dict, idtyp: Optional[int] = None, type_name: Optional[str] = None) -> Iterator[Dict]:
+    context = {
+        "idtyp": idtyp,
+        "type_name": type_name,
+        "competition_id": comp.get("competition_id"),
+        "competition": comp.get("name"),
+        "date": comp.get("date"),
+        "url": comp.get("url"),
+    }
+    results = comp.get("results")
+    if not isinstance(results, dict):
+        return
+    for group, items in results.items():
+        if group.startswith("_") or not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            # Épreuve issue des pages filtre (nom, categorie, tour, performances)
+            if isinstance(item.get("performances"), list):
+                for perf in item["performances"]:
+                    if isinstance(perf, dict):
+                        yield {
+                            **context,
+                            "groupe": group,
+                            "epreuve": item.get("nom"),
+                            "categorie": item.get("categorie"),
+                            "tour": item.get("tour"),
+                            **perf,
+                        }
+            # Ligne de résultat de get_competition_data (page simple, groupée par nom d'épreuve)
+            else:
+                yield {**context, "groupe": group, "epreuve": item.get("event") or group, **item}
+
+
+class JsonlWriter:
+    """
+    Sortie JSON Lines au fil du crawl : une ligne par compétition (per="competition",
+    compétition scrapée complète avec ses résultats) ou par performance
+    (per="performance", voir iter_performance_records). Chaque ligne est écrite et
+    vidée sur disque dès que la compétition est terminée, sans garder le jeu de
+    données en mémoire ; un autre processus peut lire le fichier pendant le crawl.
+    """
+
+    def __init__(self, path: str, per: str = "competition", append: bool = False):
+        if per not in ("competition", "performance"):
+            raise ValueError(f"per doit valoir 'competition' ou 'performance', pas {per!r}")
+        self.path = path
+        self.per = per
+        self.lines = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write_competition(self, comp: Dict, idtyp: Optional[int] = None, type_name: Optional[str] = None) -> None:
+        if self.per == "performance":
+            records = list(iter_performance_records(comp, idtyp, type_name))
+        else:
+            records = [{"idtyp": idtyp, "type_name": type_name, **comp}]
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        with self._lock:
+            self._file.write(payload)
+            self._file.flush()
+            self.lines += len(records)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+# Lit paresseusement un fichier JSON Lines (une ligne en mémoire à la fois) ;
+# une dernière ligne incomplète (crawl en cours ou interrompu) est ignorée
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+INDEX_VERSION = 1
+DEFAULT_SHARDS = 256
+
+
+# Nom de nageur normalisé : majuscules sans accents, tirets / apostrophes / espaces multiples réduits
+# ("DUPONT Jean-Édouard" -> "DUPONT JEAN EDOUARD")
+def normalize_name(name: Optional[str]) -> str:
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(re.split(r"[\s\-']+", text.upper())).strip()
+
+
+# Identité d'un nageur (dict nageur de parse_swimmer) : nom normalisé|année de naissance|nationalité
+def swimmer_key(nageur: Dict) -> Optional[str]:
+    name = normalize_name(nageur.get("name"))
+    if not name:
+        return None
+    year = nageur.get("annee_naissance")
+    return f"{name}|{year if year is not None else ''}|{nageur.get('nationalite') or ''}"
+
+
+# Identifiant d'un document de compétition filtrée (Dames / Messieurs...) : une même compétition
+# crawlée sous plusieurs idtyp garde le même identifiant, ses postings ne sont donc pas dupliqués
+def document_key(doc: Dict) -> str:
+    return f"{doc.get('competition_id') or doc.get('url') or doc.get('name')}|{doc.get('filter') or ''}"
+
+
+# "Samedi 12/01/2026" -> "2026-01-12" (tri chronologique des historiques) ; "" si absente
+def _date_key(date_text: Optional[str]) -> str:
+    m = re.search(r"(\d{2})/(\d{2})/(\d{4})", date_text or "")
+    return f"{m.group(3)}-{m.group(2)}-{m.group(1)}" if m else ""
+
+
+class SwimmerIndex:
+    """
+    Index des nageurs sur disque : pour chaque identité (nom normalisé, année de naissance,
+    nationalité), la liste de ses performances (postings : compétition, épreuve, classement, temps...).
+
+    Les identités sont réparties dans des fichiers shards/<nnn>.json selon un hachage du nom
+    seul : l'historique d'un nageur (et de ses homonymes) se lit dans un seul fichier, sans
+    parcourir les fichiers de compétitions. meta.json garde, pour chaque document indexé,
+    les identités qui y figurent (pour le remplacer sans doublon s'il est réindexé) et,
+    pour chaque fichier JSON indexé, sa taille et sa date de modification (seuls les
+    fichiers nouveaux ou modifiés sont relus par update_from_files).
+    """
+
+    def __init__(self, path: str, shards: int = DEFAULT_SHARDS):
+        self.path = path
+        os.makedirs(os.path.join(path, "shards"), exist_ok=True)
+        self._meta_path = os.path.join(path, "meta.json")
+        meta: Dict = {}
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        self.shards = int(meta.get("shards", shards))
+        self.files: Dict[str, List] = meta.get("files", {})
+        self.documents: Dict[str, List[str]] = meta.get("documents", {})
+        self._cache: Dict[int, Dict[str, Dict]] = {}
+        self._dirty: Set[int] = set()
+        self._meta_dirty = False
+
+    def __enter__(self) -> "SwimmerIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _shard_of(self, normalized_name: str) -> int:
+        digest = hashlib.sha1(normalized_name.encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") % self.shards
+
+    def _shard_path(self, shard: int) -> str:
+        return os.path.join(self.path, "shards", f"{shard:03d}.json")
+
+    def _load_shard(self, shard: int) -> Dict[str, Dict]:
+        entries = self._cache.get(shard)
+        if entries is None:
+            entries = {}
+            if os.path.exists(self._shard_path(shard)):
+                with open(self._shard_path(shard), "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            self._cache[shard] = entries
+        return entries
+
+    def remove_document(self, doc_key: str) -> None:
+        keys = self.documents.pop(doc_key, None)
+        if not keys:
+            return
+        for key in keys:
+            shard = self._shard_of(key.split("|", 1)[0])
+            entries = self._load_shard(shard)
+            entry = entries.get(key)
+            if entry is None:
+                continue
+            entry["postings"] = [p for p in entry["postings"] if p.get("doc") != doc_key]
+            if not entry["postings"]:
+                del entries[key]
+            self._dirty.add(shard)
+        self._meta_dirty = True
+
+    # Indexe une compétition filtrée (structure des fichiers competitions_per_type/<type>/*.json),
+    # en remplaçant ses postings précédents. path : fichier JSON correspondant, marqué comme indexé.
+    def add_competition(self, doc: Dict, path: Optional[str] = None) -> int:
+        doc_key = document_key(doc)
+        self.remove_document(doc_key)
+        context = {
+            "doc": doc_key,
+            "competition_id": doc.get("competition_id"),
+            "competition": doc.get("name"),
+            "date": doc.get("date"),
+            "date_key": _date_key(doc.get("date")),
+        }
+        keys: Set[str] = set()
+        postings = 0
+        for epreuve in doc.get("epreuves") or []:
+            if not isinstance(epreuve, dict):
+                continue
+            for perf in epreuve.get("performances") or []:
+                if not isinstance(perf, dict):
+                    continue
+                nageur = perf.get("nageur")
+                nageurs = nageur if isinstance(nageur, list) else [nageur]
+                relay = isinstance(nageur, list)
+                for swimmer in nageurs:
+                    if not isinstance(swimmer, dict):
+                        continue
+                    key = swimmer_key(swimmer)
+                    if key is None:
+                        continue
+                    shard = self._shard_of(key.split("|", 1)[0])
+                    entries = self._load_shard(shard)
+                    entry = entries.get(key)
+                    if entry is None:
+                        entry = entries[key] = {
+                            "name": swimmer.get("name"),
+                            "annee_naissance": swimmer.get("annee_naissance"),
+                            "nationalite": swimmer.get("nationalite"),
+                            "sexe": swimmer.get("sexe"),
+                            "postings": [],
+                        }
+                    keys.add(key)
+                    entry["postings"].append(
+                        {
+                            **context,
+                            "epreuve": epreuve.get("nom"),
+                            "categorie": epreuve.get("categorie"),
+                            "tour": epreuve.get("tour"),
+                            "classement": perf.get("classement"),
+                            "temps": perf.get("temps"),
+                            "club": perf.get("club"),
+                            "relais": relay,
+                        }
+                    )
+                    self._dirty.add(shard)
+                    postings += 1
+        self.documents[doc_key] = sorted(keys)
+        if path is not None:
+            stat = os.stat(path)
+            self.files[os.path.abspath(path)] = [stat.st_mtime_ns, stat.st_size]
+        self._meta_dirty = True
+        return postings
+
+    # Indexe les fichiers JSON nouveaux ou modifiés depuis la dernière mise à jour ; renvoie leur nombre
+    def update_from_files(self, paths: Iterable[str]) -> int:
+        updated = 0
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if self.files.get(os.path.abspath(path)) == [stat.st_mtime_ns, stat.st_size]:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    doc = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Fichier ignoré : {path} ({e})")
+                continue
+            if not isinstance(doc, dict) or "epreuves" not in doc:
+                continue
+            self.add_competition(doc, path=path)
+            updated += 1
+        return updated
+
+    # Identités portant ce nom (homonymes compris), filtrées par année de naissance / nationalité,
+    # avec leurs postings du plus ancien au plus récent
+    def find(self, name: str, annee_naissance: Optional[int] = None, nationalite: Optional[str] = None) -> List[Dict]:
+        normalized = normalize_name(name)
+        entries = self._load_shard(self._shard_of(normalized))
+        found: List[Dict] = []
+        for key, entry in entries.items():
+            if key.split("|", 1)[0] != normalized:
+                continue
+            if annee_naissance is not None and entry.get("annee_naissance") != annee_naissance:
+                continue
+            if nationalite is not None and entry.get("nationalite") != nationalite:
+                continue
+            postings = sorted(entry["postings"], key=lambda p: p.get("date_key") or "")
+            found.append({**entry, "key": key, "postings": postings})
+        return found
+
+    # Écrit les shards modifiés et meta.json (écriture atomique), puis libère les shards en mémoire
+    def flush(self) -> None:
+        for shard in sorted(self._dirty):
+            self._write_json(self._shard_path(shard), self._cache[shard])
+        if self._meta_dirty:
+            self._write_json(
+                self._meta_path,
+                {"version": INDEX_VERSION, "shards": self.shards, "files": self.files, "documents": self.documents},
+            )
+        self._dirty.clear()
+        self._meta_dirty = False
+        self._cache.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+    @staticmethod
+    def _write_json(path: str, payload: Dict) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Tuple[int, int]:
+        return len(self.documents), len(self.files)
+
+
+def main() -> None:
+    """
+    python swimmer_index.py swimmer_index [dossier=competitions_per_type]
+        Met à jour l'index avec les fichiers JSON de compétitions nouveaux ou modifiés.
+    python swimmer_index.py swimmer_index nageur="DUPONT Jean" [annee=2008] [nat=FRA]
+        Affiche l'historique d'un nageur.
+    """
+    if len(sys.argv) < 2:
+        raise SystemExit('Usage : python swimmer_index.py swimmer_index [dossier=competitions_per_type] | nageur="NOM Prénom" [annee=2008] [nat=FRA]')
+
+    options = dict(a.split("=", 1) for a in sys.argv[2:] if "=" in a)
+    with SwimmerIndex(sys.argv[1]) as index:
+        if "nageur" in options:
+            annee = int(options["annee"]) if options.get("annee") else None
+            identities = index.find(options["nageur"], annee_naissance=annee, nationalite=options.get("nat"))
+            if not identities:
+                print(f"Aucun nageur « {options['nageur']} » dans l'index")
+            for identity in identities:
+                print(f"=== {identity['name']} ({identity['annee_naissance']}) {identity['nationalite'] or ''} : {len(identity['postings'])} performance(s) ===")
+                for p in identity["postings"]:
+                    print(f"- {p.get('date') or '':<28} {p.get('competition') or '':<40} {p.get('epreuve') or ''} {p.get('tour') or ''} : {p.get('temps') or ''} ({p.get('classement')})")
+            return
+
+        root = Path(options.get("dossier", "competitions_per_type"))
+        paths = sorted(str(p) for p in root.glob("*/*.json"))
+        updated = index.update_from_files(paths)
+        documents, files = index.stats()
+    print(f"{updated} fichier(s) indexé(s) ; index : {documents} document(s), {files} fichier(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # dépendance optionnelle : sans numpy, parse_times_cs retombe sur parse_time_cs ligne par ligne
+    np = None
+
+
+# Temps FFN : "58.12", "01:02.34", "1:02:03.45" (h:mm:ss.cc), avec "," accepté comme séparateur décimal
+_TIME_RE = re.compile(r"(?<![\d:.,])(?:(\d{1,2}):)?(?:(\d{1,2}):)?(\d{1,2})[.,](\d{1,2})(?![\d.,])")
+
+# Distance d'un passage : "50 m", "100m", "50 m : "
+_DISTANCE_RE = re.compile(r"(\d+)\s*m", re.IGNORECASE)
+
+
+# Temps FFN -> centièmes de seconde ; None pour DSQ / ABD / NP / vide ou tout texte sans temps
+def parse_time_cs(text: Optional[str]) -> Optional[int]:
+    if not text:
+        return None
+    m = _TIME_RE.search(text)
+    if not m:
+        return None
+    first, second, seconds, hundredths = m.groups()
+    if second is not None:
+        hours, minutes = int(first), int(second)
+    else:
+        hours, minutes = 0, int(first) if first is not None else 0
+    if len(hundredths) == 1:
+        hundredths += "0"
+    return ((hours * 60 + minutes) * 60 + int(seconds)) * 100 + int(hundredths)
+
+
+# Distance d'un passage en mètres ("50 m" -> 50) ; None si absente
+def parse_distance_m(text: Optional[str]) -> Optional[int]:
+    if not text:
+        return None
+    m = _DISTANCE_RE.search(str(text))
+    return int(m.group(1)) if m else None
+
+
+# Centièmes -> texte FFN ("01:02.34", ou "58.12" sous la minute)
+def format_time_cs(cs: Optional[int]) -> str:
+    if cs is None or cs < 0:
+        return ""
+    minutes, rest = divmod(cs, 6000)
+    seconds, hundredths = divmod(rest, 100)
+    if minutes:
+        return f"{minutes:02d}:{seconds:02d}.{hundredths:02d}"
+    return f"{seconds:02d}.{hundredths:02d}"
+
+
+# Valeur des temps invalides dans les tableaux de centièmes (DSQ, ABD, vide...)
+MISSING_CS = -1
+
+
+# Longueurs des formes de temps reconnues par le chemin vectorisé de parse_times_cs :
+# S.cc, SS.cc, M:SS.cc, MM:SS.cc, H:MM:SS.cc, HH:MM:SS.cc
+_VECTOR_LENGTHS = (4, 5, 7, 8, 10, 11)
+
+
+# Parse une colonne entière de temps FFN d'un seul coup : renvoie (centièmes int32, masque de validité).
+# Les textes sont alignés à droite, si bien que chaque caractère d'un temps de forme usuelle occupe une
+# position fixe en partant de la droite (centièmes, séparateur, secondes, ':', minutes...) : la conversion
+# se fait par quelques opérations sur des colonnes de caractères, sans boucle Python par temps.
+# Les textes d'une autre forme qui contiennent un chiffre (un seul chiffre de centièmes, mention après
+# le temps...) repassent par parse_time_cs : le résultat est toujours celui du parseur ligne par ligne.
+def parse_times_cs(values: Sequence[Optional[str]]) -> Tuple["np.ndarray", "np.ndarray"]:
+    if np is None:
+        raise RuntimeError("parse_times_cs nécessite numpy (pip install numpy)")
+    n = len(values)
+    if n == 0:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=bool)
+    texts = np.char.strip(np.array(["" if v is None else v for v in values], dtype=str))
+    lengths = np.char.str_len(texts)
+    width = max(int(lengths.max()), max(_VECTOR_LENGTHS))
+    # chars[-k] : k-ième caractère en partant de la droite, pour tous les textes
+    chars = np.ascontiguousarray(np.char.rjust(texts, width).view(np.uint32).reshape(n, width).T)
+
+    def is_digit(k: int) -> "np.ndarray":
+        return (chars[-k] >= 48) & (chars[-k] <= 57)
+
+    def digit(k: int) -> "np.ndarray":
+        return np.where(is_digit(k), chars[-k].astype(np.int32) - 48, 0)
+
+    ok = np.isin(lengths, _VECTOR_LENGTHS)
+    ok &= is_digit(1) & is_digit(2) & ((chars[-3] == 46) | (chars[-3] == 44)) & is_digit(4)
+    ok &= (lengths < 5) | is_digit(5)
+    ok &= (lengths < 7) | ((chars[-6] == 58) & is_digit(7))
+    ok &= (lengths < 8) | is_digit(8)
+    ok &= (lengths < 10) | ((chars[-9] == 58) & is_digit(10))
+    ok &= (lengths < 11) | is_digit(11)
+
+    cs = (
+        digit(1) + 10 * digit(2)
+        + 100 * (digit(4) + 10 * digit(5))
+        + 6000 * (digit(7) + 10 * digit(8))
+        + 360000 * (digit(10) + 10 * digit(11))
+    )
+    cs = np.where(ok, cs, MISSING_CS).astype(np.int32)
+
+    # Autres formes contenant un chiffre : parseur ligne par ligne
+    has_digit = np.any((chars >= 48) & (chars <= 57), axis=0)
+    for i in np.flatnonzero(~ok & has_digit):
+        parsed = parse_time_cs(str(texts[i]))
+        if parsed is not None:
+            cs[i] = parsed
+            ok[i] = True
+    return cs, ok
+
+
+# Ajoute les centièmes à côté des temps d'origine dans une liste d'épreuves (format des fichiers JSON
+# par compétition) : temps_cs pour chaque performance, cumul_cs et split_cs pour chaque passage
+# (None si le texte n'est pas un temps). Tous les temps du document sont parsés en un seul lot.
+def add_centiseconds(epreuves: List[Dict]) -> None:
+    targets: List[Tuple[Dict, str]] = []
+    texts: List[Optional[str]] = []
+    for epreuve in epreuves:
+        if not isinstance(epreuve, dict):
+            continue
+        for perf in epreuve.get("performances") or []:
+            if not isinstance(perf, dict):
+                continue
+            targets.append((perf, "temps_cs"))
+            texts.append(perf.get("temps"))
+            for split in perf.get("splits") or []:
+                if not isinstance(split, dict):
+                    continue
+                targets.append((split, "cumul_cs"))
+                texts.append(split.get("cumul"))
+                targets.append((split, "split_cs"))
+                texts.append(split.get("split") or split.get("time"))
+
+    if np is not None:
+        cs, valid = parse_times_cs(texts)
+        parsed: List[Optional[int]] = [int(v) if ok else None for v, ok in zip(cs.tolist(), valid.tolist())]
+    else:
+        parsed = [parse_time_cs(t) for t in texts]
+    for (target, key), value in zip(targets, parsed):
+        target[key] = value